@@ -31,6 +31,7 @@ def create_app():
     from .blueprints.osrm import bp as osrm_bp
     from .blueprints.my_path import bp as my_path_bp
     from .blueprints.notification import bp as notification_bp
+    from .blueprints.upload import bp as upload_bp
 
     app.register_blueprint(auth_bp, url_prefix="/auth")
     app.register_blueprint(post_bp, url_prefix="/post")
@@ -44,5 +45,23 @@ def create_app():
     app.register_blueprint(osrm_bp, url_prefix="/osrm")
     app.register_blueprint(my_path_bp, url_prefix="/my_path")
     app.register_blueprint(notification_bp, url_prefix="/notification")
+    app.register_blueprint(upload_bp, url_prefix="/upload")
+
+    from .utils.view_counter import init_view_counter
+    from .utils.post_search import init_post_search
+    from .utils.image_jobs import init_image_jobs
+    from .utils.image_variants import init_image_variants
+    from .utils.image_utils import init_profile_fetches
+    from .utils.image_serving import init_image_serving
+    from .utils.uploads import init_uploads
+    from .utils.osrm_cache import init_osrm_cache
+    init_view_counter(app)
+    init_post_search(app)
+    init_image_jobs(app)
+    init_image_variants(app)
+    init_profile_fetches(app)
+    init_image_serving(app)
+    init_uploads(app)
+    init_osrm_cache(app)
 
     return app
\ No newline at end of file
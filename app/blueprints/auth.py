@@ -1,9 +1,18 @@
-from flask import Blueprint, request, jsonify, send_from_directory, current_app
+from flask import Blueprint, request, jsonify, current_app
 from ..extensions import db, BLACKLIST
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt, get_current_user
 from ..models import User, Image
 from ..models.user import OauthType
-from ..utils.image_utils import upload_profile, IMAGE_EXTENSIONS
+from ..utils.image_utils import upload_profile, IMAGE_EXTENSIONS, DEFAULT_PROFILE_PATH
+from ..utils.image_variants import negotiate_variant, remove_variants, SIZE_FULL
+from ..utils.image_serving import (
+    get_image_path_cache,
+    cached_image_path,
+    forget_image,
+    image_etag,
+    not_modified,
+    send_image,
+)
 from ..utils.user_utils import token_provider, is_valid_phone
 from email_validator import validate_email, EmailNotValidError
 import os
@@ -146,6 +155,8 @@ def update_profile():
                         os.remove(os.path.join(current_app.root_path, old_image.directory))
                     except:
                         pass
+                    remove_variants(old_image.directory)
+                    forget_image(old_image)
                     db.session.delete(old_image)
             user.profile_img = save_profile_image(file, user_id=user.user_id)
         elif force_default:
@@ -156,6 +167,8 @@ def update_profile():
                         os.remove(os.path.join(current_app.root_path, old_image.directory))
                     except:
                         pass
+                    remove_variants(old_image.directory)
+                    forget_image(old_image)
                     db.session.delete(old_image)
             user.profile_img = default_img
 
@@ -230,7 +243,7 @@ def google_login():
             db.session.rollback()
         upload_profile(user, url=picture_url)
 
-    return token_provider(user.user_id, user.username, user.email, user.nickname)
+    return token_provider(user.user_id, username=user.username, email=user.email, nickname=user.nickname)
 
 
 @bp.route("/login/kakao", methods=["POST"])
@@ -258,7 +271,7 @@ def kakao_login():
         db.session.commit()
         upload_profile(user, url=image_url)
 
-    return token_provider(user.user_id, user.username, user.email, user.nickname)
+    return token_provider(user.user_id, username=user.username, email=user.email, nickname=user.nickname)
 
 
 @bp.route("/login/naver", methods=["POST"])
@@ -284,7 +297,7 @@ def naver_login():
         db.session.commit()
         upload_profile(user, url=image_url)
 
-    return token_provider(user.user_id, user.username, user.email, user.nickname)
+    return token_provider(user.user_id, username=user.username, email=user.email, nickname=user.nickname)
 
 
 # ----------------------- 로그아웃 -----------------------
@@ -395,28 +408,40 @@ def delete_user_by_admin(user_id):
 # ----------------------- uuid로 프로필 이미지 조회 -----------------------
 @bp.route("/image/uuid/<string:uuid>", methods=["GET"])
 def get_image_by_uuid(uuid):
+    # Accept 에 image/avif, image/webp 가 있으면 해당 포맷으로 응답 (없으면 백그라운드에서 생성)
     if uuid == "default_profile":
-        path = "static/default_profile.jpg"
-        return send_from_directory("/".join(path.split("/")[:-1]), path.split("/")[-1])
-    else:
+        # 기본 이미지는 배포 때 바뀔 수 있어 immutable 없이 하루만 캐시 (ETag 는 파일 mtime/크기 기준)
+        path, settled = negotiate_variant(DEFAULT_PROFILE_PATH, SIZE_FULL, request.accept_mimetypes)
+        return send_image(path, True, settled, max_age=24 * 60 * 60, immutable=False)
+
+    # uuid 이미지는 바뀌지 않으므로 immutable 캐시, If-None-Match 는 DB 조회 없이 304
+    response = not_modified(uuid, SIZE_FULL)
+    if response is not None:
+        return response
+    path = cached_image_path(uuid)
+    if path is None:
         image = Image.query.filter_by(uuid=uuid).first_or_404(description="이미지 없음")
-        return send_from_directory("/".join(image.directory.split("/")[:-1]), image.directory.split("/")[-1])
+        path = image.directory
+        get_image_path_cache().set(uuid, path)
+
+    path, settled = negotiate_variant(path, SIZE_FULL, request.accept_mimetypes)
+    return send_image(path, image_etag(uuid, SIZE_FULL, path), settled)
 
 @bp.route("/image/user/<int:user_id>", methods=["GET"])
 def get_user_profile_image(user_id):
+    # 사용자의 프로필은 바뀔 수 있으므로 매번 재검증 (no-cache), ETag 는 현재 이미지 uuid
+    # user → 이미지는 다른 워커에서 바뀔 수 있어 캐시하지 않고 매번 조회 (user_id 인덱스로 한 행)
     image = Image.query.filter_by(user_id=user_id).first_or_404(description="이미지 없음")
-
-    # DB: static/profile_images/2025-11-12/uuid.jpg
-    relative_path = image.directory
+    response = not_modified(image.uuid, SIZE_FULL, max_age=0, immutable=False)
+    if response is not None:
+        return response
+    image_uuid, relative_path = image.uuid, image.directory
 
     # 절대 경로 생성
     absolute_path = os.path.join(current_app.root_path, relative_path)
 
-    folder = os.path.dirname(absolute_path)
-    filename = os.path.basename(absolute_path)
-
     # 파일 존재 여부 체크
     if not os.path.exists(absolute_path):
         return {"message": f"파일 없음: {absolute_path}"}, 404
 
-    return send_from_directory(folder, filename)
\ No newline at end of file
+    return send_image(relative_path, image_etag(image_uuid, SIZE_FULL, relative_path), max_age=0, immutable=False)
\ No newline at end of file
@@ -1,8 +1,22 @@
-from flask import Blueprint, jsonify, request
+import threading
+import time
+from flask import Blueprint, current_app, jsonify, request
+from flask_jwt_extended import jwt_required, get_current_user
 from app.config import Config
+from app.models.user import AccountType
 import requests
+from app.utils.http_client import create_session
+from app.utils.osrm_cache import (
+    DEFAULT_PRECISION,
+    get_osrm_cache,
+    make_key,
+    normalize_params,
+    purge_cache_command,
+    quantize_coordinates,
+)
 
 bp = Blueprint("osrm", __name__)
+bp.cli.add_command(purge_cache_command)
 
 """# OSRM API
 ## 문서 주소: 
@@ -87,12 +101,59 @@ curl 'http://router.project-osrm.org/tile/v1/car/tile(1310,3166,13).mvt'
 ```
 """
 
+# 서비스별 (연결, 읽기) 타임아웃(초) - OSRM_TIMEOUTS 설정으로 덮어쓸 수 있음
+DEFAULT_TIMEOUTS = {
+    "nearest": (2, 3),
+    "route": (2, 10),
+    "table": (2, 15),
+    "match": (2, 15),
+    "trip": (2, 15),
+    "tile": (2, 5),
+}
+DEFAULT_TIMEOUT = (2, 10)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_osrm_session():
+    """
+    OSRM 서버용 공유 세션 (keep-alive 커넥션 풀)
+    - OSRM_POOL_SIZE: 풀 크기 (기본 10, 동시에 요청하는 스레드 수 이상)
+    - OSRM_RETRIES: 연결 실패 / 502·503·504 응답 재시도 횟수 (기본 2, 0.2초부터 backoff)
+      읽기 타임아웃은 재시도하지 않음 (오래 걸리는 계산은 다시 보내도 오래 걸림)
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session(
+                pool_maxsize=current_app.config.get("OSRM_POOL_SIZE", 10),
+                retries=current_app.config.get("OSRM_RETRIES", 2),
+                read_retries=False,
+                backoff_factor=0.2,
+                status_forcelist=(502, 503, 504),
+            )
+        return _session
+
+
+def osrm_timeout(service):
+    timeouts = {**DEFAULT_TIMEOUTS, **current_app.config.get("OSRM_TIMEOUTS", {})}
+    return timeouts.get(service, DEFAULT_TIMEOUT)
+
+
 def osrm_request(service: str, profile: str, coordinates: str, params: dict):
+    """
+    OSRM 서버 요청 → 응답 JSON
+    - 타임아웃 / 연결 실패는 requests.RequestException, JSON 이 아닌 응답은 ValueError
+    """
     base_url = Config.OPENSTREET_URL
     url = f"{base_url}/{service}/v1/{profile}/{coordinates}"
-    print(url)
-    response = requests.get(url, params=params)
-    print(response.json())
+    started = time.perf_counter()
+    response = get_osrm_session().get(url, params=params, timeout=osrm_timeout(service))
+    current_app.logger.debug(
+        f"OSRM {service} {response.status_code} {(time.perf_counter() - started) * 1000:.0f}ms "
+        f"{len(response.content)}B {url}"
+    )
     return response.json()
 
 def parse_route(response):
@@ -217,18 +278,54 @@ def coordinates_to_string(coords):
 def test():
     import polyline
     url = f'{Config.OPENSTREET_URL}/route/v1/driving/{coordinates_to_string([(37.5421042, 126.9904227), (37.5399670, 126.9899975)])}'
-    print(url)
-    response = requests.get(url)
-    print(response.json())
+    response = get_osrm_session().get(url, timeout=osrm_timeout("route"))
     polyline_data = response.json().get("routes", [])[0].get("geometry", "")
-    print('polyline:', polyline.decode(polyline_data))
+    current_app.logger.debug(f"OSRM test {url} polyline: {polyline.decode(polyline_data)}")
     return {"message": "OSRM Blueprint is working!"}, 200
 
+def admin_required():
+    """관리자가 아니면 403 응답, 관리자면 None"""
+    current_user = get_current_user()
+    if not current_user or current_user.account_type != AccountType.ADMIN:
+        return jsonify({"message": "관리자 권한이 필요합니다."}), 403
+    return None
+
+
+# 캐시 통계 (관리자 전용)
+@bp.get("/cache/stats")
+@jwt_required()
+def cache_stats():
+    error = admin_required()
+    if error:
+        return error
+    return get_osrm_cache().stats(), 200
+
 # 경로 계산요청
 @bp.get("/<service>/<profile>/<coordinates>")
 def navigate(service, profile, coordinates):
-    print(service, profile, coordinates)
-    response = osrm_request(service, profile, coordinates, request.args)
+    response, key = None, None
+    cache = get_osrm_cache()
+    if cache.enabled:
+        # 반올림한 좌표로 요청해야 캐시된 응답과 같은 결과
+        coordinates = quantize_coordinates(
+            coordinates, current_app.config.get("OSRM_CACHE_PRECISION", DEFAULT_PRECISION)
+        )
+        key = make_key(service, profile, coordinates, normalize_params(request.args))
+        response = cache.get(key)
+    try:
+        if response is None:
+            response = osrm_request(service, profile, coordinates, request.args)
+            if key and isinstance(response, dict) and response.get("code") == "Ok":
+                cache.set(key, response)
+    except requests.Timeout:
+        current_app.logger.warning(f"OSRM {service} 타임아웃: {coordinates}")
+        return {"error": "Routing server timeout"}, 504
+    except ValueError:
+        # JSON 이 아닌 응답 (requests.JSONDecodeError 도 여기로)
+        return {"error": "Invalid routing server response"}, 502
+    except requests.RequestException as e:
+        current_app.logger.warning(f"OSRM {service} 요청 실패: {e}")
+        return {"error": "Routing server unavailable"}, 502
     if service == "route":
         return parse_route(response)
     elif service == "nearest":
@@ -1,16 +1,50 @@
-from flask import Blueprint, request, jsonify, current_app, send_from_directory
+from flask import Blueprint, request, jsonify, current_app
 
 from app.models.location import Location
 from ..models import Post, Image
 from ..extensions import db
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_current_user
 from sqlalchemy.orm import selectinload
-from ..utils.image_storage import save_to_disk
+from ..utils.image_storage import process_uploads, remove_saved_files
+from ..utils.image_blobs import acquire_blobs, discard_blob_sources, migrate_blobs_command, purge_blobs
+from ..utils.image_gc import gc_images_command
+from ..utils.upload_sessions import UploadError, open_finalized, close_files, discard_sessions
+from ..utils.image_jobs import (
+    store_originals,
+    enqueue_image_jobs,
+    image_status_summary,
+    process_pending_command,
+    IN_PROGRESS_STATUSES,
+    STATUS_PENDING,
+    STATUS_PROCESSING,
+    STATUS_READY,
+)
 from ..utils.image_utils import delete_image, IMAGE_EXTENSIONS
-from ..utils.image_compressor import compress_image
-from ..utils.post_query import apply_order, paginate_posts, serialize_post
+from ..utils.image_variants import negotiate_variant, IMAGE_SIZES, SIZE_FULL
+from ..utils.image_serving import (
+    get_image_path_cache,
+    cached_image_path,
+    image_etag,
+    not_modified,
+    send_image,
+)
+from ..utils.post_query import (
+    apply_order,
+    apply_fields,
+    paginate_posts,
+    parse_fields,
+    serialize_post,
+    serialize_posts,
+)
+from ..utils.post_counters import reconcile_counts_command
+from ..utils.view_counter import record_view
+from ..utils.post_search import get_post_search
 
 bp = Blueprint("post", __name__)
+bp.cli.add_command(reconcile_counts_command)  # flask post reconcile-counts
+bp.cli.add_command(process_pending_command)  # flask post process-pending
+bp.cli.add_command(migrate_blobs_command)  # flask post migrate-blobs
+bp.cli.add_command(gc_images_command)  # flask post gc-images
 
 
 # ---------------- 1. 게시글 작성 ----------------
@@ -43,7 +77,37 @@ def write_post():
         return jsonify({"error": "게시글 내용은 2000자 이하로 입력해야 합니다."}), 400
 
     files = request.files.getlist("images")
-    uploaded_images = []
+    for file in files:
+        if not hasattr(file, "filename") or not hasattr(file, "name"):
+            return jsonify({"message": "게시글 저장 실패: 파일명이 없습니다."}), 400
+        ext = file.filename.rsplit(".", 1)[-1].lower()
+        if ext not in IMAGE_EXTENSIONS:
+            return (
+                jsonify({"message": f"게시글 저장 실패: 지원하지 않는 파일 형식: {file.filename}"}),
+                400,
+            )
+
+    # /upload 로 미리 올린 이미지 (이어 올리기 세션, finalize 된 것만)
+    upload_ids = [u.strip() for u in request.form.getlist("upload_ids") if u.strip()]
+    try:
+        upload_files = open_finalized(upload_ids, user_id)
+    except UploadError as e:
+        return jsonify({"message": f"게시글 저장 실패: {e}"}), e.status
+    files = files + upload_files
+
+    # 0) 이미지 처리
+    # - ?async=1 : 원본만 저장하고 pending 으로 등록 → 202, 압축은 작업 풀에서
+    # - 기본     : 트랜잭션 밖에서 병렬 압축/저장
+    async_images = request.args.get("async", "").lower() in ("1", "true")
+    try:
+        if async_images:
+            processed = store_originals(files, category="post")
+        else:
+            processed = process_uploads(files, image_type="post", category="post")
+    except Exception as e:
+        return jsonify({"message": f"게시글 저장 실패: {e}"}), 400
+    finally:
+        close_files(upload_files)
 
     try:
         # 1) 게시글 생성
@@ -81,41 +145,58 @@ def write_post():
             )
             db.session.add(location)
 
-        # 3) 이미지 처리
-        for file in files:
-            if not hasattr(file, "filename") or not hasattr(file, "name"):
-                raise ValueError("파일명이 없습니다.")
-            if hasattr(file, "name") and not hasattr(file, "filename"):
-                setattr(file, "filename", file.name)
-            ext = file.filename.rsplit(".", 1)[-1].lower()
-            if ext not in IMAGE_EXTENSIONS:
-                raise ValueError(f"지원하지 않는 파일 형식: {file.filename}")
-
-            image_compressed, ext, filename = compress_image(file, image_type="post")
-            image = Image(
-                post_id=post.post_id,
-                user_id=user_id,
-                directory="",
-                original_image_name=file.filename,
-                ext=ext,
-            )
-            db.session.add(image)
-            db.session.flush()
-            filename = f"{image.uuid}.{ext}"
-            rel_path = save_to_disk(image_compressed, ext, filename, category="post")
-            image.directory = rel_path
-            db.session.flush()
-
-            uploaded_images.append(
-                {
-                    "uuid": str(image.uuid),
-                    "path": image.directory,
-                    "original_name": image.original_image_name,
-                }
+        # 3) 이미지 행 일괄 추가 (INSERT 한 번, executemany) - 같은 내용의 파일은 blob 공유
+        if processed:
+            blob_ids = acquire_blobs(processed)
+            db.session.execute(
+                db.insert(Image),
+                [
+                    {
+                        "uuid": item["uuid"],
+                        "post_id": post.post_id,
+                        "user_id": user_id,
+                        "directory": item["path"],
+                        "original_image_name": item["original_name"],
+                        "ext": item["ext"],
+                        "status": STATUS_PENDING if async_images else STATUS_READY,
+                        "blob_id": blob_ids.get(item.get("sha256")),
+                    }
+                    for item in processed
+                ],
             )
+        uploaded_images = [
+            {
+                "uuid": item["uuid"],
+                "path": item["path"],
+                "original_name": item["original_name"],
+            }
+            for item in processed
+        ]
 
         # 4) 커밋 - 트랜잭션 종료
         db.session.commit()
+        get_post_search().index_post(post)
+        discard_sessions(upload_ids)  # 저장이 끝난 업로드 세션 정리 (실패 시에는 남겨 두어 재시도)
+
+        if async_images and processed:
+            enqueue_image_jobs(processed, image_type="post", category="post")
+            return (
+                jsonify(
+                    {
+                        "message": "게시글 작성 완료 (이미지 처리 중)",
+                        "post_id": post.post_id,
+                        "uploaded_images": [
+                            {
+                                "uuid": item["uuid"],
+                                "original_name": item["original_name"],
+                                "status": STATUS_PENDING,
+                            }
+                            for item in processed
+                        ],
+                    }
+                ),
+                202,
+            )
         return (
             jsonify(
                 {
@@ -129,6 +210,8 @@ def write_post():
 
     except Exception as e:
         db.session.rollback()  # 중간에 실패하면 전체 rollback
+        discard_blob_sources(processed)
+        remove_saved_files([item["path"] for item in processed])
         return jsonify({"message": f"게시글 저장 실패: {e}"}), 400
 
 
@@ -146,9 +229,24 @@ def edit_post(post_id):
     location = request.form.get("location")
     delete_uuids_raw = request.form.getlist("delete_images")
     delete_uuids = [u.strip().lower() for u in delete_uuids_raw if u.strip()]
-    new_files = request.files.getlist("new_images")
-    uploaded_images = []
-    deleted, not_found = [], []
+    new_files = [f for f in request.files.getlist("new_images") if f and hasattr(f, "filename")]
+    deleted, not_found, released_blobs = [], [], []
+
+    for file in new_files:
+        ext = file.filename.rsplit(".", 1)[-1].lower()
+        if ext not in {"png", "jpg", "jpeg", "gif"}:
+            return (
+                jsonify({"message": f"게시글 수정 실패: 지원하지 않는 파일 형식: {file.filename}"}),
+                400,
+            )
+
+    # 새 이미지 압축/저장 - 조회 트랜잭션을 끝내고(커넥션 반환) 병렬 처리
+    user_id = current_user.user_id
+    db.session.commit()
+    try:
+        processed = process_uploads(new_files, image_type="post", category="post")
+    except Exception as e:
+        return jsonify({"message": f"게시글 수정 실패: {e}"}), 400
 
     try:
         # ---------- 게시글 수정 ----------
@@ -159,6 +257,9 @@ def edit_post(post_id):
         if location:
             post.location = location
 
+        # 새 이미지 blob 참조를 먼저 잡는다 (지운 이미지와 같은 내용을 다시 올린 경우 파일이 지워지지 않도록)
+        blob_ids = acquire_blobs(processed)
+
         # ---------- 이미지 삭제 ----------
         if delete_uuids:
             post_images = Image.query.filter_by(post_id=post_id).all()
@@ -168,7 +269,9 @@ def edit_post(post_id):
                 img = uuid_map.get(u)
                 if img:
                     try:
-                        delete_image(img)
+                        released = delete_image(img)
+                        if released is not None:
+                            released_blobs.append(released)
                     except Exception as e:
                         print(f"[WARN] 파일 삭제 실패: {e}")
                     db.session.delete(img)
@@ -178,40 +281,36 @@ def edit_post(post_id):
 
         db.session.flush()  # 변경사항 반영
 
-        # ---------- 새 이미지 업로드 ----------
-        for file in new_files:
-            if not file or not hasattr(file, "filename"):
-                continue
-            ext = file.filename.rsplit(".", 1)[-1].lower()
-            if ext not in {"png", "jpg", "jpeg", "gif"}:
-                raise ValueError(f"지원하지 않는 파일 형식: {file.filename}")
-
-            image_compressed, ext, filename = compress_image(file, image_type="post")
-            image = Image(
-                post_id=post.post_id,
-                user_id=current_user.user_id,
-                directory="",
-                original_image_name=file.filename,
-                ext=ext,
-            )
-            db.session.add(image)
-            db.session.flush()  # image.uuid 생성됨
-
-            filename = f"{image.uuid}.{ext}"
-            rel_path = save_to_disk(image_compressed, ext, filename, category="post")
-            image.directory = rel_path
-            db.session.flush()
-
-            uploaded_images.append(
-                {
-                    "uuid": str(image.uuid),
-                    "path": image.directory,
-                    "original_name": image.original_image_name,
-                }
+        # ---------- 새 이미지 행 일괄 추가 (INSERT 한 번, executemany) ----------
+        if processed:
+            db.session.execute(
+                db.insert(Image),
+                [
+                    {
+                        "uuid": item["uuid"],
+                        "post_id": post_id,
+                        "user_id": user_id,
+                        "directory": item["path"],
+                        "original_image_name": item["original_name"],
+                        "ext": item["ext"],
+                        "blob_id": blob_ids.get(item.get("sha256")),
+                    }
+                    for item in processed
+                ],
             )
+        uploaded_images = [
+            {
+                "uuid": item["uuid"],
+                "path": item["path"],
+                "original_name": item["original_name"],
+            }
+            for item in processed
+        ]
 
         # ---------- 커밋 ----------
         db.session.commit()
+        purge_blobs(released_blobs)  # 마지막 참조가 해제된 blob 파일은 커밋 후 삭제
+        get_post_search().index_post(post)
         return (
             jsonify(
                 {
@@ -227,6 +326,8 @@ def edit_post(post_id):
 
     except Exception as e:
         db.session.rollback()  # 실패 시 전체 rollback
+        discard_blob_sources(processed)
+        remove_saved_files([item["path"] for item in processed])
         return jsonify({"message": f"게시글 수정 실패: {e}"}), 400
 
 
@@ -240,14 +341,20 @@ def delete_post(post_id):
         return jsonify({"message": "권한 없음"}), 403
 
     try:
-        with db.session.begin():  # 트랜잭션 블록
-            for img in post.images:
-                try:
-                    delete_image(img)
-                except Exception as e:
-                    print(f"[WARN] 이미지 파일 삭제 실패: {e}")
-                db.session.delete(img)
-            db.session.delete(post)
+        # get_or_404 조회로 이미 트랜잭션이 시작되어 있으므로 session.begin() 대신 commit
+        released_blobs = []
+        for img in post.images:
+            try:
+                released = delete_image(img)
+                if released is not None:
+                    released_blobs.append(released)
+            except Exception as e:
+                print(f"[WARN] 이미지 파일 삭제 실패: {e}")
+            db.session.delete(img)
+        db.session.delete(post)
+        db.session.commit()
+        purge_blobs(released_blobs)
+        get_post_search().remove_post(post_id)
         return jsonify({"message": "게시글 및 이미지 삭제 완료"}), 200
     except Exception as e:
         db.session.rollback()
@@ -260,32 +367,127 @@ def get_posts():
     filters = {
         key: value
         for key, value in request.args.items()
-        if key not in ["page", "per_page", "order_by"] and value
+        if key not in ["page", "per_page", "order_by", "cursor", "count", "fields"] and value
     }
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 10, type=int)
     order_by = request.args.get("order_by", "latest")
+    cursor = request.args.get("cursor")
+    count = request.args.get("count", "exact")
+    try:
+        fields = parse_fields(request.args.get("fields"))
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
 
-    query = Post.query.options(selectinload(Post.images))
+    query = apply_fields(Post.query, fields)
     for key, value in filters.items():
         column = getattr(Post, key, None)
         if column is not None:
             query = query.filter(column.ilike(f"%{value}%"))
 
     query = apply_order(query, order_by)
-    return paginate_posts(query, page, per_page)
+    return paginate_posts(query, page, per_page, cursor, order_by, count, fields)
+
+
+# ---------------- 4-1. 게시글 검색 ----------------
+@bp.route("/search", methods=["GET"])
+def search_posts():
+    """
+    본문 검색 (역색인, 관련도순)
+    - q: 검색어 (공백으로 구분된 단어를 모두 포함)
+    - category_id: 카테고리 필터
+    - cursor: 빈 값 = 첫 페이지, 응답의 next_cursor 로 다음 페이지
+    """
+    q = (request.args.get("q") or "").strip()
+    category_id = request.args.get("category_id", type=int)
+    per_page = min(request.args.get("per_page", 10, type=int), 50)
+    cursor = request.args.get("cursor")
+
+    if not q:
+        return jsonify({"message": "검색어(q)는 필수입니다."}), 400
+
+    try:
+        hits, next_cursor = get_post_search().search(
+            q, category_id=category_id, cursor=cursor, limit=per_page
+        )
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    posts_by_id = {}
+    if hits:
+        posts_by_id = {
+            p.post_id: p
+            for p in Post.query.options(selectinload(Post.images))
+            .filter(Post.post_id.in_([post_id for post_id, _ in hits]))
+            .all()
+        }
+    # 인덱스와 DB 사이에 지워진 게시글은 건너뜀
+    ordered = [(posts_by_id[post_id], score) for post_id, score in hits if post_id in posts_by_id]
+    items = serialize_posts([p for p, _ in ordered])
+    for item, (_, score) in zip(items, ordered):
+        item["score"] = score
+
+    return (
+        jsonify(
+            {
+                "per_page": per_page,
+                "has_next": next_cursor is not None,
+                "next_cursor": next_cursor,
+                "items": items,
+            }
+        ),
+        200,
+    )
+
+
+# ---------------- 4-2. 게시글 여러 개 조회 ----------------
+@bp.route("/batch", methods=["GET"])
+def get_posts_batch():
+    """
+    ids=1,2,3 게시글을 한 번에 조회 (요청한 순서대로, 조회수 증가 없음)
+    - 최대 POST_BATCH_MAX_IDS 개
+    - 없는 게시글 ID 는 not_found 로 반환
+    """
+    raw_ids = request.args.get("ids", "")
+    try:
+        ids = [int(v) for v in raw_ids.split(",") if v.strip()]
+    except ValueError:
+        return jsonify({"message": "ids 는 쉼표로 구분된 숫자여야 합니다."}), 400
+    ids = list(dict.fromkeys(ids))  # 순서 유지 중복 제거
+
+    if not ids:
+        return jsonify({"message": "ids 는 필수입니다."}), 400
+    max_ids = current_app.config.get("POST_BATCH_MAX_IDS", 100)
+    if len(ids) > max_ids:
+        return jsonify({"message": f"ids 는 최대 {max_ids}개까지 요청할 수 있습니다."}), 400
+
+    posts_by_id = {
+        p.post_id: p
+        for p in Post.query.options(selectinload(Post.images))
+        .filter(Post.post_id.in_(ids))
+        .all()
+    }
+    posts = [posts_by_id[post_id] for post_id in ids if post_id in posts_by_id]
+    return (
+        jsonify(
+            {
+                "items": serialize_posts(posts),
+                "not_found": [post_id for post_id in ids if post_id not in posts_by_id],
+            }
+        ),
+        200,
+    )
 
 
 # ---------------- 5. 특정 게시글 조회 ----------------
 @bp.route("/<int:post_id>", methods=["GET"])
 def get_post(post_id):
     post = Post.query.filter(Post.post_id == post_id).first_or_404()
-    try:
-        with db.session.begin():
-            Post.add_view_counts(post)
-    except Exception:
-        db.session.rollback()
-    return jsonify(serialize_post(post))
+    # 조회수는 버퍼에만 적재 (주기적으로 일괄 UPDATE) - 읽기 경로에서 쓰기 잠금 없음
+    view_counts = record_view(post)
+    data = serialize_post(post)
+    data["view_counts"] = view_counts
+    return jsonify(data)
 
 
 # ---------------- 6. 내 게시글 조회 ----------------
@@ -296,22 +498,79 @@ def get_my_posts():
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 10, type=int)
     order_by = request.args.get("order_by", "latest")
+    cursor = request.args.get("cursor")
+    count = request.args.get("count", "exact")
+    try:
+        fields = parse_fields(request.args.get("fields"))
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
 
-    query = Post.query.filter_by(user_id=current_user.user_id).options(
-        selectinload(Post.images)
-    )
+    query = apply_fields(Post.query.filter_by(user_id=current_user.user_id), fields)
     query = apply_order(query, order_by)
-    return paginate_posts(query, page, per_page)
+    return paginate_posts(query, page, per_page, cursor, order_by, count, fields)
+
+
+# 비동기 업로드 이미지 처리 상태 조회
+@bp.route("/images/status", methods=["GET"])
+def get_images_status():
+    """
+    uuids=a,b,c 이미지들의 처리 상태
+    - 반환: 이미지별 status + pending/processing/ready/failed 개수, done(모두 끝났는지)
+    """
+    uuids = [u.strip().lower() for u in request.args.get("uuids", "").split(",") if u.strip()]
+    if not uuids:
+        return jsonify({"message": "uuids 는 필수입니다."}), 400
+    if len(uuids) > current_app.config.get("POST_BATCH_MAX_IDS", 100):
+        return jsonify({"message": "요청한 uuid 가 너무 많습니다."}), 400
+
+    images = Image.query.filter(Image.uuid.in_(uuids)).all()
+    summary = image_status_summary(images)
+    return (
+        jsonify(
+            {
+                "images": [
+                    {"uuid": img.uuid, "post_id": img.post_id, "status": img.status}
+                    for img in images
+                ],
+                "summary": summary,
+                "not_found": sorted(set(uuids) - {img.uuid for img in images}),
+                "done": summary[STATUS_PENDING] + summary[STATUS_PROCESSING] == 0,
+            }
+        ),
+        200,
+    )
 
 
 # img태그에서 이미지 조회하기를 위한 엔드포인트
 @bp.route("/image/<string:uuid>", methods=["GET"])
 def get_images(uuid):
-    # uuid = request.get("uuid")
-    image = Image.query.filter_by(uuid=uuid).first_or_404(description="이미지 없음")
-    return send_from_directory(
-        "/".join(image.directory.split("/")[:-1]), image.directory.split("/")[-1]
-    )
+    """
+    ?size=thumb|feed|full (기본 full)
+    - thumb/feed 변형본이 없으면 (변형본 도입 전 업로드 등) 이 요청에서 만들어 저장
+    - Accept 에 image/avif, image/webp 가 있으면 해당 포맷 변형본 응답 (Vary: Accept)
+    - ETag + Cache-Control: immutable, If-None-Match 가 맞으면 DB 조회 없이 304 (utils/image_serving.py)
+    """
+    size = request.args.get("size", SIZE_FULL)
+    if size not in IMAGE_SIZES:
+        return jsonify({"message": f"size 는 {', '.join(IMAGE_SIZES)} 중 하나여야 합니다."}), 400
+
+    response = not_modified(uuid, size)
+    if response is not None:
+        return response
+
+    # ready 인 이미지만 경로 캐시에 둔다
+    directory = cached_image_path(uuid)
+    if directory is None:
+        image = Image.query.filter_by(uuid=uuid).first_or_404(description="이미지 없음")
+        if image.status != STATUS_READY:
+            # 비동기 처리 중(pending/processing)이거나 실패(failed)한 이미지
+            code = 202 if image.status in IN_PROGRESS_STATUSES else 404
+            return jsonify({"uuid": image.uuid, "status": image.status}), code
+        directory = image.directory
+        get_image_path_cache().set(uuid, directory)
+
+    path, settled = negotiate_variant(directory, size, request.accept_mimetypes)
+    return send_image(path, image_etag(uuid, size, path), settled)
     # return app.send_static_file(image.directory)
 
     # return jsonify(
@@ -2,6 +2,8 @@ from flask import Blueprint, jsonify, request
 from ..extensions import db
 from ..models import PostLike, Post, User
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.exc import IntegrityError
+from ..utils.post_counters import adjust_post_counts
 
 bp = Blueprint("post_like", __name__)
 
@@ -25,7 +27,14 @@ def add_like():
 
     like = PostLike(post_id=post_id, user_id=user_id)
     db.session.add(like)
-    db.session.commit()
+    try:
+        # 카운터 UPDATE 가 INSERT 를 먼저 flush 하므로 PK 충돌도 여기서 발생
+        adjust_post_counts(post_id, likes=1)
+        db.session.commit()
+    except IntegrityError:
+        # 동시에 들어온 중복 요청 (PK 충돌) → 카운터 증가도 함께 롤백
+        db.session.rollback()
+        return jsonify({"message": "이미 좋아요한 게시글입니다"}), 400
 
     return (
         jsonify(
@@ -46,11 +55,14 @@ def remove_like():
     if not post_id or not user_id:
         return jsonify({"message": "post_id와 user_id가 필요합니다"}), 400
 
-    like = PostLike.query.filter_by(post_id=post_id, user_id=user_id).first()
-    if not like:
+    # 실제로 지운 행이 있을 때만 카운터 감소 (동시 취소 요청 중복 감소 방지)
+    deleted = PostLike.query.filter_by(post_id=post_id, user_id=user_id).delete(
+        synchronize_session=False
+    )
+    if not deleted:
         return jsonify({"message": "좋아요 기록이 없습니다"}), 404
 
-    db.session.delete(like)
+    adjust_post_counts(post_id, likes=-1)
     db.session.commit()
 
     return (
@@ -64,7 +76,7 @@ def remove_like():
 # 특정 게시글의 좋아요 수 조회
 @bp.route("/post/<int:post_id>", methods=["GET"])
 def get_post_likes(post_id):
-    count = PostLike.query.filter_by(post_id=post_id).count()
+    count = db.session.query(Post.like_count).filter_by(post_id=post_id).scalar() or 0
     return jsonify({"post_id": post_id, "like_count": count}), 200
 
 
@@ -2,6 +2,8 @@ from flask import Blueprint, request, jsonify
 from ..models import Reply
 from ..extensions import db
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from ..utils.pagination import clamp_per_page, keyset_paginate, COUNT_MODES
+from ..utils.post_counters import adjust_post_counts
 
 bp = Blueprint("reply", __name__)
 
@@ -40,6 +42,8 @@ def create_reply():
 
     db.session.add(reply)
     try:
+        # 카운터 UPDATE 가 INSERT 를 먼저 flush 하므로 없는 post_id 도 여기서 실패
+        adjust_post_counts(post_id, replies=1)
         db.session.commit()
         return (
             jsonify({"message": "댓글이 작성되었습니다.", "reply_id": reply.reply_id}),
@@ -60,9 +64,10 @@ def delete_reply(reply_id):
         return jsonify({"message": "본인의 댓글만 삭제할 수 있습니다."}), 403
 
     # 자식 댓글(대댓글)도 함께 삭제
-    Reply.query.filter_by(parent_id=reply_id).delete()
+    children = Reply.query.filter_by(parent_id=reply_id).delete()
 
     db.session.delete(reply)
+    adjust_post_counts(reply.post_id, replies=-(1 + children))
     db.session.commit()
 
     return jsonify({"message": "댓글이 삭제되었습니다."}), 200
@@ -93,19 +98,18 @@ def update_reply(reply_id):
 def get_root_replies(post_id):
     """
     루트 댓글 10개 단위로 페이지네이션
+    - cursor 파라미터가 있으면 keyset 방식 (빈 값 = 첫 페이지)
+    - count=exact|none|estimate (cursor 모드)
     """
     page = request.args.get("page", 1, type=int)
+    cursor = request.args.get("cursor")
+    count = request.args.get("count", "exact")
     PER_PAGE = 10
 
-    pagination = (
-        Reply.query.filter_by(post_id=post_id, parent_id=None)
-        .order_by(Reply.created_at.desc())
-        .paginate(page=page, per_page=PER_PAGE, error_out=False)
-    )
+    query = Reply.query.filter_by(post_id=post_id, parent_id=None)
 
-    # 연재님 이게 모야ㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏ
-    root_replies = [
-        {
+    def serialize(r):
+        return {
             "reply_id": r.reply_id,
             "content": r.content,
             "post_id": r.post_id,
@@ -116,8 +120,16 @@ def get_root_replies(post_id):
                 parent_id=r.reply_id
             ).count(),  # 대댓글 수
         }
-        for r in pagination.items
-    ]
+
+    if cursor is not None:
+        return _cursor_response(query, cursor, count, PER_PAGE, serialize)
+
+    pagination = query.order_by(Reply.created_at.desc()).paginate(
+        page=page, per_page=PER_PAGE, error_out=False
+    )
+
+    # 연재님 이게 모야ㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏㅏ
+    root_replies = [serialize(r) for r in pagination.items]
 
     return (
         jsonify(
@@ -142,18 +154,18 @@ def get_root_replies(post_id):
 def get_child_replies(parent_id):
     """
     특정 댓글(parent_id)의 대댓글 20개 단위로 페이지네이션
+    - cursor 파라미터가 있으면 keyset 방식 (빈 값 = 첫 페이지)
+    - count=exact|none|estimate (cursor 모드)
     """
     page = request.args.get("page", 1, type=int)
+    cursor = request.args.get("cursor")
+    count = request.args.get("count", "exact")
     PER_PAGE = 20
 
-    pagination = (
-        Reply.query.filter_by(parent_id=parent_id)
-        .order_by(Reply.created_at.desc())
-        .paginate(page=page, per_page=PER_PAGE, error_out=False)
-    )
+    query = Reply.query.filter_by(parent_id=parent_id)
 
-    children = [
-        {
+    def serialize(r):
+        return {
             "reply_id": r.reply_id,
             "content": (
                 r.content.decode("utf-8") if isinstance(r.content, bytes) else r.content
@@ -164,8 +176,15 @@ def get_child_replies(parent_id):
             "created_at": r.created_at.isoformat(),
             "updated_at": r.updated_at.isoformat(),
         }
-        for r in pagination.items
-    ]
+
+    if cursor is not None:
+        return _cursor_response(query, cursor, count, PER_PAGE, serialize)
+
+    pagination = query.order_by(Reply.created_at.desc()).paginate(
+        page=page, per_page=PER_PAGE, error_out=False
+    )
+
+    children = [serialize(r) for r in pagination.items]
 
     return (
         jsonify(
@@ -181,3 +200,29 @@ def get_child_replies(parent_id):
         ),
         200,
     )
+
+
+def _cursor_response(query, cursor, count, per_page, serialize):
+    """댓글 목록 keyset 페이지네이션 응답 (최신순)"""
+    if count not in COUNT_MODES:
+        return jsonify({"message": "count 는 exact, none, estimate 중 하나입니다."}), 400
+    per_page = clamp_per_page(per_page)
+    try:
+        items, next_cursor, total = keyset_paginate(
+            query, Reply.created_at, Reply.reply_id, cursor, per_page, count=count
+        )
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    return (
+        jsonify(
+            {
+                "total": total,
+                "per_page": per_page,
+                "has_next": next_cursor is not None,
+                "next_cursor": next_cursor,
+                "items": [serialize(r) for r in items],
+            }
+        ),
+        200,
+    )
@@ -0,0 +1,85 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from werkzeug.exceptions import ClientDisconnected
+from ..utils.upload_sessions import (
+    UploadError,
+    create_session,
+    get_session,
+    write_chunk,
+    finalize_session,
+    discard_session,
+    purge_expired_command,
+)
+
+bp = Blueprint("upload", __name__)
+bp.cli.add_command(purge_expired_command)  # flask upload purge-expired
+
+
+def _error(e):
+    body = {"message": str(e)}
+    if e.offset is not None:
+        body["offset"] = e.offset
+    return jsonify(body), e.status
+
+
+# ---------------- 1. 업로드 세션 생성 ----------------
+# body: {"filename": "a.jpg", "size": 12345678, "sha256": "(선택)"}
+@bp.route("", methods=["POST"])
+@jwt_required()
+def create_upload():
+    data = request.get_json(silent=True) or {}
+    try:
+        session = create_session(
+            get_jwt_identity(), data.get("filename"), data.get("size"), data.get("sha256")
+        )
+    except UploadError as e:
+        return _error(e)
+    return jsonify({"message": "업로드 세션 생성 완료", **session}), 201
+
+
+# ---------------- 2. 진행 상태 (이어 올릴 offset 확인) ----------------
+@bp.route("/<upload_id>", methods=["GET"])
+@jwt_required()
+def get_upload(upload_id):
+    try:
+        return jsonify(get_session(upload_id, get_jwt_identity())), 200
+    except UploadError as e:
+        return _error(e)
+
+
+# ---------------- 3. 청크 전송 ----------------
+# PUT /upload/<id>?offset=N  (body: 청크 바이트 그대로)
+@bp.route("/<upload_id>", methods=["PUT"])
+@jwt_required()
+def put_chunk(upload_id):
+    offset = request.args.get("offset", type=int)
+    try:
+        session = write_chunk(upload_id, get_jwt_identity(), offset, request.stream)
+    except UploadError as e:
+        return _error(e)
+    except ClientDisconnected:
+        # 받은 만큼은 기록됨 → GET 으로 offset 확인 후 이어서
+        return jsonify({"message": "청크 전송이 중단되었습니다."}), 400
+    return jsonify(session), 200
+
+
+# ---------------- 4. 완료 ----------------
+@bp.route("/<upload_id>/finalize", methods=["POST"])
+@jwt_required()
+def finalize_upload(upload_id):
+    try:
+        session = finalize_session(upload_id, get_jwt_identity())
+    except UploadError as e:
+        return _error(e)
+    return jsonify({"message": "업로드 완료", **session}), 200
+
+
+# ---------------- 5. 취소 ----------------
+@bp.route("/<upload_id>", methods=["DELETE"])
+@jwt_required()
+def cancel_upload(upload_id):
+    try:
+        discard_session(upload_id, get_jwt_identity())
+    except UploadError as e:
+        return _error(e)
+    return jsonify({"message": "업로드 세션 삭제 완료"}), 200
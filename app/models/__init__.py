@@ -5,6 +5,7 @@ from .friend import Friend
 from .my_path import MyPath
 from .history import History
 from .image import Image
+from .image_blob import ImageBlob
 from .location import Location
 from .mention import Mention
 from .post_like import PostLike
@@ -12,13 +12,18 @@ class Image(db.Model):
     )
     post_id = db.Column(db.Integer, db.ForeignKey("posts.post_id"), nullable=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.user_id"), nullable=False)
+    # 게시글 이미지는 image_blobs 파일을 공유 (directory 는 blob 경로와 같음), 프로필/이전 이미지는 NULL
+    blob_id = db.Column(db.Integer, db.ForeignKey("image_blobs.blob_id"), nullable=True, index=True)
     directory = db.Column(db.Text, nullable=False)
     original_image_name = db.Column(db.String(255), nullable=False)
     ext = db.Column(db.String(10), nullable=False)
+    # pending: 비동기 처리 대기 (원본만 저장됨) / processing: 작업이 가져가 처리 중 / ready: 사용 가능 / failed: 처리 실패
+    status = db.Column(db.String(10), nullable=False, default="ready", server_default="ready")
     created_at = db.Column(db.DateTime, default=datetime.now)
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
 
     post = db.relationship("Post", backref=db.backref("images", lazy="joined"))
+    blob = db.relationship("ImageBlob")
     user = db.relationship(
         "User", backref=db.backref("uploaded_images", lazy="dynamic")
     )
@@ -0,0 +1,20 @@
+from datetime import datetime
+from ..extensions import db
+
+
+class ImageBlob(db.Model):
+    """내용(SHA-256) 기준으로 한 번만 저장되는 이미지 파일, images / reply_images 가 참조"""
+
+    __tablename__ = "image_blobs"
+
+    blob_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    sha256 = db.Column(db.String(64), unique=True, nullable=False)
+    directory = db.Column(db.Text, nullable=False)
+    ext = db.Column(db.String(10), nullable=False)
+    size_bytes = db.Column(db.Integer, nullable=False)
+    # 참조하는 images + reply_images 행 수, 0 이 되면 파일과 함께 삭제
+    ref_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    def __repr__(self):
+        return f"<ImageBlob {self.blob_id} {self.sha256[:12]} refs={self.ref_count}>"
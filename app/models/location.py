@@ -1,5 +1,7 @@
 from ..extensions import db
 from datetime import datetime
+from sqlalchemy import event
+from ..utils.geo_utils import geo_cell
 
 class Location(db.Model):
     __tablename__ = "locations"
@@ -8,6 +10,7 @@ class Location(db.Model):
     post_id = db.Column(db.Integer, db.ForeignKey("posts.post_id"), nullable=False)
     latitude = db.Column(db.Float, nullable=False)
     longitude = db.Column(db.Float, nullable=False)
+    geo_cell = db.Column(db.BigInteger, nullable=True)  # 격자 셀 번호 (반경 검색용)
     order_index = db.Column(db.Integer, nullable=False, default=0)  # 점 순서
     location_name = db.Column(db.String(100), nullable=True)  # 선택
     recommend_point = db.Column(db.Integer, default=0)
@@ -16,3 +19,15 @@ class Location(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
 
     post = db.relationship("Post", backref="locations")
+
+    __table_args__ = (
+        db.Index("ix_locations_geo_cell_post", "geo_cell", "post_id"),
+        db.Index("ix_locations_lat_lon", "latitude", "longitude"),
+    )
+
+
+@event.listens_for(Location, "before_insert")
+@event.listens_for(Location, "before_update")
+def set_geo_cell(mapper, connection, target):
+    if target.latitude is not None and target.longitude is not None:
+        target.geo_cell = geo_cell(target.latitude, target.longitude)
@@ -10,10 +10,18 @@ class Post(db.Model):
     category_id = db.Column(db.Integer, db.ForeignKey("categories.category_id"))
     content = db.Column(db.Text, nullable=False)
     view_counts = db.Column(db.Integer, default=0)
+    like_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    reply_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
     created_at = db.Column(db.DateTime, default=datetime.now)
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
 
     category = db.relationship("Category", backref="posts")
 
+    # like_count / reply_count 는 utils/post_counters.py 에서 관리
+    __table_args__ = (
+        db.Index("ix_posts_like_count", "like_count"),
+        db.Index("ix_posts_reply_count", "reply_count"),
+    )
+
     def add_view_counts(self):
         self.view_counts = self.view_counts + 1
@@ -12,6 +12,7 @@ class ReplyImage(db.Model):
     )
     reply_id = db.Column(db.Integer, db.ForeignKey("replies.reply_id"), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey("users.user_id"), nullable=False)
+    blob_id = db.Column(db.Integer, db.ForeignKey("image_blobs.blob_id"), nullable=True, index=True)
     directory = db.Column(db.Text, nullable=False)
     original_image_name = db.Column(db.String(255), nullable=False)
     ext = db.Column(db.String(10), nullable=False)
@@ -19,6 +20,7 @@ class ReplyImage(db.Model):
 
     reply = db.relationship("Reply", backref=db.backref("reply_images", lazy="dynamic"))
     user = db.relationship("User", backref=db.backref("reply_images", lazy="dynamic"))
+    blob = db.relationship("ImageBlob")
 
     def __repr__(self):
         return f"<ReplyImage {self.image_id} - {self.original_image_name}>"
@@ -0,0 +1,17 @@
+# utils/geo_utils.py
+"""
+ 위치 격자(grid cell) 번호 계산
+- Location.geo_cell 저장용
+- apps/common/geo.py 와 같은 격자 정의를 사용해야 함 (반경 검색은 그쪽에서 수행)
+"""
+import math
+
+GEO_CELL_DEG = 0.05  # 약 5.5km
+GEO_LON_CELLS = int(round(360 / GEO_CELL_DEG))
+
+
+def geo_cell(latitude, longitude):
+    """위도/경도 → 격자 셀 번호 (행 * GEO_LON_CELLS + 열)"""
+    row = int(math.floor((latitude + 90) / GEO_CELL_DEG))
+    col = int(math.floor((longitude + 180) / GEO_CELL_DEG)) % GEO_LON_CELLS
+    return row * GEO_LON_CELLS + col
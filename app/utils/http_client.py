@@ -0,0 +1,30 @@
+# utils/http_client.py
+"""
+ 외부 HTTP 호출용 requests.Session (연결 재사용)
+- 호스트별 커넥션 풀 (pool_maxsize: 동시에 쓰는 스레드 수만큼)
+- retries > 0 이면 연결 오류 / status_forcelist 응답을 backoff 하며 재시도
+  (read_retries: 응답 대기 중 타임아웃 재시도 횟수, None 이면 retries 와 같음, False 면 재시도 없이 바로 Timeout)
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def create_session(
+    pool_maxsize=10, retries=0, read_retries=None, backoff_factor=0.0, status_forcelist=(), allowed_methods=("GET",)
+):
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries if read_retries is None else read_retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=status_forcelist,
+        allowed_methods=frozenset(allowed_methods),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
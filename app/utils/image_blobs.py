@@ -0,0 +1,323 @@
+# utils/image_blobs.py
+"""
+ 내용 주소(content-addressed) 이미지 저장소
+- 압축 결과를 SHA-256 으로 static/blobs/{앞 2자리}/{sha256}.{ext} 에 한 번만 저장
+  (재업로드/더미 데이터처럼 같은 내용이면 기존 파일 재사용, 변형본도 blob 옆에 한 벌만)
+- image_blobs.ref_count = 이 blob 을 참조하는 images + reply_images 행 수
+  · 업로드: acquire_blobs 로 +1 (행 INSERT 와 같은 트랜잭션)
+  · 삭제  : release_blob 으로 -1, 커밋 후 purge_blobs 가 0 인 행과 파일/변형본 삭제
+    (롤백되면 ref_count 가 되돌아가므로 파일도 남는다)
+- 업로드와 삭제가 겹치지 않도록 blob 행은 SELECT ... FOR UPDATE 로 잠그고 확인
+  write_blob 은 임시 파일(source)을 acquire 때까지 남겨 두고, 잠근 뒤 blob 파일이 없으면 다시 만든다
+  (동시에 마지막 참조가 해제돼 파일이 지워진 경우)
+- 기존 날짜 폴더 이미지는 `flask post migrate-blobs` 로 옮긴다 (ref_count 재계산 포함)
+"""
+import hashlib
+import os
+import shutil
+from collections import Counter
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy.exc import IntegrityError
+from ..extensions import db
+from ..models.image import Image
+from ..models.image_blob import ImageBlob
+from ..models.reply_image import ReplyImage
+from .image_storage import ensure_dir, write_temp
+
+BLOB_FOLDER = "static/blobs"
+
+
+def blob_rel_path(sha256, ext):
+    return f"{BLOB_FOLDER}/{sha256[:2]}/{sha256}.{ext.lower()}"
+
+
+def file_sha256(abs_path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(abs_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_blob(output_stream, ext):
+    """
+     (DB 없이) 압축 결과를 내용 주소 경로에 저장, 같은 내용의 파일이 이미 있으면 쓰지 않음
+    - 해시를 계산하면서 청크 단위로 임시 파일에 쓴 뒤 blob 경로에 하드 링크
+    - 임시 파일(source)은 acquire_blobs / discard_blob_sources 가 지운다
+    - 반환: {"sha256", "path", "ext", "size_bytes", "created", "source"}
+    """
+    digest = hashlib.sha256()
+    tmp_path, size_bytes = write_temp(
+        output_stream, os.path.join(current_app.root_path, BLOB_FOLDER), digest
+    )
+    sha256 = digest.hexdigest()
+    rel_path = blob_rel_path(sha256, ext)
+    abs_path = os.path.join(current_app.root_path, rel_path)
+
+    # 같은 내용을 동시에 쓰는 스레드/프로세스가 있어도 임시 파일은 따로, 링크는 원자적
+    created = _link(tmp_path, abs_path)
+    if created:
+        current_app.logger.info(f"[✓] 이미지 blob 저장 → {rel_path}")
+    else:
+        # 재사용 표시 (gc-images 는 최근 수정된 파일을 지우지 않음)
+        os.utime(abs_path)
+
+    return {
+        "sha256": sha256,
+        "path": rel_path,
+        "ext": ext.lower(),
+        "size_bytes": size_bytes,
+        "created": created,
+        "source": tmp_path,
+    }
+
+
+def _link(source, abs_path):
+    """source 를 abs_path 에 하드 링크, 이미 있으면 False"""
+    ensure_dir(os.path.dirname(abs_path))
+    try:
+        os.link(source, abs_path)
+    except FileExistsError:
+        return False
+    except OSError:
+        # 하드 링크를 지원하지 않는 파일 시스템 → 복사 후 교체
+        if os.path.exists(abs_path):
+            return False
+        copy_path = f"{source}.copy.tmp"
+        shutil.copyfile(source, copy_path)
+        os.replace(copy_path, abs_path)
+    return True
+
+
+def discard_blob_sources(items):
+    """write_blob 이 남긴 임시 파일 삭제 (acquire 하지 않고 끝나는 실패 경로용)"""
+    for item in items:
+        source = item.pop("source", None)
+        if source:
+            try:
+                os.remove(source)
+            except OSError:
+                pass
+
+
+def _get_or_create_blob(sha256, path, ext, size_bytes):
+    """blob 행을 잠그고 반환 (없으면 생성), 커밋/롤백까지 release_blob / purge_blobs 와 겹치지 않음"""
+    blob = ImageBlob.query.filter_by(sha256=sha256).with_for_update().first()
+    if blob is not None:
+        return blob
+    try:
+        # 동시에 같은 내용을 올린 요청과 경쟁하면 UNIQUE 위반 → 상대가 만든 행 사용
+        with db.session.begin_nested():
+            blob = ImageBlob(sha256=sha256, directory=path, ext=ext, size_bytes=size_bytes, ref_count=0)
+            db.session.add(blob)
+    except IntegrityError:
+        blob = ImageBlob.query.filter_by(sha256=sha256).with_for_update().one()
+    return blob
+
+
+def acquire_blobs(items):
+    """
+     write_blob 결과(sha256 포함)들의 blob 행을 찾거나 만들고 ref_count 를 원자적으로 증가
+    - 커밋은 호출하는 쪽에서 (이미지 행 INSERT 와 같은 트랜잭션)
+    - sha256 이 없는 항목(비동기 업로드 원본 등)은 건너뜀
+    - 행을 잠근 뒤 blob 파일이 없으면 (동시에 마지막 참조가 해제돼 지워짐) 업로드한 내용으로 다시 만듦
+    - 끝나면 write_blob 의 임시 파일 삭제
+    - 반환: {sha256: blob_id}
+    """
+    items = [item for item in items if item.get("sha256")]
+    counts = Counter(item["sha256"] for item in items)
+    blob_ids = {}
+    try:
+        for item in items:
+            sha256 = item["sha256"]
+            if sha256 in blob_ids:
+                continue
+            blob = _get_or_create_blob(sha256, item["path"], item["ext"], item["size_bytes"])
+            if item.get("source") and _link(item["source"], os.path.join(current_app.root_path, blob.directory)):
+                current_app.logger.info(f"[✓] 이미지 blob 다시 저장 → {blob.directory}")
+            ImageBlob.query.filter(ImageBlob.blob_id == blob.blob_id).update(
+                {ImageBlob.ref_count: ImageBlob.ref_count + counts[sha256]},
+                synchronize_session=False,
+            )
+            blob_ids[sha256] = blob.blob_id
+    finally:
+        discard_blob_sources(items)
+    return blob_ids
+
+
+def _remove_blob_files(rel_path):
+    from .image_variants import remove_variants
+
+    remove_variants(rel_path)
+    abs_path = os.path.join(current_app.root_path, rel_path)
+    try:
+        if os.path.exists(abs_path):
+            os.remove(abs_path)
+    except OSError as e:
+        current_app.logger.warning(f"[!] blob 파일 삭제 실패: {abs_path} ({e})")
+
+
+def release_blob(blob_id):
+    """
+     참조 하나 해제 (blob 행을 잠그고 ref_count -1)
+    - 커밋은 호출하는 쪽에서, 파일은 지우지 않음
+    - 반환: 마지막 참조였으면 blob_id (커밋 후 purge_blobs 로 넘길 것), 아니면 None
+    """
+    blob = ImageBlob.query.filter_by(blob_id=blob_id).with_for_update().first()
+    if blob is None:
+        return None
+    blob.ref_count = blob.ref_count - 1
+    return blob_id if blob.ref_count <= 0 else None
+
+
+def purge_blobs(blob_ids):
+    """
+     (release 를 커밋한 뒤) ref_count 가 0 인 blob 행과 파일(변형본 포함) 삭제
+    - 행을 다시 잠그고 확인 → 그 사이 다른 업로드가 참조했으면 남김
+    - blob 마다 따로 커밋, 반환: 삭제한 blob 수
+    """
+    removed = 0
+    for blob_id in blob_ids:
+        try:
+            blob = ImageBlob.query.filter_by(blob_id=blob_id).with_for_update().first()
+            if blob is not None and blob.ref_count <= 0:
+                _remove_blob_files(blob.directory)
+                db.session.delete(blob)
+                removed += 1
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.warning(f"[!] blob 정리 실패 (blob_id={blob_id}): {e}")
+    return removed
+
+
+def purge_released_blobs():
+    """release 후 정리되지 못한 (프로세스 종료 등) ref_count 0 이하 blob 정리, 반환: 삭제한 수"""
+    blob_ids = db.session.execute(db.select(ImageBlob.blob_id).where(ImageBlob.ref_count <= 0)).scalars().all()
+    return purge_blobs(blob_ids)
+
+
+def is_unreferenced_blob(rel_path):
+    """blob 경로인데 가리키는 image_blobs 행이 없으면 True (업로드 실패 정리용)"""
+    if not rel_path.startswith(f"{BLOB_FOLDER}/"):
+        return False
+    return ImageBlob.query.filter_by(directory=rel_path).first() is None
+
+
+def reconcile_blob_refs():
+    """
+     ref_count 를 실제 images + reply_images 참조 수로 다시 계산
+    - 반환: 수정된 blob 수
+    """
+    image_refs = (
+        db.select(db.func.count())
+        .where(Image.blob_id == ImageBlob.blob_id)
+        .correlate(ImageBlob)
+        .scalar_subquery()
+    )
+    reply_refs = (
+        db.select(db.func.count())
+        .where(ReplyImage.blob_id == ImageBlob.blob_id)
+        .correlate(ImageBlob)
+        .scalar_subquery()
+    )
+    fixed = ImageBlob.query.filter(ImageBlob.ref_count != image_refs + reply_refs).update(
+        {ImageBlob.ref_count: image_refs + reply_refs}, synchronize_session=False
+    )
+    db.session.commit()
+    return fixed
+
+
+def migrate_legacy_images(chunk_size=200, dry_run=False):
+    """
+     blob_id 가 없는 게시글/댓글 이미지 파일을 blob 저장소로 옮김
+    - 같은 내용이면 기존 blob 재사용, 옛 파일과 옛 변형본은 커밋 후 삭제 (변형본은 요청 시 다시 생성)
+    - 새 blob 파일은 복사 후 커밋 → 중간에 실패해도 옛 경로가 그대로 남음
+    - 반환: {"migrated", "deduplicated", "missing", "bytes_saved"}
+    """
+    from .image_variants import remove_variants
+
+    stats = {"migrated": 0, "deduplicated": 0, "missing": 0, "bytes_saved": 0}
+    seen = {}  # dry_run 용: sha256 → 처음 본 경로
+    targets = [
+        (Image, Image.image_id, [Image.post_id.isnot(None), Image.status == "ready"]),
+        (ReplyImage, ReplyImage.image_id, []),
+    ]
+    for model, pk, filters in targets:
+        last_id = 0
+        while True:
+            rows = (
+                model.query.filter(model.blob_id.is_(None), pk > last_id, *filters)
+                .order_by(pk)
+                .limit(chunk_size)
+                .all()
+            )
+            if not rows:
+                break
+            last_id = rows[-1].image_id
+
+            acquired = Counter()
+            old_paths = []
+            for row in rows:
+                abs_path = os.path.join(current_app.root_path, row.directory)
+                if not os.path.exists(abs_path):
+                    stats["missing"] += 1
+                    continue
+                sha256 = file_sha256(abs_path)
+                size_bytes = os.path.getsize(abs_path)
+                ext = row.directory.rsplit(".", 1)[-1].lower()
+
+                if dry_run:
+                    duplicate = sha256 in seen or ImageBlob.query.filter_by(sha256=sha256).first()
+                    seen.setdefault(sha256, row.directory)
+                else:
+                    rel_path = blob_rel_path(sha256, ext)
+                    blob_abs = os.path.join(current_app.root_path, rel_path)
+                    if not os.path.exists(blob_abs):
+                        os.makedirs(os.path.dirname(blob_abs), exist_ok=True)
+                        shutil.copy2(abs_path, blob_abs)
+                    duplicate = ImageBlob.query.filter_by(sha256=sha256).first() is not None
+                    blob = _get_or_create_blob(sha256, rel_path, ext, size_bytes)
+                    acquired[blob.blob_id] += 1
+                    if row.directory != blob.directory:
+                        old_paths.append(row.directory)
+                    row.blob_id = blob.blob_id
+                    row.directory = blob.directory
+
+                stats["migrated"] += 1
+                if duplicate:
+                    stats["deduplicated"] += 1
+                    stats["bytes_saved"] += size_bytes
+
+            if dry_run:
+                continue
+            for blob_id, count in acquired.items():
+                ImageBlob.query.filter(ImageBlob.blob_id == blob_id).update(
+                    {ImageBlob.ref_count: ImageBlob.ref_count + count}, synchronize_session=False
+                )
+            db.session.commit()
+            for old_path in old_paths:
+                remove_variants(old_path)
+                try:
+                    os.remove(os.path.join(current_app.root_path, old_path))
+                except OSError:
+                    pass
+    return stats
+
+
+@click.command("migrate-blobs")
+@click.option("--chunk-size", default=200, show_default=True, help="한 번에 처리할 이미지 행 수")
+@click.option("--dry-run", is_flag=True, help="옮기지 않고 중복/절약 용량만 계산")
+@with_appcontext
+def migrate_blobs_command(chunk_size, dry_run):
+    """기존 게시글/댓글 이미지를 내용 주소 blob 저장소로 옮기고 ref_count 재계산"""
+    stats = migrate_legacy_images(chunk_size=chunk_size, dry_run=dry_run)
+    click.echo(
+        f"{'[dry-run] ' if dry_run else ''}이미지 {stats['migrated']}개 처리, "
+        f"중복 {stats['deduplicated']}개 ({stats['bytes_saved'] / 1024 / 1024:.1f} MB 절약), "
+        f"파일 없음 {stats['missing']}개"
+    )
+    if not dry_run:
+        click.echo(f"ref_count 보정 {reconcile_blob_refs()}개")
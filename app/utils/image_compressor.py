@@ -1,42 +1,164 @@
-# utils/image_storage.py
+# utils/image_compressor.py
 from io import BytesIO
 from flask import current_app
 from .image_rules import IMAGE_RULES
-from ..models.image import Image
 from PIL import Image as PILImage
 
+# 품질 탐색 범위 / 간격 (기존 85 → 25, 10 단위보다 촘촘하게)
+MAX_QUALITY = 85
+MIN_QUALITY = 25
+QUALITY_STEP = 5
+QUALITY_LEVELS = list(range(MIN_QUALITY, MAX_QUALITY + 1, QUALITY_STEP))
 
-def compress_image(file, image_type="default"):
+# 품질 파라미터가 의미 있는 포맷 (PNG/GIF 등은 한 번만 인코딩)
+LOSSY_FORMATS = {"jpeg", "jpg", "webp"}
+
+# 크기 추정용 축소본의 긴 변
+TRIAL_MAX_SIDE = 384
+
+# 디코딩할 픽셀 수 상한 (decompression bomb 방지, 48MP 사진 + 여유)
+MAX_DECODED_PIXELS = 64_000_000
+
+# JPEG 축소 디코딩 시 최종 크기 대비 남겨 둘 배율
+# (thumbnail 기본값 2.0 이면 48MP → 2560 게시글 이미지가 축소되지 않음, 나머지는 LANCZOS 가 처리)
+DRAFT_GAP = 1.5
+
+
+def _open_image(file, max_size):
+    """
+     이미지를 열고 디코딩 전에 검사
+    - JPEG 은 최종 크기의 DRAFT_GAP 배 이상 남는 가장 작은 스케일(1/2 ~ 1/8)로 디코딩하도록 draft
+      (12~48MP 원본을 통째로 풀지 않음)
+    - draft 후에도 디코딩할 픽셀 수가 MAX_DECODED_PIXELS 를 넘으면 ValueError
+    """
+    try:
+        image = PILImage.open(file)
+    except PILImage.DecompressionBombError as e:
+        raise ValueError(f"이미지 해상도가 너무 큽니다 ({e})")
+
+    if max_size and image.format == "JPEG":
+        # 비율을 유지한 최종 크기 기준 (정사각형 max_size 그대로면 짧은 변 때문에 덜 줄어듦)
+        ratio = min(max_size[0] / image.width, max_size[1] / image.height)
+        if ratio < 1:
+            image.draft(
+                image.mode,
+                (int(image.width * ratio * DRAFT_GAP), int(image.height * ratio * DRAFT_GAP)),
+            )
+    if image.width * image.height > MAX_DECODED_PIXELS:
+        image.close()
+        raise ValueError(f"이미지 해상도가 너무 큽니다 ({image.width}x{image.height})")
+    return image
+
+
+def _encode(image, fmt, quality, optimize=False):
+    output = BytesIO()
+    image.save(output, format=fmt.upper(), optimize=optimize, quality=quality)
+    return output
+
+
+def _estimate_quality(image, fmt, max_bytes, full_bytes, stats):
+    """
+     축소본 인코딩으로 원본 크기를 추정해, max_bytes 에 들어갈 것 같은 가장 높은 품질 인덱스 반환
+    - 추정 크기 = 축소본 크기(q) × (원본 크기(85) / 축소본 크기(85))
+      (원본 크기(85)는 첫 인코딩에서 이미 알고 있음)
+    - 축소는 NEAREST (픽셀 샘플링): 보간하면 잡음/질감이 뭉개져 낮은 품질 구간 크기를 과소 추정함
+    """
+    width, height = image.size
+    ratio = TRIAL_MAX_SIDE / max(width, height)
+    if ratio >= 1:
+        trial = image
+    else:
+        trial = image.resize(
+            (max(1, int(width * ratio)), max(1, int(height * ratio))), PILImage.Resampling.NEAREST
+        )
+
+    def trial_bytes(index):
+        stats["trial_encodes"] += 1
+        return len(_encode(trial, fmt, QUALITY_LEVELS[index]).getvalue())
+
+    top = len(QUALITY_LEVELS) - 1
+    scale = full_bytes / max(trial_bytes(top), 1)
+
+    # QUALITY_LEVELS 인덱스 위에서 이분 탐색 (축소본이라 인코딩 비용이 작음)
+    lo, hi, seed = 0, top - 1, 0
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        if trial_bytes(mid) * scale <= max_bytes:
+            seed, lo = mid, mid + 1
+        else:
+            hi = mid - 1
+    return seed
+
+
+def _search_quality(image, fmt, max_bytes, full_bytes, stats):
+    """
+     max_bytes 안에 들어가는 가장 높은 품질 (QUALITY_LEVELS 중)
+    - 축소본 추정치를 원본으로 확인하고, 틀렸으면 맞는 방향의 이웃부터 확인 후 이분 탐색
+      (추정이 맞으면 원본 인코딩 2회)
+    - 탐색 인코딩은 optimize=False (빠름), 최종 인코딩만 optimize=True
+    - MAX_QUALITY 는 이미 초과한 것으로 확인된 상태에서 호출 (full_bytes: 그때 크기)
+    """
+    def fits(index):
+        stats["encodes"] += 1
+        return len(_encode(image, fmt, QUALITY_LEVELS[index]).getvalue()) <= max_bytes
+
+    seed = _estimate_quality(image, fmt, max_bytes, full_bytes, stats)
+    if fits(seed):
+        # 더 높은 품질 쪽 탐색 (MAX_QUALITY 는 제외)
+        best, lo, hi, probe = seed, seed + 1, len(QUALITY_LEVELS) - 2, seed + 1
+    else:
+        # 더 낮은 품질 쪽 탐색 (모두 초과하면 최저 품질 사용)
+        best, lo, hi, probe = 0, 0, seed - 1, seed - 1
+
+    while lo <= hi:
+        if fits(probe):
+            best, lo = probe, probe + 1
+        else:
+            hi = probe - 1
+        probe = (lo + hi) // 2
+    return QUALITY_LEVELS[best]
+
+
+def compress_image(file, image_type="default", stats=None):
     """
      이미지 압축 및 리사이즈 공용 함수
     - IMAGE_RULES[image_type]에 따라 크기와 용량 제한 적용
-    - 반환: (BytesIO 압축 데이터, 확장자/포맷)
+    - 품질 85 로 먼저 인코딩, 용량 제한 안이면 그대로 사용
+    - 초과하면 (JPEG/WEBP) 제한에 맞는 품질을 탐색 후 optimize=True 로 한 번 더 인코딩
+    - PNG/GIF 등은 품질 파라미터가 없으므로 다시 인코딩하지 않음
+    - JPEG 은 축소 디코딩, 해상도가 너무 큰 이미지는 디코딩 전에 ValueError
+    - stats: dict 를 넘기면 encodes / trial_encodes / quality / bytes 기록 (벤치마크용)
+    - 반환: (BytesIO 압축 데이터, 확장자/포맷, 원본 파일명 — file 에 filename 이 없으면 None)
     """
     rule = IMAGE_RULES.get(image_type, IMAGE_RULES["default"])
     max_size = rule["max_size"]
     max_bytes = rule["max_bytes"]
+    stats = stats if stats is not None else {}
+    stats.update(encodes=0, trial_encodes=0)
 
-    image = PILImage.open(file)
+    image = _open_image(file, max_size)
     fmt = (image.format or "JPEG").lower()
 
     # 1️⃣ 리사이즈 (비율 유지)
     if max_size:
         image.thumbnail(max_size, PILImage.Resampling.LANCZOS)
 
-    # 2️⃣ 압축 반복
-    quality = 85
-    output = BytesIO()
-    image.save(output, format=fmt.upper(), optimize=True, quality=quality)
-    output.seek(0)
+    # 2️⃣ 최고 품질로 먼저 인코딩 (대부분 여기서 끝)
+    quality = MAX_QUALITY
+    stats["encodes"] += 1
+    output = _encode(image, fmt, quality, optimize=True)
+
+    # 3️⃣ 용량 초과 시 품질 탐색 후 한 번만 다시 인코딩
+    if output.tell() > max_bytes and fmt in LOSSY_FORMATS:
+        quality = _search_quality(image, fmt, max_bytes, output.tell(), stats)
+        stats["encodes"] += 1
+        output = _encode(image, fmt, quality, optimize=True)
 
-    while len(output.getvalue()) > max_bytes and quality > 30:
-        quality -= 10
-        output = BytesIO()
-        image.save(output, format=fmt.upper(), optimize=True, quality=quality)
-        output.seek(0)
+    output.seek(0)
+    stats.update(quality=quality, bytes=len(output.getvalue()))
 
     current_app.logger.info(
-        f"[✓] {image_type} 이미지 압축 완료 ({len(output.getvalue()) / 1024:.1f} KB, 품질={quality})"
+        f"[✓] {image_type} 이미지 압축 완료 ({stats['bytes'] / 1024:.1f} KB, 품질={quality}, 인코딩={stats['encodes']}회)"
     )
 
-    return output, fmt, file.filename
+    return output, fmt, getattr(file, "filename", None)
@@ -0,0 +1,218 @@
+# utils/image_gc.py
+"""
+ 고아 이미지 파일 정리 (`flask post gc-images`)
+- static/*_images (날짜 폴더, pending, 프로필 backup) 와 static/blobs 를 os.scandir 로 스트리밍 순회
+- batch_size 개씩 모아 images / reply_images / users.profile_img / image_blobs 에 IN 쿼리로 참조 확인
+- 변형본({stem}_{size}.*)은 원본({stem}.*)이 참조되고 있으면 유지
+- 업로드 중(파일 저장 → 행 커밋 전)인 파일을 지우지 않도록 min_age 보다 최근 파일은 건너뜀
+  (write_blob 은 기존 blob 파일을 재사용할 때 mtime 을 갱신, 삭제 직전에 다시 확인)
+- 프로필 backup 폴더는 원래 참조되지 않음 → backup_days 가 지난 파일만 정리
+- 삭제 대신 quarantine(instance/image_quarantine/{실행 시각}/{원래 경로}) 으로 옮길 수 있음
+- rate: 초당 삭제/이동 파일 수 제한 (0 이면 제한 없음)
+- 시작 전에 release 후 정리되지 못한 ref_count 0 blob 을 purge_released_blobs 로 먼저 정리
+"""
+import os
+import re
+import shutil
+import time
+from datetime import datetime
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from ..extensions import db
+from ..models.image import Image
+from ..models.image_blob import ImageBlob
+from ..models.reply_image import ReplyImage
+from ..models.user import User
+from .image_blobs import BLOB_FOLDER, purge_released_blobs
+from .image_variants import IMAGE_SIZES, TRANSCODE_SOURCE_EXTS
+
+STATIC_FOLDER = "static"
+BACKUP_FOLDER = "static/profile_images/backup"
+QUARANTINE_FOLDER = "image_quarantine"
+
+_VARIANT_NAME = re.compile(rf"^(?P<stem>.+)_(?:{'|'.join(IMAGE_SIZES)})\.(?P<ext>\w+)$")
+
+
+def _scan_roots():
+    """정리 대상 최상위 폴더 (static/*_images, static/blobs)"""
+    static_abs = os.path.join(current_app.root_path, STATIC_FOLDER)
+    roots = []
+    with os.scandir(static_abs) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False) and entry.name.endswith("_images"):
+                roots.append(f"{STATIC_FOLDER}/{entry.name}")
+    if os.path.isdir(os.path.join(current_app.root_path, BLOB_FOLDER)):
+        roots.append(BLOB_FOLDER)
+    return sorted(roots)
+
+
+def _walk(rel_dir):
+    """rel_dir 아래 파일을 (상대경로, DirEntry) 로 하나씩 (목록을 메모리에 모으지 않음)"""
+    try:
+        entries = os.scandir(os.path.join(current_app.root_path, rel_dir))
+    except FileNotFoundError:
+        return
+    with entries:
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}"
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk(rel_path)
+            elif entry.is_file(follow_symlinks=False):
+                yield rel_path, entry
+
+
+def _reference_candidates(rel_path):
+    """이 파일을 살려 두는 DB 경로 후보 (변형본이면 원본 경로들도)"""
+    if rel_path.endswith(".tmp"):
+        return []  # 쓰다 만 임시 파일
+    candidates = [rel_path]
+    directory, filename = rel_path.rsplit("/", 1)
+    match = _VARIANT_NAME.match(filename)
+    if match:
+        # webp/avif 변형본은 원본 확장자를 알 수 없으므로 변환 가능한 원본 확장자를 모두 후보로
+        for ext in {match["ext"].lower(), *TRANSCODE_SOURCE_EXTS}:
+            candidates.append(f"{directory}/{match['stem']}.{ext}")
+    return candidates
+
+
+def _referenced(paths):
+    """paths 중 DB 가 참조하는 경로 집합 (테이블마다 IN 쿼리 한 번)"""
+    if not paths:
+        return set()
+    referenced = set()
+    for column in (Image.directory, ReplyImage.directory, User.profile_img, ImageBlob.directory):
+        referenced.update(db.session.execute(db.select(column).where(column.in_(paths))).scalars())
+    return referenced
+
+
+def find_orphans(stats, batch_size=500, min_age=3600, backup_days=30):
+    """
+     고아 파일을 (상대경로, 절대경로, 크기) 로 하나씩 반환
+    - stats["scanned"], stats["recent"] 를 채움
+    """
+    now = time.time()
+    backup_cutoff = now - backup_days * 24 * 60 * 60
+
+    def check(batch):
+        paths = {path for _, candidates, _ in batch for path in candidates}
+        referenced = _referenced(list(paths))
+        for rel_path, candidates, entry in batch:
+            if not referenced.intersection(candidates):
+                yield rel_path, entry.path, entry.stat().st_size
+
+    for root in _scan_roots():
+        batch = []
+        for rel_path, entry in _walk(root):
+            stats["scanned"] += 1
+            mtime = entry.stat().st_mtime
+            if rel_path.startswith(f"{BACKUP_FOLDER}/"):
+                if mtime < backup_cutoff:
+                    yield rel_path, entry.path, entry.stat().st_size
+                continue
+            if now - mtime < min_age:
+                stats["recent"] += 1
+                continue
+            batch.append((rel_path, _reference_candidates(rel_path), entry))
+            if len(batch) >= batch_size:
+                yield from check(batch)
+                batch = []
+        yield from check(batch)
+
+
+def collect_orphans(
+    batch_size=500, min_age=3600, backup_days=30, dry_run=False, quarantine=False, rate=0, on_orphan=None
+):
+    """
+     고아 파일 삭제 (또는 quarantine 으로 이동)
+    - dry_run: 파일은 그대로 두고 on_orphan(rel_path, size) 로 보고만
+    - 반환: {"scanned", "recent", "orphans", "bytes", "removed", "skipped", "quarantine", "purged_blobs"}
+    """
+    stats = {
+        "scanned": 0,
+        "recent": 0,
+        "orphans": 0,
+        "bytes": 0,
+        "removed": 0,
+        "skipped": 0,
+        "quarantine": None,
+        "purged_blobs": 0,
+    }
+    if not dry_run:
+        stats["purged_blobs"] = purge_released_blobs()
+    if quarantine and not dry_run:
+        stats["quarantine"] = os.path.join(
+            current_app.instance_path, QUARANTINE_FOLDER, datetime.now().strftime("%Y%m%d_%H%M%S")
+        )
+
+    interval = 1.0 / rate if rate > 0 else 0
+    next_at = time.monotonic()
+    for rel_path, abs_path, size in find_orphans(stats, batch_size, min_age, backup_days):
+        stats["orphans"] += 1
+        stats["bytes"] += size
+        if on_orphan is not None:
+            on_orphan(rel_path, size)
+        if dry_run:
+            continue
+
+        if interval:
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            next_at = max(next_at, time.monotonic()) + interval
+
+        try:
+            # 확인 이후 재사용(write_blob 의 mtime 갱신)됐으면 건너뜀
+            if not rel_path.startswith(f"{BACKUP_FOLDER}/") and time.time() - os.stat(abs_path).st_mtime < min_age:
+                stats["skipped"] += 1
+                continue
+            if stats["quarantine"]:
+                target = os.path.join(stats["quarantine"], rel_path)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.move(abs_path, target)
+            else:
+                os.remove(abs_path)
+            stats["removed"] += 1
+        except FileNotFoundError:
+            stats["skipped"] += 1
+        except OSError as e:
+            stats["skipped"] += 1
+            current_app.logger.warning(f"[!] 고아 이미지 정리 실패: {abs_path} ({e})")
+    return stats
+
+
+@click.command("gc-images")
+@click.option("--dry-run", is_flag=True, help="지우지 않고 고아 파일 목록과 용량만 출력")
+@click.option("--quarantine", is_flag=True, help="삭제 대신 instance/image_quarantine/ 으로 이동")
+@click.option("--batch-size", default=500, show_default=True, help="IN 쿼리 한 번에 확인할 파일 수")
+@click.option("--min-age", default=3600, show_default=True, help="이보다 최근(초)에 수정된 파일은 건너뜀")
+@click.option("--backup-days", default=30, show_default=True, help="프로필 backup 파일 보관 일수")
+@click.option("--rate", default=200.0, show_default=True, help="초당 삭제/이동 파일 수 (0 이면 제한 없음)")
+@with_appcontext
+def gc_images_command(dry_run, quarantine, batch_size, min_age, backup_days, rate):
+    """DB 가 참조하지 않는 이미지 파일(변형본, blob, pending, backup 포함) 정리"""
+
+    def report(rel_path, size):
+        if dry_run:
+            click.echo(f"  {rel_path} ({size / 1024:.1f} KB)")
+
+    stats = collect_orphans(
+        batch_size=batch_size,
+        min_age=min_age,
+        backup_days=backup_days,
+        dry_run=dry_run,
+        quarantine=quarantine,
+        rate=rate,
+        on_orphan=report,
+    )
+    click.echo(
+        f"{'[dry-run] ' if dry_run else ''}파일 {stats['scanned']}개 확인 "
+        f"(최근 파일 {stats['recent']}개 제외), 고아 {stats['orphans']}개 "
+        f"({stats['bytes'] / 1024 / 1024:.1f} MB)"
+    )
+    if not dry_run:
+        target = f" → {stats['quarantine']}" if stats["quarantine"] else ""
+        click.echo(
+            f"정리 {stats['removed']}개{target}, 건너뜀 {stats['skipped']}개, "
+            f"참조가 끝난 blob {stats['purged_blobs']}개 삭제"
+        )
@@ -0,0 +1,177 @@
+# utils/image_jobs.py
+"""
+ 비동기 이미지 처리 (202 Accepted 업로드)
+- 요청 스레드: 원본 바이트만 static/{category}_images/pending/ 에 저장하고 Image(status="pending") 행 생성
+- 작업 스레드 풀 (IMAGE_JOB_WORKERS, 기본 2): compress_image → blob 저장 → 변형본 생성 → status="ready" (실패 시 "failed")
+- 처리 전에 UPDATE ... WHERE status='pending' 으로 "processing" 으로 바꿔 가져간 한 곳만 처리 (claim_image)
+- 프로세스가 중간에 죽어 pending / processing 으로 남은 이미지는 `flask post process-pending` 으로 다시 처리
+  (--min-age 보다 최근 이미지는 앱의 작업에 맡기고 건너뜀)
+"""
+import os
+import uuid
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from ..extensions import db
+from ..models.image import Image
+from .image_compressor import compress_image
+from .image_storage import write_file
+from .image_blobs import write_blob, acquire_blobs, discard_blob_sources
+from .image_variants import prepare_variants
+
+STATUS_PENDING = "pending"
+STATUS_PROCESSING = "processing"
+STATUS_READY = "ready"
+STATUS_FAILED = "failed"
+
+# 아직 처리가 끝나지 않은 상태
+IN_PROGRESS_STATUSES = (STATUS_PENDING, STATUS_PROCESSING)
+
+
+def init_image_jobs(app):
+    """이미지 작업 스레드 풀 등록"""
+    app.extensions["image_jobs"] = ThreadPoolExecutor(
+        max_workers=app.config.get("IMAGE_JOB_WORKERS", 2),
+        thread_name_prefix="image-job",
+    )
+
+
+def store_originals(files, category="post"):
+    """
+     업로드 원본을 그대로 pending 폴더에 저장 (압축 없음)
+    - 반환: [{"uuid", "ext", "path", "original_name"}, ...]
+    """
+    folder = f"static/{category}_images/pending"
+
+    stored = []
+    for file in files:
+        image_uuid = str(uuid.uuid4())
+        ext = file.filename.rsplit(".", 1)[-1].lower()
+        rel_path = f"{folder}/{image_uuid}.{ext}"
+        write_file(file.stream, os.path.join(current_app.root_path, rel_path))
+        stored.append(
+            {
+                "uuid": image_uuid,
+                "ext": ext,
+                "path": rel_path,
+                "original_name": file.filename,
+            }
+        )
+    return stored
+
+
+def enqueue_image_jobs(items, image_type="post", category="post"):
+    """store_originals 결과를 작업 풀에 등록 (Image 행 커밋 후 호출)"""
+    app = current_app._get_current_object()
+    executor = app.extensions["image_jobs"]
+    for item in items:
+        executor.submit(_run_job, app, item["uuid"], item["path"], image_type, category)
+
+
+def claim_image(image_id, stale_before=None):
+    """
+     pending 이미지를 processing 으로 바꿔 처리 권한을 가져옴 (동시에 시도해도 한 곳만 성공)
+    - stale_before: 이 시각 전부터 processing 인 행 (처리하던 프로세스가 죽음) 도 다시 가져옴
+    - 반환: 가져왔으면 True
+    """
+    claimable = Image.status == STATUS_PENDING
+    if stale_before is not None:
+        claimable = db.or_(
+            claimable, db.and_(Image.status == STATUS_PROCESSING, Image.updated_at < stale_before)
+        )
+    claimed = Image.query.filter(Image.image_id == image_id, claimable).update(
+        {Image.status: STATUS_PROCESSING, Image.updated_at: datetime.now()}, synchronize_session=False
+    )
+    db.session.commit()
+    return claimed == 1
+
+
+def process_pending_image(image, image_type="post", category="post"):
+    """
+     claim_image 로 가져온 이미지 하나를 압축해 최종 경로로 옮기고 ready 로 변경
+    - 원본 경로는 image.directory, 성공하면 원본 파일 삭제
+    """
+    original_path = os.path.join(current_app.root_path, image.directory)
+    blob = None
+    try:
+        with open(original_path, "rb") as f:
+            output, ext, _ = compress_image(f, image_type=image_type)
+        blob = write_blob(output, ext)
+        if blob["created"]:
+            prepare_variants(blob["path"], category)
+        image.blob_id = acquire_blobs([blob])[blob["sha256"]]
+        image.directory = blob["path"]
+        image.ext = ext
+        image.status = STATUS_READY
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        if blob is not None:
+            discard_blob_sources([blob])
+        # 이 작업이 가져간 상태일 때만 failed 로 (다른 곳에서 이미 끝냈으면 건드리지 않음)
+        Image.query.filter(Image.image_id == image.image_id, Image.status == STATUS_PROCESSING).update(
+            {Image.status: STATUS_FAILED}, synchronize_session=False
+        )
+        db.session.commit()
+        current_app.logger.warning(f"[!] 이미지 처리 실패 ({image.uuid}): {e}")
+        return False
+
+    try:
+        os.remove(original_path)
+    except OSError:
+        pass
+    return True
+
+
+def _run_job(app, image_uuid, original_rel_path, image_type, category):
+    with app.app_context():
+        try:
+            image = Image.query.filter_by(uuid=image_uuid).first()
+            if image is None:
+                # 처리 전에 게시글/이미지가 삭제됨 → 원본만 정리
+                original_path = os.path.join(app.root_path, original_rel_path)
+                if os.path.exists(original_path):
+                    os.remove(original_path)
+                return
+            if claim_image(image.image_id):
+                db.session.refresh(image)
+                process_pending_image(image, image_type, category)
+        except Exception as e:
+            app.logger.warning(f"[!] 이미지 작업 오류 ({image_uuid}): {e}")
+        finally:
+            db.session.remove()
+
+
+def image_status_summary(images):
+    """이미지 목록 → {"pending": n, "processing": n, "ready": n, "failed": n}"""
+    summary = {STATUS_PENDING: 0, STATUS_PROCESSING: 0, STATUS_READY: 0, STATUS_FAILED: 0}
+    for image in images:
+        summary[image.status] = summary.get(image.status, 0) + 1
+    return summary
+
+
+@click.command("process-pending")
+@click.option("--min-age", default=600, show_default=True, help="이보다 최근(초)에 올라온 / 처리를 시작한 이미지는 건너뜀")
+@with_appcontext
+def process_pending_command(min_age):
+    """pending (또는 처리 중 멈춘) 상태로 남은 게시글 이미지를 지금 처리"""
+    cutoff = datetime.now() - timedelta(seconds=min_age)
+    image_ids = db.session.execute(
+        db.select(Image.image_id).where(
+            db.or_(
+                db.and_(Image.status == STATUS_PENDING, Image.created_at < cutoff),
+                db.and_(Image.status == STATUS_PROCESSING, Image.updated_at < cutoff),
+            )
+        )
+    ).scalars().all()
+    claimed = done = 0
+    for image_id in image_ids:
+        # 목록을 읽은 뒤 앱의 작업이 먼저 가져갔으면 건너뜀
+        if not claim_image(image_id, stale_before=cutoff):
+            continue
+        claimed += 1
+        if process_pending_image(db.session.get(Image, image_id)):
+            done += 1
+    click.echo(f"{len(image_ids)}개 중 {claimed}개를 가져와 {done}개 이미지를 처리했습니다.")
@@ -8,7 +8,7 @@ IMAGE_RULES = {
         "max_bytes": 500 * 1024  # 500KB
     },
     "post": {
-        "max_size": None,  # 크기 제한 없음
+        "max_size": (2560, 2560),  # full 변형본 기준
         "max_bytes": 10 * 1024 * 1024  # 10MB
     },
     "reply": {
@@ -23,4 +23,28 @@ IMAGE_RULES = {
         "max_size": (1024, 1024),
         "max_bytes": 2 * 1024 * 1024  # 2MB
     },
-}
\ No newline at end of file
+}
+
+# 게시글 이미지 크기별 변형본 (?size=thumb|feed|full, full 은 위 post 규칙으로 저장한 파일)
+IMAGE_VARIANTS = {
+    "thumb": {
+        "max_size": (320, 320),
+        "quality": 75
+    },
+    "feed": {
+        "max_size": (1080, 1080),
+        "quality": 80
+    },
+}
+
+# Accept 헤더로 골라 주는 최신 포맷 (위에서부터 선호, full 포함 모든 크기)
+IMAGE_FORMATS = {
+    "avif": {
+        "mimetype": "image/avif",
+        "options": {"quality": 60, "speed": 8}
+    },
+    "webp": {
+        "mimetype": "image/webp",
+        "options": {"quality": 80, "method": 4}
+    },
+}
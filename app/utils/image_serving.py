@@ -0,0 +1,125 @@
+# utils/image_serving.py
+"""
+ 이미지 응답 캐시 (HTTP 캐시 헤더 + 프로세스 내 경로 캐시)
+- ETag: "{uuid}-{size}-{ext}" (uuid 의 내용은 바뀌지 않으므로 강한 ETag)
+- If-None-Match 가 같은 uuid/size 의 ETag 면 DB/파일을 보지 않고 304
+- 최종 포맷 응답: Cache-Control: public, max-age=1년, immutable
+- 더 나은 포맷(avif 등)을 만드는 중이라 임시로 보내는 응답: ETag 없이 짧은 max-age
+  (immutable 로 캐시되면 새 포맷으로 바뀌지 않으므로)
+- uuid → 저장 경로 LRU (IMAGE_PATH_CACHE_SIZE, 기본 10000) 로 반복 조회 시 DB 생략
+  이미지 삭제 시 discard 로 무효화, 파일이 없어진 항목은 조회 시 버림
+  (uuid → 경로만 캐시, 사용자 → 프로필 이미지는 다른 워커에서 바뀔 수 있으므로 매번 DB 조회)
+- Range 요청은 send_from_directory(conditional) 가 처리
+"""
+import os
+import threading
+from collections import OrderedDict
+from flask import current_app, request, send_from_directory
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+FALLBACK_MAX_AGE = 60
+
+
+class ImagePathCache:
+    """키(uuid 등) → 값 LRU"""
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def discard(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._items.pop(key, None)
+
+    def __len__(self):
+        return len(self._items)
+
+
+def init_image_serving(app):
+    app.extensions["image_paths"] = ImagePathCache(app.config.get("IMAGE_PATH_CACHE_SIZE", 10000))
+
+
+def get_image_path_cache():
+    return current_app.extensions["image_paths"]
+
+
+def cached_image_path(uuid):
+    """
+     경로 캐시 조회
+    - 파일이 없어졌으면 (다른 프로세스의 삭제, migrate-blobs 로 이동 등) 캐시에서 버리고 None
+    """
+    cache = get_image_path_cache()
+    path = cache.get(uuid)
+    if path is not None and not os.path.exists(os.path.join(current_app.root_path, path)):
+        cache.discard(uuid)
+        return None
+    return path
+
+
+def forget_image(image):
+    """이미지 삭제/교체 시 경로 캐시에서 제거"""
+    cache = current_app.extensions.get("image_paths")
+    if cache is not None and image is not None:
+        cache.discard(image.uuid)
+
+
+def image_etag(uuid, size, path):
+    return f"{uuid}-{size}-{path.rsplit('.', 1)[-1].lower()}"
+
+
+def not_modified(uuid, size, max_age=IMMUTABLE_MAX_AGE, immutable=True):
+    """
+     If-None-Match 에 이 uuid/size 의 ETag 가 있으면 304 응답, 없으면 None
+    - 포맷(ext)은 클라이언트가 가진 것을 그대로 인정 (같은 uuid 의 내용은 바뀌지 않음)
+    """
+    prefix = f"{uuid}-{size}-"
+    for etag in request.if_none_match.as_set(include_weak=True):
+        if etag.startswith(prefix):
+            response = current_app.response_class(status=304)
+            response.set_etag(etag)
+            _set_cache_headers(response, max_age, immutable)
+            return response
+    return None
+
+
+def _set_cache_headers(response, max_age, immutable):
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    if max_age == 0:
+        response.cache_control.no_cache = True
+    if immutable:
+        response.cache_control.immutable = True
+    response.vary.add("Accept")
+
+
+def send_image(path, etag, settled=True, max_age=IMMUTABLE_MAX_AGE, immutable=True):
+    """
+     이미지 파일 응답 (Range / If-None-Match 는 send_from_directory 가 처리)
+    - etag: 문자열이면 그대로, True 면 파일 mtime/크기로 생성
+    - settled=False: 더 나은 포맷을 만드는 중인 임시 응답 → ETag 없이 FALLBACK_MAX_AGE
+    """
+    directory, filename = path.rsplit("/", 1)
+    if not settled:
+        response = send_from_directory(directory, filename, etag=False, max_age=FALLBACK_MAX_AGE)
+        response.vary.add("Accept")
+        return response
+
+    response = send_from_directory(directory, filename, etag=etag, max_age=max_age)
+    _set_cache_headers(response, max_age, immutable)
+    return response
@@ -9,24 +9,70 @@ from datetime import datetime
 # 전역 스레드 풀 (이미지 병렬 처리)
 executor = ThreadPoolExecutor(max_workers=4)
 
+# 파일 복사 단위
+COPY_CHUNK_SIZE = 64 * 1024
+
+# 이미 만들어 둔 폴더 (저장할 때마다 exists/makedirs 를 하지 않도록)
+_known_dirs = set()
+
+
+def ensure_dir(abs_dir):
+    """폴더가 없으면 생성, 한 번 확인한 폴더는 다시 확인하지 않음"""
+    if abs_dir in _known_dirs:
+        return
+    os.makedirs(abs_dir, exist_ok=True)
+    _known_dirs.add(abs_dir)
+
+
+def write_temp(stream, abs_dir, digest=None):
+    """
+     stream 을 abs_dir 안의 임시 파일로 COPY_CHUNK_SIZE 씩 복사 (전체를 메모리에 올리지 않음)
+    - digest: hashlib 객체를 넘기면 복사하면서 갱신
+    - 반환: (임시 파일 절대경로, 바이트 수) → 호출하는 쪽에서 os.replace 로 옮긴다
+    """
+    ensure_dir(abs_dir)
+    tmp_path = os.path.join(abs_dir, f"{uuid.uuid4().hex}.tmp")
+    try:
+        f = open(tmp_path, "wb")
+    except FileNotFoundError:
+        # 확인해 둔 폴더가 그 사이 지워졌으면 다시 만든다
+        _known_dirs.discard(abs_dir)
+        ensure_dir(abs_dir)
+        f = open(tmp_path, "wb")
+
+    size = 0
+    try:
+        with f:
+            for chunk in iter(lambda: stream.read(COPY_CHUNK_SIZE), b""):
+                f.write(chunk)
+                size += len(chunk)
+                if digest is not None:
+                    digest.update(chunk)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return tmp_path, size
+
+
+def write_file(stream, abs_path):
+    """stream 을 임시 파일에 쓴 뒤 abs_path 로 교체 (읽는 쪽이 반쯤 쓰인 파일을 보지 않음)"""
+    tmp_path, size = write_temp(stream, os.path.dirname(abs_path))
+    os.replace(tmp_path, abs_path)
+    return size
+
 
 def save_to_disk(output_stream, ext, filename, category="post"):
     """
      카테고리/날짜별로 이미지 저장
     - category: post / reply / profile
     - 날짜별 폴더 생성 (ex: static/post_images/2025-10-30/)
-    - 반환: (절대경로, 상대경로)
+    - 청크 단위로 임시 파일에 쓴 뒤 교체
+    - 반환: 상대경로
     """
-    category_folder = f"static/{category}_images"
-    if not os.path.exists(os.path.join(current_app.root_path, category_folder)):
-        os.makedirs(os.path.join(current_app.root_path, category_folder), exist_ok=True)
-
-    # 1️⃣ 날짜 폴더 생성
+    # 1️⃣ 날짜 폴더
     date_folder = datetime.now().strftime("%Y-%m-%d")
     base_folder = f"static/{category}_images/{date_folder}"
     abs_folder = os.path.join(current_app.root_path, base_folder)
-    if not os.path.exists(abs_folder):
-        os.makedirs(abs_folder, exist_ok=True)
 
     # 2️⃣ 파일명 UUID
     # filename = f"{uuid.uuid4()}.{ext.lower()}"
@@ -34,8 +80,7 @@ def save_to_disk(output_stream, ext, filename, category="post"):
     rel_path = f"{base_folder}/{filename}"
 
     # 3️⃣ 실제 파일 저장
-    with open(abs_path, "wb") as f:
-        f.write(output_stream.read())
+    write_file(output_stream, abs_path)
 
     current_app.logger.info(f"[✓] 이미지 저장 완료 → {rel_path}")
     return rel_path
@@ -72,3 +117,85 @@ def delete_image(image, category="post"):
     except Exception as e:
         current_app.logger.warning(f"[!] 이미지 삭제 실패: {e}")
         return False
+
+
+def _compress_and_save(app, file, image_uuid, image_type, category):
+    """
+    (작업 스레드) 압축 → blob 저장 → 변형본 생성, DB 는 건드리지 않음
+    - file: 요청의 FileStorage (스풀 임시 파일이라 통째로 메모리에 올리지 않고 PIL 이 직접 읽음)
+    - 같은 내용의 blob 이 이미 있으면 파일/변형본을 다시 쓰지 않음
+    """
+    from .image_compressor import compress_image
+    from .image_variants import prepare_variants
+    from .image_blobs import write_blob
+
+    original_name = file.filename
+    with app.app_context():
+        output, ext, _ = compress_image(file, image_type=image_type)
+        blob = write_blob(output, ext)
+        if blob["created"]:
+            prepare_variants(blob["path"], category)
+        return {
+            "uuid": image_uuid,
+            "original_name": original_name,
+            **blob,
+        }
+
+
+def process_uploads(files, image_type="post", category="post"):
+    """
+     요청의 업로드 이미지들을 스레드 풀에서 동시에 압축/저장
+    - DB 트랜잭션 밖에서 호출 (압축하는 동안 커넥션을 잡지 않도록)
+    - 반환: 업로드 순서대로 [{"uuid", "ext", "path", "original_name", "sha256", "size_bytes", "created"}, ...]
+      → 호출하는 쪽에서 acquire_blobs 후 Image(uuid=..., blob_id=...) 행을 한 번에 추가
+    - 하나라도 실패하면 이미 저장된 파일을 지우고 첫 예외를 다시 발생
+    """
+    if not files:
+        return []
+
+    app = current_app._get_current_object()
+    futures = [
+        executor.submit(
+            _compress_and_save,
+            app,
+            file,  # 요청이 끝나기 전에 모든 작업을 기다리므로 스레드에서 읽어도 됨
+            str(uuid.uuid4()),
+            image_type,
+            category,
+        )
+        for file in files
+    ]
+
+    results, error = [], None
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            error = error or e
+    if error is not None:
+        from .image_blobs import discard_blob_sources
+
+        discard_blob_sources(results)
+        remove_saved_files([r["path"] for r in results])
+        raise error
+    return results
+
+
+def remove_saved_files(rel_paths):
+    """
+    process_uploads 로 저장한 파일 정리 (DB 저장 실패 시, 변형본 포함)
+    - 다른 이미지가 참조 중인 blob 은 남긴다
+    """
+    from .image_variants import remove_variants
+    from .image_blobs import is_unreferenced_blob, BLOB_FOLDER
+
+    for rel_path in rel_paths:
+        if rel_path.startswith(f"{BLOB_FOLDER}/") and not is_unreferenced_blob(rel_path):
+            continue
+        remove_variants(rel_path)
+        abs_path = os.path.join(current_app.root_path, rel_path)
+        try:
+            if os.path.exists(abs_path):
+                os.remove(abs_path)
+        except OSError as e:
+            current_app.logger.warning(f"[!] 업로드 파일 정리 실패: {abs_path} ({e})")
@@ -1,41 +1,53 @@
 import os
 import uuid
 import shutil
-import requests
+import threading
 from io import BytesIO
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 from flask import current_app
 from ..extensions import db
+from ..models.image import Image
+from ..models.user import User
 from .image_storage import save_to_disk  # 기존 저장 함수 사용
+from .image_compressor import compress_image
+from .image_variants import remove_variants
+from .image_serving import forget_image
+from .image_blobs import release_blob
+from .http_client import create_session
 
 DEFAULT_PROFILE_PATH = "static/default_profile.jpg"
 
+_http_session = None
+_http_session_lock = threading.Lock()
+
 IMAGE_EXTENSIONS = {"png", "jpg", "jpeg", "gif", "jfif", "pjpeg", "pjp", "webp", "avif", "apng", "svg", }
 
 def upload_profile(user, file=None, url=None):
-    """프로필 이미지 업로드 및 DB 반영"""
+    """
+    프로필 이미지 업로드 및 DB 반영
+    - file: 압축 후 바로 저장 (이전 이미지는 backup 폴더로)
+    - url (소셜 로그인): 기본 이미지로 먼저 저장하고 다운로드/압축/저장은 백그라운드 작업
+      (로그인 응답이 외부 이미지 서버를 기다리지 않음, 끝나면 profile_img 교체)
+    """
     folder = "static/profile_images"
     backup_folder = os.path.join(folder, "backup")
 
-    if not file and not url:
+    if url and not file:
         if not user.profile_img:
             user.profile_img = DEFAULT_PROFILE_PATH
             db.session.add(user)
             db.session.commit()
+        schedule_profile_fetch(user.user_id, url)
         return user.profile_img
 
-    if url and not file:
-        try:
-            resp = requests.get(url, timeout=5)
-            if resp.status_code != 200:
-                raise ValueError("이미지 다운로드 실패")
-            file = BytesIO(resp.content)
-            file.filename = f"{uuid.uuid4()}.jpg"
-        except Exception as e:
-            current_app.logger.warning(f"소셜 이미지 다운로드 실패: {e}")
+    if not file:
+        if not user.profile_img:
             user.profile_img = DEFAULT_PROFILE_PATH
+            db.session.add(user)
             db.session.commit()
-            return user.profile_img
+        return user.profile_img
 
     if user.profile_img and user.profile_img != DEFAULT_PROFILE_PATH:
         try:
@@ -54,9 +66,8 @@ def upload_profile(user, file=None, url=None):
             current_app.logger.warning(f"이전 프로필 백업 실패: {e}")
 
     try:
-        relative_path = save_to_disk(
-            file, fmt=file.filename.rsplit(".", 1)[-1], category="profile"
-        )
+        output, ext, _ = compress_image(file, image_type="profile")
+        relative_path = save_to_disk(output, ext, f"{uuid.uuid4()}.{ext}", category="profile")
         current_app.logger.info(f"새 프로필 이미지 저장 완료: {relative_path}")
     except Exception as e:
         current_app.logger.warning(f"프로필 이미지 저장 실패: {e}")
@@ -68,11 +79,118 @@ def upload_profile(user, file=None, url=None):
     return relative_path
 
 
+def _get_http_session():
+    """소셜 프로필 이미지 다운로드용 공유 세션 (작업 스레드 수만큼 커넥션 풀)"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            _http_session = create_session(
+                pool_maxsize=current_app.config.get("IMAGE_JOB_WORKERS", 2)
+            )
+        return _http_session
+
+
+def download_image(url):
+    """
+     URL 이미지를 메모리로 다운로드 (PROFILE_FETCH_MAX_BYTES, 기본 5MB 까지)
+    - 타임아웃: PROFILE_FETCH_TIMEOUT (연결, 읽기) 초
+    """
+    max_bytes = current_app.config.get("PROFILE_FETCH_MAX_BYTES", 5 * 1024 * 1024)
+    timeout = current_app.config.get("PROFILE_FETCH_TIMEOUT", (3, 5))
+    with _get_http_session().get(url, timeout=timeout, stream=True) as resp:
+        if resp.status_code != 200:
+            raise ValueError(f"이미지 다운로드 실패 (HTTP {resp.status_code})")
+        if int(resp.headers.get("Content-Length") or 0) > max_bytes:
+            raise ValueError("이미지가 너무 큽니다")
+        data = BytesIO()
+        for chunk in resp.iter_content(64 * 1024):
+            data.write(chunk)
+            if data.tell() > max_bytes:
+                raise ValueError("이미지가 너무 큽니다")
+    data.seek(0)
+    return data
+
+
+def init_profile_fetches(app):
+    """
+     소셜 프로필 이미지 다운로드 스레드 풀 등록 (PROFILE_FETCH_WORKERS, 기본 2)
+    - 느린 외부 서버가 게시글 이미지 작업 풀(image_jobs)을 붙잡지 않도록 분리
+    """
+    app.extensions["profile_fetches"] = ThreadPoolExecutor(
+        max_workers=app.config.get("PROFILE_FETCH_WORKERS", 2),
+        thread_name_prefix="profile-fetch",
+    )
+
+
+def schedule_profile_fetch(user_id, url):
+    """소셜 프로필 이미지를 다운로드 풀에서 가져오도록 예약"""
+    app = current_app._get_current_object()
+    app.extensions["profile_fetches"].submit(_fetch_profile_image, app, user_id, url)
+
+
+def _fetch_profile_image(app, user_id, url):
+    """
+    (작업 스레드) 다운로드 → 압축 → 저장 → Image 행 추가 + profile_img 교체
+    - 그 사이 사용자가 직접 프로필을 바꿨으면 (기본 이미지가 아니면) 덮어쓰지 않고 파일 삭제
+    """
+    with app.app_context():
+        try:
+            output, ext, _ = compress_image(download_image(url), image_type="profile")
+            image_uuid = str(uuid.uuid4())
+            relative_path = save_to_disk(output, ext, f"{image_uuid}.{ext}", category="profile")
+        except Exception as e:
+            app.logger.warning(f"소셜 이미지 다운로드 실패 (user_id={user_id}): {e}")
+            return
+
+        try:
+            updated = User.query.filter(
+                User.user_id == user_id,
+                db.or_(User.profile_img.is_(None), User.profile_img.in_(["", DEFAULT_PROFILE_PATH])),
+            ).update({User.profile_img: relative_path}, synchronize_session=False)
+            if updated:
+                db.session.add(
+                    Image(
+                        uuid=image_uuid,
+                        user_id=user_id,
+                        directory=relative_path,
+                        original_image_name=os.path.basename(urlparse(url).path) or f"{image_uuid}.{ext}",
+                        ext=ext,
+                        post_id=None,
+                    )
+                )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            updated = 0
+            app.logger.warning(f"소셜 이미지 저장 실패 (user_id={user_id}): {e}")
+        finally:
+            db.session.remove()
+
+        if updated:
+            app.logger.info(f"소셜 프로필 이미지 저장 완료: {relative_path}")
+        else:
+            try:
+                os.remove(os.path.join(app.root_path, relative_path))
+            except OSError:
+                pass
+
+
 def delete_image(image_obj):
-    """DB 객체와 실제 파일을 같이 삭제 (날짜별 폴더 지원)"""
+    """
+    DB 객체와 실제 파일을 같이 삭제 (날짜별 폴더 지원, 크기별 변형본 포함)
+    - blob 을 참조하는 이미지는 참조만 해제 → 마지막 참조면 blob_id 를 반환
+      (호출하는 쪽에서 커밋 후 purge_blobs 로 파일 삭제, 롤백되면 파일 유지)
+    """
     if not image_obj or not getattr(image_obj, "directory", None):
         print("[WARN] image_obj 또는 directory 없음")
-        return
+        return None
+
+    if getattr(image_obj, "blob_id", None) is not None:
+        forget_image(image_obj)
+        released = release_blob(image_obj.blob_id)
+        if released is None:
+            print(f"[공유 파일 유지] {image_obj.directory}")
+        return released
 
     rel_path = image_obj.directory
     if os.path.isabs(rel_path):
@@ -81,6 +199,8 @@ def delete_image(image_obj):
         abs_path = os.path.join(current_app.root_path, rel_path.lstrip("/\\"))
 
     print(f"[삭제 시도] {abs_path}")
+    remove_variants(rel_path)
+    forget_image(image_obj)
 
     if os.path.exists(abs_path):
         try:
@@ -0,0 +1,215 @@
+# utils/image_variants.py
+"""
+ 이미지 크기별 / 포맷별 변형본
+- 크기: full(업로드 시 저장한 파일) / thumb / feed → {uuid}_{size}.{ext}
+- 포맷: 원본 포맷 외에 webp / avif → {uuid}_{size}.{webp|avif} (full 도 {uuid}_full.webp)
+- 업로드/비동기 처리 때 원본 포맷 + IMAGE_PRECOMPUTE_FORMATS(기본 webp) 를 미리 만든다
+- 그 외(변형본 도입 전 업로드, avif 등)는 처음 요청될 때 만든다
+  · 원본 포맷 크기 변형본: 그 요청에서 바로 생성
+  · webp/avif: 백그라운드에서 생성하고 그 요청에는 원본 포맷을 응답 (avif 인코딩은 수 초 걸림)
+    업로드 압축과 스레드를 나눠 쓰지 않도록 전용 풀 (IMAGE_TRANSCODE_WORKERS, 기본 1) 에서 만들고,
+    대기 중인 작업이 IMAGE_TRANSCODE_MAX_PENDING (기본 100) 개면 더 예약하지 않음
+"""
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image as PILImage, features
+from flask import current_app
+from .image_rules import IMAGE_VARIANTS, IMAGE_FORMATS
+
+SIZE_FULL = "full"
+IMAGE_SIZES = (*IMAGE_VARIANTS, SIZE_FULL)
+
+# 업로드 시 변형본을 미리 만드는 이미지 카테고리
+VARIANT_CATEGORIES = {"post"}
+
+# webp/avif 로 바꿔 줄 원본 포맷 (gif 는 애니메이션이 있어 제외)
+TRANSCODE_SOURCE_EXTS = {"jpeg", "jpg", "png"}
+
+# 설치된 Pillow 가 인코딩할 수 있는 포맷만 (선호 순서 유지)
+AVAILABLE_FORMATS = [fmt for fmt in IMAGE_FORMATS if features.check(fmt)]
+
+# 같은 변형본을 여러 요청이 동시에 만들지 않도록 경로 해시별 잠금
+_locks = [threading.Lock() for _ in range(32)]
+
+# 백그라운드 생성 대기 중인 변형본 경로
+_scheduled = set()
+_scheduled_lock = threading.Lock()
+
+
+def variant_path(rel_path, size, fmt=None):
+    """
+     원본 상대경로 → 변형본 상대경로
+    - fmt 가 없으면 원본 포맷 (full 이면 원본 그대로)
+    """
+    stem, ext = os.path.splitext(rel_path)
+    if fmt is None:
+        return rel_path if size == SIZE_FULL else f"{stem}_{size}{ext}"
+    return f"{stem}_{size}.{fmt}"
+
+
+def all_variant_paths(rel_path):
+    """rel_path 로 만들어질 수 있는 모든 변형본 경로 (원본 제외)"""
+    paths = [variant_path(rel_path, size) for size in IMAGE_VARIANTS]
+    paths += [variant_path(rel_path, size, fmt) for size in IMAGE_SIZES for fmt in IMAGE_FORMATS]
+    return paths
+
+
+def _lock_for(rel_path):
+    return _locks[hash(rel_path) % len(_locks)]
+
+
+def _abs(rel_path):
+    return os.path.join(current_app.root_path, rel_path)
+
+
+def _write_variant(image, source_fmt, rel_path, size, fmt=None):
+    variant = image.copy()
+    if size != SIZE_FULL:
+        variant.thumbnail(IMAGE_VARIANTS[size]["max_size"], PILImage.Resampling.LANCZOS)
+
+    if fmt is None:
+        options = {"format": source_fmt, "optimize": True, "quality": IMAGE_VARIANTS[size]["quality"]}
+    else:
+        options = {"format": fmt.upper(), **IMAGE_FORMATS[fmt]["options"]}
+        if variant.mode not in ("RGB", "RGBA"):
+            has_alpha = "A" in variant.mode or "transparency" in variant.info
+            variant = variant.convert("RGBA" if has_alpha else "RGB")
+
+    abs_path = _abs(variant_path(rel_path, size, fmt))
+    tmp_path = f"{abs_path}.{uuid.uuid4().hex}.tmp"
+    # 임시 파일에 쓴 뒤 교체 → 읽는 쪽이 반쯤 쓰인 파일을 보지 않음
+    variant.save(tmp_path, **options)
+    os.replace(tmp_path, abs_path)
+
+
+def generate_variants(rel_path, sizes=None, formats=(None,)):
+    """
+     저장된 이미지(rel_path)로 변형본 생성 (이미 있으면 덮어씀)
+    - formats: None 은 원본 포맷, 그 외 webp / avif
+    - 원본이 변형 크기보다 작아도 파일은 만든다 (다음 요청에서 다시 열어보지 않도록)
+    """
+    sizes = sizes or IMAGE_SIZES
+    with PILImage.open(_abs(rel_path)) as image:
+        source_fmt = image.format
+        image.load()
+        for fmt in formats:
+            for size in sizes:
+                if size == SIZE_FULL and fmt is None:
+                    continue  # 원본 그 자체
+                _write_variant(image, source_fmt, rel_path, size, fmt)
+
+
+def can_transcode(rel_path):
+    return os.path.splitext(rel_path)[1].lstrip(".").lower() in TRANSCODE_SOURCE_EXTS
+
+
+def prepare_variants(rel_path, category="post"):
+    """
+     업로드 처리 직후 변형본 미리 생성 (VARIANT_CATEGORIES 만)
+    - 원본 포맷 thumb/feed + IMAGE_PRECOMPUTE_FORMATS 포맷의 모든 크기
+    - 실패해도 업로드는 성공으로 두고 경고만 남김 (요청 시 다시 만든다)
+    """
+    if category not in VARIANT_CATEGORIES:
+        return
+    formats = [None]
+    if can_transcode(rel_path):
+        precompute = current_app.config.get("IMAGE_PRECOMPUTE_FORMATS", ("webp",))
+        formats += [fmt for fmt in AVAILABLE_FORMATS if fmt in precompute]
+    try:
+        generate_variants(rel_path, formats=formats)
+    except Exception as e:
+        current_app.logger.warning(f"[!] 이미지 변형본 생성 실패: {rel_path} ({e})")
+
+
+def ensure_variant(rel_path, size):
+    """
+     원본 포맷 size 변형본의 상대경로 반환, 없으면 지금 만든다
+    - full 이거나, 원본 파일이 없거나, 만들 수 없으면 rel_path 그대로
+    """
+    target = variant_path(rel_path, size)
+    if size == SIZE_FULL or os.path.exists(_abs(target)):
+        return target
+    if not os.path.exists(_abs(rel_path)):
+        return rel_path
+
+    with _lock_for(target):
+        if not os.path.exists(_abs(target)):
+            try:
+                generate_variants(rel_path, [size])
+            except Exception as e:
+                # 만들 수 없으면 원본이라도 보여준다
+                current_app.logger.warning(f"[!] 이미지 변형본 생성 실패: {rel_path} ({e})")
+                return rel_path
+            current_app.logger.info(f"[✓] 이미지 변형본 생성 → {target}")
+    return target
+
+
+def accepted_formats(accept_mimetypes):
+    """
+     Accept 헤더에 명시된 webp/avif 를 선호 순서대로 반환
+    - */* 나 image/* 만으로는 지원한다고 보지 않음 (브라우저는 지원 포맷을 직접 적는다)
+    """
+    explicit = {value.lower() for value, quality in accept_mimetypes if quality > 0}
+    return [fmt for fmt in AVAILABLE_FORMATS if IMAGE_FORMATS[fmt]["mimetype"] in explicit]
+
+
+def _generate_in_background(app, rel_path, size, fmt, target):
+    with app.app_context():
+        try:
+            with _lock_for(target):
+                if not os.path.exists(_abs(target)):
+                    generate_variants(rel_path, [size], [fmt])
+                    app.logger.info(f"[✓] 이미지 변형본 생성 → {target}")
+        except Exception as e:
+            app.logger.warning(f"[!] 이미지 변형본 생성 실패: {target} ({e})")
+        finally:
+            with _scheduled_lock:
+                _scheduled.discard(target)
+
+
+def init_image_variants(app):
+    """요청 시 webp/avif 변형본을 만드는 스레드 풀 등록 (업로드용 풀과 분리)"""
+    app.extensions["image_transcodes"] = ThreadPoolExecutor(
+        max_workers=app.config.get("IMAGE_TRANSCODE_WORKERS", 1),
+        thread_name_prefix="image-transcode",
+    )
+
+
+def _schedule(rel_path, size, fmt, target):
+    app = current_app._get_current_object()
+    with _scheduled_lock:
+        if target in _scheduled or len(_scheduled) >= app.config.get("IMAGE_TRANSCODE_MAX_PENDING", 100):
+            return
+        _scheduled.add(target)
+    app.extensions["image_transcodes"].submit(_generate_in_background, app, rel_path, size, fmt, target)
+
+
+def negotiate_variant(rel_path, size, accept_mimetypes):
+    """
+     요청의 Accept 헤더에 맞는 변형본
+    - 클라이언트가 받는 webp/avif 중 이미 만들어진 가장 선호하는 포맷
+    - 아직 없는 포맷은 백그라운드에서 만들도록 예약하고, 이번 응답은 다음 후보 / 원본 포맷
+    - 반환: (상대경로, settled) — settled=False 면 더 선호하는 포맷을 만드는 중 (오래 캐시하지 말 것)
+    """
+    settled = True
+    if can_transcode(rel_path) and os.path.exists(_abs(rel_path)):
+        for fmt in accepted_formats(accept_mimetypes):
+            target = variant_path(rel_path, size, fmt)
+            if os.path.exists(_abs(target)):
+                return target, settled
+            _schedule(rel_path, size, fmt, target)
+            settled = False
+    return ensure_variant(rel_path, size), settled
+
+
+def remove_variants(rel_path):
+    """원본과 함께 변형본 파일 삭제 (없으면 무시)"""
+    for path in all_variant_paths(rel_path):
+        abs_path = _abs(path)
+        try:
+            if os.path.exists(abs_path):
+                os.remove(abs_path)
+        except OSError as e:
+            current_app.logger.warning(f"[!] 변형본 삭제 실패: {abs_path} ({e})")
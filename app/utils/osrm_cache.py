@@ -0,0 +1,249 @@
+# utils/osrm_cache.py
+"""
+ OSRM 응답 캐시 (같은 경로 반복 요청 시 OSRM 서버 생략)
+- 키: 서비스 + 프로필 + 좌표(OSRM_CACHE_PRECISION 자리 반올림, 기본 5 ≈ 1m) + 정렬한 쿼리 파라미터
+  좌표를 해석할 수 없으면 (polyline(...), tile(...) 등) 문자열 그대로
+- 메모리: LRU (OSRM_CACHE_SIZE, 기본 1000개, 0 이면 캐시 끔) + TTL (OSRM_CACHE_TTL, 기본 1시간)
+- 디스크(선택): OSRM_CACHE_DIR 를 지정하면 (상대경로는 instance 폴더 기준)
+  {dir}/{해시 앞 2자리}/{해시}.json 에도 저장 → 재시작 후에도 메모리에 없으면 디스크에서 읽어 올림
+  파일 수는 OSRM_CACHE_DISK_MAX_FILES (기본 10000개, 0 이면 제한 없음) 까지
+  → 그 10% 만큼 저장할 때마다 만료 파일을 지우고, 넘치면 오래된 파일부터 삭제 (그 사이에는 10% 까지 초과 가능)
+  만료 파일은 읽을 때 / 위 정리 때 / `flask osrm purge-cache` 로 삭제
+- code 가 "Ok" 인 응답만 저장
+- 통계: GET /osrm/cache/stats (관리자 전용, hits, disk_hits, misses, stores, evictions, expired, disk_purged, size, hit_rate)
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+DEFAULT_SIZE = 1000
+DEFAULT_TTL = 60 * 60
+DEFAULT_PRECISION = 5
+DEFAULT_DISK_MAX_FILES = 10000
+
+
+def quantize_coordinates(coordinates, precision=DEFAULT_PRECISION):
+    """
+     "lon,lat;lon,lat" → 각 값을 precision 자리로 반올림한 같은 형식 문자열
+    - 숫자 좌표가 아니면 그대로 반환
+    """
+    try:
+        points = [[float(value) for value in point.split(",")] for point in coordinates.split(";")]
+    except ValueError:
+        return coordinates
+    return ";".join(",".join(f"{round(value, precision):.{precision}f}" for value in point) for point in points)
+
+
+def normalize_params(args):
+    """쿼리 파라미터 (MultiDict) → 키/값 정렬한 튜플 (true/false 는 소문자)"""
+    items = []
+    for key, value in args.items(multi=True):
+        value = value.strip()
+        if value.lower() in ("true", "false"):
+            value = value.lower()
+        items.append((key, value))
+    return tuple(sorted(items))
+
+
+def make_key(service, profile, coordinates, params):
+    return json.dumps([service, profile, coordinates, params], separators=(",", ":"))
+
+
+class RouteCache:
+    """키 → OSRM 응답 LRU + TTL (선택: 디스크 계층)"""
+
+    def __init__(self, max_size=DEFAULT_SIZE, ttl=DEFAULT_TTL, disk_dir=None, disk_max_files=DEFAULT_DISK_MAX_FILES):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.disk_dir = disk_dir
+        self.disk_max_files = disk_max_files
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._purge_lock = threading.Lock()
+        self._disk_writes = 0
+        self._stats = {
+            "hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expired": 0, "disk_purged": 0,
+        }
+
+    @property
+    def enabled(self):
+        return self.max_size > 0
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                if item[0] > now:
+                    self._items.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return item[1]
+                # 디스크에도 같은 만료 시각으로 저장됐으므로 같이 삭제
+                del self._items[key]
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+        if item is not None:
+            if self.disk_dir:
+                _remove(self._disk_path(key))
+            return None
+
+        item = self._read_disk(key, now)
+        with self._lock:
+            if item is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["disk_hits"] += 1
+            self._put(key, item)
+        return item[1]
+
+    def set(self, key, value):
+        item = (time.time() + self.ttl, value)
+        with self._lock:
+            self._stats["stores"] += 1
+            self._put(key, item)
+        self._write_disk(key, item)
+
+    def _put(self, key, item):
+        self._items[key] = item
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _disk_path(self, key):
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.disk_dir, digest[:2], f"{digest}.json")
+
+    def _read_disk(self, key, now):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        if entry.get("key") != key:
+            return None  # 해시 충돌
+        if entry["expires_at"] <= now:
+            with self._lock:
+                self._stats["expired"] += 1
+            _remove(path)
+            return None
+        return entry["expires_at"], entry["value"]
+
+    def _write_disk(self, key, item):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "expires_at": item[0], "value": item[1]}, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            _remove(tmp_path)
+            current_app.logger.warning(f"[!] OSRM 캐시 디스크 저장 실패: {path} ({e})")
+            return
+
+        if not self.disk_max_files:
+            return
+        with self._lock:
+            self._disk_writes += 1
+            due = self._disk_writes % max(self.disk_max_files // 10, 1) == 0
+        # 다른 스레드가 정리 중이면 건너뜀
+        if due and self._purge_lock.acquire(blocking=False):
+            try:
+                self.purge_disk()
+            finally:
+                self._purge_lock.release()
+
+    def purge_disk(self):
+        """
+         디스크 계층 정리, 반환: 삭제한 파일 수
+        - 만료 판단은 파일 mtime + TTL 기준 (저장 시각 = mtime, 파일을 열지 않음)
+        - 남은 캐시 파일이 disk_max_files 를 넘으면 오래된 것부터 삭제
+        """
+        if not self.disk_dir or not os.path.isdir(self.disk_dir):
+            return 0
+        removed = 0
+        now = time.time()
+        entries = []
+        for directory, _, filenames in os.walk(self.disk_dir):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                try:
+                    mtime = os.path.getmtime(path)
+                except OSError:
+                    continue
+                if mtime + self.ttl <= now:
+                    # 쓰다 만 임시 파일도 TTL 이 지나면 삭제
+                    if _remove(path):
+                        removed += 1
+                elif filename.endswith(".json"):
+                    entries.append((mtime, path))
+
+        excess = len(entries) - self.disk_max_files if self.disk_max_files else 0
+        if excess > 0:
+            entries.sort()
+            for _, path in entries[:excess]:
+                if _remove(path):
+                    removed += 1
+
+        with self._lock:
+            self._stats["disk_purged"] += removed
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats, size=len(self._items), max_size=self.max_size, ttl=self.ttl)
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["hits"] + stats["disk_hits"]) / lookups, 4) if lookups else 0.0
+        stats["disk"] = bool(self.disk_dir)
+        return stats
+
+    def __len__(self):
+        return len(self._items)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
+
+
+def init_osrm_cache(app):
+    disk_dir = app.config.get("OSRM_CACHE_DIR")
+    if disk_dir:
+        disk_dir = os.path.join(app.instance_path, disk_dir)
+    app.extensions["osrm_cache"] = RouteCache(
+        max_size=app.config.get("OSRM_CACHE_SIZE", DEFAULT_SIZE),
+        ttl=app.config.get("OSRM_CACHE_TTL", DEFAULT_TTL),
+        disk_dir=disk_dir,
+        disk_max_files=app.config.get("OSRM_CACHE_DISK_MAX_FILES", DEFAULT_DISK_MAX_FILES),
+    )
+
+
+def get_osrm_cache():
+    return current_app.extensions["osrm_cache"]
+
+
+@click.command("purge-cache")
+@with_appcontext
+def purge_cache_command():
+    """만료된 / OSRM_CACHE_DISK_MAX_FILES 를 넘는 OSRM 캐시 파일(디스크 계층) 삭제"""
+    click.echo(f"OSRM 캐시 파일 {get_osrm_cache().purge_disk()}개를 삭제했습니다.")
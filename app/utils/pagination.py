@@ -0,0 +1,113 @@
+# utils/pagination.py
+"""
+ 커서(keyset) 페이지네이션 공용 함수
+- (created_at, id) 기준으로 OFFSET 없이 다음 페이지를 찾는다
+- cursor 는 클라이언트에게 불투명한 base64 문자열
+- count=exact|none|estimate 로 전체 개수 계산 방식 선택
+"""
+import base64
+import json
+from datetime import datetime
+from ..extensions import db
+
+COUNT_MODES = ("exact", "none", "estimate")
+MAX_PER_PAGE = 100
+
+
+def clamp_per_page(per_page):
+    """요청의 per_page 를 1 ~ MAX_PER_PAGE 로 제한 (0/음수면 LIMIT 가 깨지므로)"""
+    return max(1, min(per_page or 1, MAX_PER_PAGE))
+
+
+def encode_cursor(created_at, item_id):
+    """(created_at, id) → 불투명 커서 문자열"""
+    payload = json.dumps({"t": created_at.isoformat(), "id": item_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    커서 문자열 → (created_at, id)
+    - 빈 문자열이면 첫 페이지 (None)
+    - 형식이 잘못되면 ValueError
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["t"]), int(payload["id"])
+    except Exception:
+        raise ValueError("잘못된 cursor 값입니다.")
+
+
+def estimate_count(query):
+    """
+    EXPLAIN 의 예상 행 수로 전체 개수 추정 (MySQL 전용)
+    - 다른 DB 에서는 None
+    """
+    if db.engine.dialect.name != "mysql":
+        return None
+    compiled = query.order_by(None).statement.compile(dialect=db.engine.dialect)
+    row = (
+        db.session.connection()
+        .exec_driver_sql(f"EXPLAIN {compiled}", compiled.params)
+        .mappings()
+        .first()
+    )
+    return row.get("rows") if row else None
+
+
+def count_total(query, count="exact"):
+    """count 모드에 따른 전체 개수 (none 이면 None)"""
+    if count == "none":
+        return None
+    if count == "estimate":
+        return estimate_count(query)
+    return query.order_by(None).count()
+
+
+def keyset_paginate(query, created_col, id_col, cursor, per_page, descending=True, count="exact"):
+    """
+     (created_at, id) keyset 페이지네이션
+    - query: 필터만 적용된 쿼리 (정렬은 여기서 적용)
+    - per_page 는 1 ~ MAX_PER_PAGE 로 제한
+    - 반환: (items, next_cursor, total)
+    """
+    per_page = clamp_per_page(per_page)
+    total = count_total(query, count)
+
+    position = decode_cursor(cursor)
+    if position is not None:
+        created_at, item_id = position
+        if descending:
+            query = query.filter(
+                db.or_(
+                    created_col < created_at,
+                    db.and_(created_col == created_at, id_col < item_id),
+                )
+            )
+        else:
+            query = query.filter(
+                db.or_(
+                    created_col > created_at,
+                    db.and_(created_col == created_at, id_col > item_id),
+                )
+            )
+
+    if descending:
+        query = query.order_by(None).order_by(created_col.desc(), id_col.desc())
+    else:
+        query = query.order_by(None).order_by(created_col.asc(), id_col.asc())
+
+    # 한 개 더 가져와서 다음 페이지 존재 여부 확인
+    rows = query.limit(per_page + 1).all()
+    items = rows[:per_page]
+    next_cursor = None
+    if len(rows) > per_page:
+        last = items[-1]
+        next_cursor = encode_cursor(
+            getattr(last, created_col.key), getattr(last, id_col.key)
+        )
+
+    return items, next_cursor, total
@@ -0,0 +1,74 @@
+# utils/post_counters.py
+"""
+ 게시글 좋아요/댓글 수 (posts.like_count, posts.reply_count)
+- 좋아요/댓글 쓰기 경로에서 adjust_post_counts 로 원자적으로 증감
+  (UPDATE posts SET like_count = like_count + 1 ... 이므로 동시 요청에도 값이 유실되지 않음)
+- reconcile_post_counts 로 실제 post_likes / replies 개수와 어긋난 값을 복구
+"""
+import click
+from flask.cli import with_appcontext
+from ..extensions import db
+from ..models.post import Post
+from ..models.post_like import PostLike
+from ..models.reply import Reply
+
+
+def adjust_post_counts(post_id, likes=0, replies=0):
+    """
+    like_count / reply_count 증감 (커밋은 호출하는 쪽에서)
+    - 좋아요/댓글 INSERT·DELETE 와 같은 트랜잭션에서 호출해야 함께 롤백된다
+    """
+    values = {}
+    if likes:
+        values[Post.like_count] = Post.like_count + likes
+    if replies:
+        values[Post.reply_count] = Post.reply_count + replies
+    if not values:
+        return
+    Post.query.filter(Post.post_id == post_id).update(values, synchronize_session=False)
+
+
+def reconcile_post_counts(chunk_size=1000):
+    """
+    실제 개수와 다른 게시글만 post_id 구간별로 다시 계산
+    - 반환: 수정된 게시글 수
+    """
+    like_total = (
+        db.select(db.func.count())
+        .where(PostLike.post_id == Post.post_id)
+        .correlate(Post)
+        .scalar_subquery()
+    )
+    reply_total = (
+        db.select(db.func.count())
+        .where(Reply.post_id == Post.post_id)
+        .correlate(Post)
+        .scalar_subquery()
+    )
+
+    max_id = db.session.query(db.func.max(Post.post_id)).scalar() or 0
+    fixed = 0
+    for start in range(0, max_id + 1, chunk_size):
+        result = (
+            Post.query.filter(
+                Post.post_id >= start,
+                Post.post_id < start + chunk_size,
+                db.or_(Post.like_count != like_total, Post.reply_count != reply_total),
+            )
+            .update(
+                {Post.like_count: like_total, Post.reply_count: reply_total},
+                synchronize_session=False,
+            )
+        )
+        db.session.commit()
+        fixed += result
+    return fixed
+
+
+@click.command("reconcile-counts")
+@click.option("--chunk-size", default=1000, show_default=True, help="한 번에 검사할 post_id 구간 크기")
+@with_appcontext
+def reconcile_counts_command(chunk_size):
+    """posts.like_count / reply_count 를 실제 개수로 복구"""
+    fixed = reconcile_post_counts(chunk_size)
+    click.echo(f"{fixed}개 게시글의 좋아요/댓글 수를 복구했습니다.")
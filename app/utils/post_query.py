@@ -1,8 +1,9 @@
 from ..models.post import Post
 from ..models.user import User
-from ..models.reply import Reply
-from ..models.post_like import PostLike
+from ..models.location import Location
 from ..extensions import db
+from sqlalchemy.orm import load_only, lazyload, selectinload
+from .pagination import clamp_per_page, keyset_paginate, COUNT_MODES
 from flask import jsonify
 
 
@@ -15,19 +16,12 @@ def apply_order(query, order_by):
     elif order_by == "oldest":
         query = query.order_by(Post.created_at.asc())
     elif order_by == "popular":
-        query = query.order_by(Post.view_count.desc())
+        query = query.order_by(Post.view_counts.desc(), Post.post_id.desc())
     elif order_by == "most_liked":
-        query = (
-            query.outerjoin(Post.likes)
-            .group_by(Post.post_id)
-            .order_by(db.func.count(PostLike.like_id).desc())
-        )
+        # 비정규화 컬럼 (ix_posts_like_count) 정렬 - 전체 좋아요 집계 없음
+        query = query.order_by(Post.like_count.desc(), Post.post_id.desc())
     elif order_by == "most_commented":
-        query = (
-            query.outerjoin(Post.replies)
-            .group_by(Post.post_id)
-            .order_by(db.func.count(Reply.reply_id).desc())
-        )
+        query = query.order_by(Post.reply_count.desc(), Post.post_id.desc())
     else:
         # 기본 정렬: 최신순
         query = query.order_by(Post.created_at.desc())
@@ -35,55 +29,210 @@ def apply_order(query, order_by):
     return query
 
 
+def _serialize_location(loc):
+    return {
+        "location_id": loc.location_id,
+        "latitude": loc.latitude,
+        "longitude": loc.longitude,
+        "name": loc.location_name,
+        "order_index": loc.order_index,
+        "recommend_point": loc.recommend_point,
+        "risk_point": loc.risk_point,
+        "created_at": loc.created_at.isoformat() if loc.created_at else None,
+        "updated_at": loc.updated_at.isoformat() if loc.updated_at else None,
+    }
+
+
+# fields= 로 고를 수 있는 필드 (post_id 는 항상 포함)
+POST_FIELDS = (
+    "post_id",
+    "user_id",
+    "nickname",
+    "category_id",
+    "content",
+    "location",
+    "locations",
+    "view_counts",
+    "created_at",
+    "updated_at",
+    "images",
+    "likes",
+    "replies",
+)
+
+# 필드 → 필요한 posts 컬럼
+_FIELD_COLUMNS = {
+    "user_id": ("user_id",),
+    "nickname": ("user_id",),
+    "category_id": ("category_id",),
+    "content": ("content",),
+    "view_counts": ("view_counts",),
+    "created_at": ("created_at",),
+    "updated_at": ("updated_at",),
+    "likes": ("like_count",),
+    "replies": ("reply_count",),
+}
+
+
+def parse_fields(raw):
+    """
+    fields=post_id,created_at → 필드 set (없으면 None = 전체)
+    - 모르는 필드면 ValueError
+    """
+    if not raw:
+        return None
+    fields = {f.strip() for f in raw.split(",") if f.strip()}
+    unknown = fields - set(POST_FIELDS)
+    if unknown:
+        raise ValueError(f"알 수 없는 필드: {', '.join(sorted(unknown))}")
+    fields.add("post_id")
+    return fields
+
+
+def apply_fields(query, fields):
+    """
+    요청한 필드에 필요한 컬럼/관계만 로드
+    - content(Text) 등 빠진 컬럼은 SELECT 하지 않음
+    - images 를 요청하지 않으면 이미지 조회/조인 생략
+    """
+    if fields is None:
+        return query.options(selectinload(Post.images))
+    columns = {"post_id", "created_at"}  # 커서(created_at, post_id) 계산용
+    for field in fields:
+        columns.update(_FIELD_COLUMNS.get(field, ()))
+    return query.options(
+        load_only(*[getattr(Post, column) for column in columns]),
+        selectinload(Post.images) if "images" in fields else lazyload(Post.images),
+    )
+
+
+def serialize_posts(posts, fields=None):
+    """
+    Post 목록을 한 번에 직렬화
+    - 작성자 닉네임 / 위치는 페이지 전체에 대해 IN 조회 1번씩 (요청한 경우에만)
+    - 좋아요/댓글 수는 posts.like_count / reply_count 컬럼
+    - 이미지는 호출하는 쪽에서 apply_fields / selectinload(Post.images) 로 미리 로드
+    - fields: parse_fields 결과 (None 이면 전체 필드)
+    """
+    if not posts:
+        return []
+
+    def want(name):
+        return fields is None or name in fields
+
+    post_ids = [post.post_id for post in posts]
+
+    nicknames = {}
+    if want("nickname"):
+        user_ids = {post.user_id for post in posts if post.user_id is not None}
+        if user_ids:
+            nicknames = dict(
+                db.session.query(User.user_id, User.nickname)
+                .filter(User.user_id.in_(user_ids))
+                .all()
+            )
+
+    locations = {}
+    if want("location") or want("locations"):
+        for loc in (
+            Location.query.filter(Location.post_id.in_(post_ids))
+            .order_by(Location.post_id, Location.order_index, Location.location_id)
+            .all()
+        ):
+            locations.setdefault(loc.post_id, []).append(_serialize_location(loc))
+
+    result = []
+    for post in posts:
+        post_locations = locations.get(post.post_id, [])
+        item = {"post_id": post.post_id}
+        if want("user_id"):
+            item["user_id"] = post.user_id
+        if want("nickname"):
+            item["nickname"] = nicknames.get(post.user_id)
+        if want("category_id"):
+            item["category_id"] = post.category_id
+        if want("content"):
+            item["content"] = post.content
+        if want("location"):
+            item["location"] = post_locations[0] if post_locations else None
+        if want("locations"):
+            item["locations"] = post_locations
+        if want("view_counts"):
+            item["view_counts"] = post.view_counts
+        if want("created_at"):
+            item["created_at"] = post.created_at.isoformat()
+        if want("updated_at"):
+            item["updated_at"] = post.updated_at.isoformat() if post.updated_at else None
+        if want("images"):
+            item["images"] = [
+                {
+                    "image_id": img.image_id,
+                    "uuid": img.uuid,
+                    "original_image_name": img.original_image_name,
+                    "ext": img.ext,
+                    "status": img.status,
+                }
+                for img in post.images
+            ]
+        if want("likes"):
+            item["likes"] = post.like_count
+        if want("replies"):
+            item["replies"] = post.reply_count
+        result.append(item)
+    return result
+
+
 def serialize_post(post):
     """Post 객체를 JSON 응답 형태로 직렬화"""
-    likes = Post.query.filter(PostLike.post_id == post.post_id).count()
-    replies = Reply.query.filter(Reply.post_id == post.post_id).count()
-    nickname = User.query.filter(User.user_id == post.user_id).first().nickname
-    images = [
-        {
-            "image_id": img.image_id,
-            "uuid": img.uuid,
-            "original_image_name": img.original_image_name,
-            "ext": img.ext,
-        }
-        for img in post.images
-    ]
-
-    location_data = None
-    if hasattr(post, "location_obj") and post.location_obj:
-        loc = post.location_obj
-        location_data = {
-            "location_id": loc.location_id,
-            "latitude": loc.latitude,
-            "longitude": loc.longitude,
-            "name": loc.name,
-            "recommend_point": loc.recommend_point,
-            "risk_point": loc.risk_point,
-            "created_at": loc.created_at.isoformat(),
-            "updated_at": loc.updated_at.isoformat() if loc.updated_at else None,
-        }
+    return serialize_posts([post])[0]
 
-    return {
-        "post_id": post.post_id,
-        "user_id": post.user_id,
-        "nickname": nickname,
-        "category_id": post.category_id,
-        "content": post.content,
-        "location": location_data,
-        "view_counts": post.view_counts,
-        "created_at": post.created_at.isoformat(),
-        "updated_at": post.updated_at.isoformat() if post.updated_at else None,
-        "images": images,
-        "likes": likes,
-        "replies": replies,
-    }
 
+def paginate_posts(
+    query, page, per_page, cursor=None, order_by="latest", count="exact", fields=None
+):
+    """
+    공통 페이지네이션 + 직렬화 처리
+    - cursor 가 None 이면 기존 page 방식 (OFFSET)
+    - cursor 가 주어지면 (빈 문자열 = 첫 페이지) created_at/post_id keyset 방식
+      (latest / oldest 정렬만 지원)
+    - fields: parse_fields 결과 (query 에는 apply_fields 를 미리 적용)
+    """
+    if cursor is not None:
+        if order_by not in ("latest", "oldest"):
+            return (
+                jsonify({"message": "cursor 모드는 latest/oldest 정렬만 지원합니다."}),
+                400,
+            )
+        if count not in COUNT_MODES:
+            return jsonify({"message": "count 는 exact, none, estimate 중 하나입니다."}), 400
+        per_page = clamp_per_page(per_page)
+        try:
+            items, next_cursor, total = keyset_paginate(
+                query,
+                Post.created_at,
+                Post.post_id,
+                cursor,
+                per_page,
+                descending=order_by == "latest",
+                count=count,
+            )
+        except ValueError as e:
+            return jsonify({"message": str(e)}), 400
+        return (
+            jsonify(
+                {
+                    "total": total,
+                    "per_page": per_page,
+                    "has_next": next_cursor is not None,
+                    "next_cursor": next_cursor,
+                    "items": serialize_posts(items, fields),
+                }
+            ),
+            200,
+        )
 
-def paginate_posts(query, page, per_page):
-    """공통 페이지네이션 + 직렬화 처리"""
     pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-    result = [serialize_post(p) for p in pagination.items]
+    result = serialize_posts(pagination.items, fields)
     return (
         jsonify(
             {
@@ -0,0 +1,227 @@
+# utils/post_search.py
+"""
+ 게시글 본문 검색 (역색인)
+- fulltext : MySQL FULLTEXT(ngram) 인덱스 ft_posts_content 사용, MATCH ... AGAINST 점수로 정렬
+- memory   : 프로세스 내 2-gram 역색인 (로컬/테스트용, MySQL ngram_token_size=2 와 같은 토큰 단위)
+             첫 검색 시 posts 전체로 만들고, 이후 작성/수정/삭제 때 해당 게시글만 갱신
+             (프로세스마다 따로 가지므로 다중 워커 운영에는 fulltext 사용)
+- POST_SEARCH_BACKEND 가 없으면 MySQL 은 fulltext, 그 외 DB 는 memory
+- 정렬: 점수 내림차순, 같은 점수는 post_id 내림차순 / cursor 는 (score, post_id)
+"""
+import base64
+import json
+import math
+import re
+import threading
+from collections import defaultdict
+from flask import current_app
+from sqlalchemy.dialects.mysql import match
+from ..extensions import db
+from ..models.post import Post
+
+NGRAM_SIZE = 2
+_TERM_RE = re.compile(r"\w+")
+# 불리언 모드 연산자로 해석되는 문자 제거용
+_BOOLEAN_SPECIAL_RE = re.compile(r'[+\-<>()~*"@]')
+
+
+def split_terms(text):
+    """검색어/본문 → 소문자 단어 목록"""
+    return _TERM_RE.findall((text or "").lower())
+
+
+def ngrams(term):
+    """단어 → 2-gram 목록 (한 글자 단어는 그대로)"""
+    if len(term) <= NGRAM_SIZE:
+        return [term]
+    return [term[i : i + NGRAM_SIZE] for i in range(len(term) - NGRAM_SIZE + 1)]
+
+
+def encode_search_cursor(score, post_id):
+    payload = json.dumps({"s": score, "id": post_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor):
+    """빈 값이면 None, 형식이 잘못되면 ValueError"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return float(payload["s"]), int(payload["id"])
+    except Exception:
+        raise ValueError("잘못된 cursor 값입니다.")
+
+
+class PostSearchBackend:
+    """검색 backend 인터페이스"""
+
+    def search(self, text, category_id=None, cursor=None, limit=20):
+        """반환: ([(post_id, score), ...], next_cursor)"""
+        raise NotImplementedError
+
+    def index_post(self, post):
+        """게시글 작성/수정 반영"""
+
+    def remove_post(self, post_id):
+        """게시글 삭제 반영"""
+
+
+class FulltextSearchBackend(PostSearchBackend):
+    """MySQL FULLTEXT(ngram) - 인덱스는 MySQL 이 갱신하므로 index/remove 는 할 일 없음"""
+
+    def search(self, text, category_id=None, cursor=None, limit=20):
+        terms = [_BOOLEAN_SPECIAL_RE.sub("", t) for t in (text or "").split()]
+        terms = [t for t in terms if t]
+        if not terms:
+            return [], None
+
+        # 모든 단어 포함 (+"단어"), 단어 안에서는 ngram 구문 검색
+        against = " ".join(f'+"{t}"' for t in terms)
+        score = match(Post.content, against=against).in_boolean_mode()
+
+        query = db.session.query(Post.post_id, score.label("score")).filter(score > 0)
+        if category_id is not None:
+            query = query.filter(Post.category_id == category_id)
+
+        position = decode_search_cursor(cursor)
+        if position is not None:
+            last_score, last_id = position
+            query = query.filter(
+                db.or_(score < last_score, db.and_(score == last_score, Post.post_id < last_id))
+            )
+
+        rows = query.order_by(score.desc(), Post.post_id.desc()).limit(limit + 1).all()
+        return _page(rows, limit)
+
+
+class InMemorySearchIndex(PostSearchBackend):
+    """프로세스 내 2-gram 역색인 + BM25 점수"""
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self._postings = defaultdict(dict)  # token -> {post_id: tf}
+        self._docs = {}  # post_id -> (category_id, 토큰 수, 토큰 집합)
+        self._total_length = 0
+        self._lock = threading.RLock()
+        self._built = False
+
+    def _ensure_built(self):
+        if self._built:
+            return
+        with self._lock:
+            if self._built:
+                return
+            rows = db.session.query(Post.post_id, Post.category_id, Post.content).yield_per(1000)
+            for post_id, category_id, content in rows:
+                self._add(post_id, category_id, content)
+            self._built = True
+
+    def _add(self, post_id, category_id, content):
+        tokens = [g for term in split_terms(content) for g in ngrams(term)]
+        counts = defaultdict(int)
+        for token in tokens:
+            counts[token] += 1
+        for token, tf in counts.items():
+            self._postings[token][post_id] = tf
+        self._docs[post_id] = (category_id, len(tokens), set(counts))
+        self._total_length += len(tokens)
+
+    def _remove(self, post_id):
+        doc = self._docs.pop(post_id, None)
+        if doc is None:
+            return
+        _, length, tokens = doc
+        self._total_length -= length
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(post_id, None)
+                if not postings:
+                    del self._postings[token]
+
+    def index_post(self, post):
+        with self._lock:
+            if not self._built:
+                # 아직 안 만들어졌으면 첫 검색 때 DB 에서 통째로 만든다
+                return
+            self._remove(post.post_id)
+            self._add(post.post_id, post.category_id, post.content)
+
+    def remove_post(self, post_id):
+        with self._lock:
+            self._remove(post_id)
+
+    def search(self, text, category_id=None, cursor=None, limit=20):
+        self._ensure_built()
+        terms = split_terms(text)
+        if not terms:
+            return [], None
+        tokens = {g for term in terms for g in ngrams(term)}
+        position = decode_search_cursor(cursor)
+
+        with self._lock:
+            postings = [self._postings.get(token, {}) for token in tokens]
+            if not all(postings):
+                return [], None
+            # 모든 토큰을 포함한 게시글만 (가장 짧은 posting 부터 교집합)
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates &= posting.keys()
+            if category_id is not None:
+                candidates = {pid for pid in candidates if self._docs[pid][0] == category_id}
+
+            n_docs = len(self._docs)
+            avg_length = (self._total_length / n_docs) if n_docs else 1
+            scored = []
+            for post_id in candidates:
+                length = self._docs[post_id][1]
+                score = 0.0
+                for posting in postings:
+                    df = len(posting)
+                    tf = posting[post_id]
+                    idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                    norm = tf + self.k1 * (1 - self.b + self.b * length / avg_length)
+                    score += idf * tf * (self.k1 + 1) / norm
+                scored.append((round(score, 6), post_id))
+
+        if position is not None:
+            scored = [item for item in scored if item < position]
+        scored.sort(reverse=True)
+        return _page([(post_id, score) for score, post_id in scored[: limit + 1]], limit)
+
+
+def _page(rows, limit):
+    """limit + 1 개 조회 결과 → (items, next_cursor)"""
+    items = [(post_id, float(score)) for post_id, score in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last_id, last_score = items[-1]
+        next_cursor = encode_search_cursor(last_score, last_id)
+    return items, next_cursor
+
+
+SEARCH_BACKENDS = {
+    "fulltext": FulltextSearchBackend,
+    "memory": InMemorySearchIndex,
+}
+
+
+def init_post_search(app):
+    """설정(없으면 DB 종류)에 맞는 검색 backend 를 앱에 붙인다"""
+    backend = app.config.get("POST_SEARCH_BACKEND")
+    if backend is None:
+        with app.app_context():
+            backend = "fulltext" if db.engine.dialect.name == "mysql" else "memory"
+    backend_class = SEARCH_BACKENDS.get(backend)
+    if backend_class is None:
+        raise ValueError(f"알 수 없는 검색 backend: {backend}")
+    app.extensions["post_search"] = backend_class()
+
+
+def get_post_search():
+    return current_app.extensions["post_search"]
@@ -0,0 +1,314 @@
+# utils/upload_sessions.py
+"""
+ 이어 올리기(resumable) 업로드 세션
+- 세션 = instance/uploads/{upload_id}/ 폴더 (data: 받은 바이트, meta.json: 상태)
+  파일 기반이라 여러 워커 프로세스가 같은 세션을 이어받을 수 있음
+- 청크는 offset 위치에 쓴다 (offset <= 받은 크기면 허용 → 같은 청크 재전송은 덮어쓰기)
+  연결이 끊겨도 그때까지 쓴 바이트는 받은 것으로 기록 → 클라이언트는 GET 으로 offset 확인 후 이어서 전송
+- finalize: 크기(선택: sha256) 확인 + 이미지 헤더 검사 → write_post 의 upload_ids 로 사용
+  게시글 저장이 끝나면 세션 삭제 (실패하면 남겨 두어 다시 시도 가능)
+- UPLOAD_SESSION_TTL (기본 24시간) 이 지난 세션은 접근 시 / 주기적으로 / `flask upload purge-expired` 로 삭제
+- 사용자별 한도: 만료되지 않은 세션 UPLOAD_MAX_SESSIONS_PER_USER (기본 10) 개,
+  선언한 크기 합계 UPLOAD_MAX_BYTES_PER_USER (기본 200MB) → 넘으면 세션 생성 429
+"""
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from datetime import datetime
+import click
+from PIL import Image as PILImage
+from flask import current_app
+from flask.cli import with_appcontext
+from werkzeug.datastructures import FileStorage
+from .image_storage import COPY_CHUNK_SIZE, ensure_dir
+
+UPLOAD_FOLDER = "uploads"
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_MAX_FILE_SIZE = 50 * 1024 * 1024
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_MAX_SESSIONS_PER_USER = 10
+DEFAULT_MAX_BYTES_PER_USER = 200 * 1024 * 1024
+
+STATUS_UPLOADING = "uploading"
+STATUS_FINALIZED = "finalized"
+
+# 만료 세션 정리 주기 (세션 생성 시 확인)
+PURGE_INTERVAL = 10 * 60
+_last_purge = 0.0
+_purge_lock = threading.Lock()
+
+# 한도 확인과 세션 생성 사이에 같은 프로세스의 다른 요청이 끼어들지 않도록
+_create_lock = threading.Lock()
+
+
+class UploadError(Exception):
+    """업로드 세션 요청 오류 (status: HTTP 상태 코드, offset: 현재 받은 크기)"""
+
+    def __init__(self, message, status=400, offset=None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+
+def _root():
+    return os.path.join(current_app.instance_path, UPLOAD_FOLDER)
+
+
+def _session_dir(upload_id):
+    # upload_id 는 uuid hex 만 허용 (경로 조작 방지)
+    try:
+        upload_id = uuid.UUID(hex=upload_id).hex
+    except (ValueError, TypeError):
+        raise UploadError("업로드 세션을 찾을 수 없습니다.", 404)
+    return os.path.join(_root(), upload_id)
+
+
+def _read_meta(session_dir):
+    try:
+        with open(os.path.join(session_dir, "meta.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _write_meta(session_dir, meta):
+    tmp_path = os.path.join(session_dir, f"meta.{uuid.uuid4().hex}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, os.path.join(session_dir, "meta.json"))
+
+
+def _public(meta):
+    return {
+        "upload_id": meta["upload_id"],
+        "filename": meta["filename"],
+        "size": meta["size"],
+        "offset": meta["offset"],
+        "status": meta["status"],
+        "expires_at": datetime.fromtimestamp(meta["expires_at"]).isoformat(),
+    }
+
+
+def create_session(user_id, filename, size, sha256=None):
+    """
+     업로드 세션 생성
+    - 반환: 세션 정보 + chunk_size (권장 청크 크기)
+    """
+    from .image_utils import IMAGE_EXTENSIONS
+
+    max_size = current_app.config.get("UPLOAD_MAX_FILE_SIZE", DEFAULT_MAX_FILE_SIZE)
+    if not filename or "." not in filename:
+        raise UploadError("filename 은 필수입니다.")
+    if filename.rsplit(".", 1)[-1].lower() not in IMAGE_EXTENSIONS:
+        raise UploadError(f"지원하지 않는 파일 형식: {filename}")
+    if not isinstance(size, int) or isinstance(size, bool) or size <= 0:
+        raise UploadError("size 는 양의 정수여야 합니다.")
+    if size > max_size:
+        raise UploadError(f"파일이 너무 큽니다 (최대 {max_size // 1024 // 1024}MB)", 413)
+
+    purge_expired_sessions(force=False)
+
+    with _create_lock:
+        _check_quota(user_id, size)
+
+        upload_id = uuid.uuid4().hex
+        session_dir = os.path.join(_root(), upload_id)
+        ensure_dir(_root())
+        os.makedirs(session_dir)
+        open(os.path.join(session_dir, "data"), "wb").close()
+
+        now = time.time()
+        meta = {
+            "upload_id": upload_id,
+            "user_id": str(user_id),
+            "filename": filename,
+            "size": size,
+            "sha256": sha256.lower() if sha256 else None,
+            "offset": 0,
+            "status": STATUS_UPLOADING,
+            "created_at": now,
+            "expires_at": now + current_app.config.get("UPLOAD_SESSION_TTL", DEFAULT_TTL),
+        }
+        _write_meta(session_dir, meta)
+    return {**_public(meta), "chunk_size": current_app.config.get("UPLOAD_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)}
+
+
+def _check_quota(user_id, size):
+    """사용자의 만료되지 않은 세션 수 / 선언 크기 합계에 size 를 더해 한도를 넘으면 429"""
+    max_sessions = current_app.config.get("UPLOAD_MAX_SESSIONS_PER_USER", DEFAULT_MAX_SESSIONS_PER_USER)
+    max_bytes = current_app.config.get("UPLOAD_MAX_BYTES_PER_USER", DEFAULT_MAX_BYTES_PER_USER)
+    root = _root()
+    if not os.path.isdir(root):
+        return
+
+    sessions, total = 0, 0
+    now = time.time()
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            meta = _read_meta(entry.path)
+            if meta is None or meta["user_id"] != str(user_id) or meta["expires_at"] < now:
+                continue
+            sessions += 1
+            total += meta["size"]
+
+    if sessions >= max_sessions:
+        raise UploadError(f"진행 중인 업로드가 너무 많습니다 (최대 {max_sessions}개)", 429)
+    if total + size > max_bytes:
+        raise UploadError(f"업로드 중인 파일 크기 합계가 너무 큽니다 (최대 {max_bytes // 1024 // 1024}MB)", 429)
+
+
+def _load(upload_id, user_id):
+    """세션 폴더와 meta (없거나, 만료됐거나, 다른 사용자 세션이면 404)"""
+    session_dir = _session_dir(upload_id)
+    meta = _read_meta(session_dir)
+    if meta is None or meta["user_id"] != str(user_id):
+        raise UploadError("업로드 세션을 찾을 수 없습니다.", 404)
+    if meta["expires_at"] < time.time():
+        shutil.rmtree(session_dir, ignore_errors=True)
+        raise UploadError("업로드 세션이 만료되었습니다.", 404)
+    return session_dir, meta
+
+
+def get_session(upload_id, user_id):
+    return _public(_load(upload_id, user_id)[1])
+
+
+def write_chunk(upload_id, user_id, offset, stream):
+    """
+     offset 위치부터 stream 을 이어 씀
+    - offset 이 받은 크기보다 크면 409 (빈 구간이 생김), 세션 크기를 넘으면 400
+    - 중간에 연결이 끊겨도 쓴 만큼은 offset 에 반영하고 예외를 다시 발생
+    - 반환: 세션 정보 (offset = 지금까지 받은 크기)
+    """
+    session_dir, meta = _load(upload_id, user_id)
+    if meta["status"] != STATUS_UPLOADING:
+        raise UploadError("이미 완료된 업로드입니다.", 409, meta["offset"])
+    if offset is None or offset < 0 or offset > meta["offset"]:
+        raise UploadError("offset 이 맞지 않습니다.", 409, meta["offset"])
+
+    written, overflow = 0, False
+    try:
+        with open(os.path.join(session_dir, "data"), "r+b") as f:
+            f.seek(offset)
+            for chunk in iter(lambda: stream.read(COPY_CHUNK_SIZE), b""):
+                if offset + written + len(chunk) > meta["size"]:
+                    overflow = True
+                    break
+                f.write(chunk)
+                written += len(chunk)
+    finally:
+        # 다시 읽어서 반영 (같은 세션에 동시에 들어온 요청이 더 많이 받았을 수 있음)
+        current = _read_meta(session_dir) or meta
+        current["offset"] = max(current["offset"], offset + written)
+        _write_meta(session_dir, current)
+        meta = current
+    if overflow:
+        raise UploadError("선언한 크기를 넘는 데이터입니다.", 400, meta["offset"])
+    return _public(meta)
+
+
+def finalize_session(upload_id, user_id):
+    """
+     모든 바이트를 받았는지 확인하고 이미지인지 검사
+    - sha256 을 세션 생성 때 넘겼으면 내용도 확인 (다르면 세션을 처음부터 다시 받도록 offset 0)
+    """
+    session_dir, meta = _load(upload_id, user_id)
+    if meta["status"] == STATUS_FINALIZED:
+        return _public(meta)
+    if meta["offset"] != meta["size"]:
+        raise UploadError("아직 받지 않은 데이터가 있습니다.", 409, meta["offset"])
+
+    data_path = os.path.join(session_dir, "data")
+    if meta["sha256"]:
+        from .image_blobs import file_sha256
+
+        if file_sha256(data_path) != meta["sha256"]:
+            meta["offset"] = 0
+            _write_meta(session_dir, meta)
+            raise UploadError("sha256 이 일치하지 않습니다. 처음부터 다시 업로드하세요.", 422, 0)
+    try:
+        with PILImage.open(data_path) as image:
+            image.verify()
+    except Exception:
+        raise UploadError("이미지 파일이 아닙니다.", 422)
+
+    meta["status"] = STATUS_FINALIZED
+    _write_meta(session_dir, meta)
+    return _public(meta)
+
+
+def open_finalized(upload_ids, user_id):
+    """
+     write_post 용: 완료된 세션들을 FileStorage 로 열기 (요청 파일과 같게 다룰 수 있음)
+    - 하나라도 없거나 완료되지 않았으면 UploadError (이미 연 파일은 닫음)
+    - 사용 후 close_files 로 닫고, 게시글 저장이 끝나면 discard_sessions
+    """
+    files = []
+    try:
+        for upload_id in upload_ids:
+            session_dir, meta = _load(upload_id, user_id)
+            if meta["status"] != STATUS_FINALIZED:
+                raise UploadError(f"완료되지 않은 업로드입니다: {upload_id}", 409, meta["offset"])
+            stream = open(os.path.join(session_dir, "data"), "rb")
+            files.append(FileStorage(stream=stream, filename=meta["filename"]))
+    except Exception:
+        close_files(files)
+        raise
+    return files
+
+
+def close_files(files):
+    for file in files:
+        file.close()
+
+
+def discard_session(upload_id, user_id):
+    session_dir, _ = _load(upload_id, user_id)
+    shutil.rmtree(session_dir, ignore_errors=True)
+
+
+def discard_sessions(upload_ids):
+    for upload_id in upload_ids:
+        shutil.rmtree(_session_dir(upload_id), ignore_errors=True)
+
+
+def purge_expired_sessions(force=True):
+    """
+     만료된 세션 폴더 삭제
+    - force=False 면 PURGE_INTERVAL 안에 이미 정리했으면 건너뜀
+    - 반환: 삭제한 세션 수
+    """
+    global _last_purge
+    with _purge_lock:
+        if not force and time.time() - _last_purge < PURGE_INTERVAL:
+            return 0
+        _last_purge = time.time()
+
+    root = _root()
+    if not os.path.isdir(root):
+        return 0
+    removed = 0
+    now = time.time()
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            meta = _read_meta(entry.path)
+            # meta 가 없는 폴더는 생성 도중일 수 있으므로 TTL 이 지났을 때만
+            expires_at = meta["expires_at"] if meta else entry.stat().st_mtime + DEFAULT_TTL
+            if expires_at < now:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed += 1
+    return removed
+
+
+@click.command("purge-expired")
+@with_appcontext
+def purge_expired_command():
+    """만료된 업로드 세션 삭제"""
+    click.echo(f"만료된 업로드 세션 {purge_expired_sessions()}개를 삭제했습니다.")
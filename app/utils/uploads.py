@@ -0,0 +1,33 @@
+# utils/uploads.py
+"""
+ 업로드 요청 본문 처리
+- MAX_CONTENT_LENGTH (설정 없으면 100MB) 를 넘는 요청은 본문을 읽기 전에 413
+- multipart 파일 필드는 SpooledTemporaryFile 로 받는다
+  파일마다 UPLOAD_SPOOL_MAX_MEMORY (기본 500KB, Werkzeug 기본값과 같음) 까지만 메모리, 넘으면 디스크 임시 파일
+  → 압축/저장 쪽에서 file.read() 로 통째로 복사하지 않고 스트림으로 읽는다
+"""
+import tempfile
+from flask import Request, current_app, jsonify
+from werkzeug.exceptions import RequestEntityTooLarge
+
+DEFAULT_MAX_CONTENT_LENGTH = 100 * 1024 * 1024
+DEFAULT_SPOOL_MAX_MEMORY = 500 * 1024
+
+
+class SpooledRequest(Request):
+    """파일 필드의 메모리 상한을 설정으로 조절하는 요청"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        max_memory = current_app.config.get("UPLOAD_SPOOL_MAX_MEMORY", DEFAULT_SPOOL_MAX_MEMORY)
+        return tempfile.SpooledTemporaryFile(max_size=max_memory, mode="rb+")
+
+
+def init_uploads(app):
+    app.request_class = SpooledRequest
+    if app.config.get("MAX_CONTENT_LENGTH") is None:
+        app.config["MAX_CONTENT_LENGTH"] = DEFAULT_MAX_CONTENT_LENGTH
+
+    @app.errorhandler(RequestEntityTooLarge)
+    def request_too_large(e):
+        limit_mb = app.config["MAX_CONTENT_LENGTH"] / 1024 / 1024
+        return jsonify({"message": f"요청이 너무 큽니다 (최대 {limit_mb:.0f}MB)"}), 413
@@ -0,0 +1,169 @@
+# utils/view_counter.py
+"""
+ 게시글 조회수 write-behind 버퍼
+- GET /post/<id> 는 조회수를 DB 에 바로 쓰지 않고 프로세스 내 버퍼에만 더함
+- 백그라운드 스레드가 VIEW_COUNT_FLUSH_SECONDS 마다 (또는 대기 조회가 VIEW_COUNT_MAX_PENDING 을 넘으면 즉시)
+  UPDATE posts SET view_counts = view_counts + CASE post_id WHEN .. THEN .. END WHERE post_id IN (..) 한 번으로 반영
+- 비정상 종료 시 마지막 flush 이후의 조회수만 유실, 정상 종료 시 atexit 에서 flush
+- flush 스레드는 첫 조회를 적재할 때 시작 (조회를 받지 않는 flask CLI 명령 / 테스트 앱에서는 만들지 않음)
+- stats() 의 flush_lag_seconds: 반영 대기 중인 가장 오래된 조회의 경과 시간
+  → flush 스레드가 VIEW_COUNT_STATS_LOG_SECONDS (기본 300, 0 이면 끔) 마다 로그로 남김
+"""
+import atexit
+import threading
+import time
+from flask import current_app
+from sqlalchemy import case, func
+from ..extensions import db
+from ..models.post import Post
+
+# UPDATE 한 번에 넣을 최대 게시글 수
+FLUSH_CHUNK_SIZE = 500
+
+# flush 스레드 시작 (record_view 가 여러 스레드에서 동시에 처음 호출될 수 있음)
+_start_lock = threading.Lock()
+
+
+class ViewCountBuffer:
+    def __init__(self, max_pending=10000):
+        self.max_pending = max_pending
+        self._counts = {}
+        self._pending = 0
+        self._oldest = None
+        self._lock = threading.Lock()
+        self.flush_requested = threading.Event()
+        self.last_flush_at = None
+        self.last_flush_seconds = None
+        self.flush_errors = 0
+
+    def add(self, post_id, count=1):
+        with self._lock:
+            self._counts[post_id] = self._counts.get(post_id, 0) + count
+            self._pending += count
+            if self._oldest is None:
+                self._oldest = time.time()
+            if self._pending >= self.max_pending:
+                self.flush_requested.set()
+
+    def pending(self, post_id):
+        with self._lock:
+            return self._counts.get(post_id, 0)
+
+    def drain(self):
+        with self._lock:
+            counts, oldest = self._counts, self._oldest
+            self._counts, self._pending, self._oldest = {}, 0, None
+            self.flush_requested.clear()
+            return counts, oldest
+
+    def restore(self, counts, oldest):
+        """flush 실패 시 증가분 되돌리기"""
+        with self._lock:
+            for post_id, count in counts.items():
+                self._counts[post_id] = self._counts.get(post_id, 0) + count
+                self._pending += count
+            if oldest is not None and (self._oldest is None or oldest < self._oldest):
+                self._oldest = oldest
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pending_views": self._pending,
+                "pending_posts": len(self._counts),
+                "flush_lag_seconds": round(time.time() - self._oldest, 3) if self._oldest else 0.0,
+                "last_flush_at": self.last_flush_at,
+                "last_flush_seconds": self.last_flush_seconds,
+                "flush_errors": self.flush_errors,
+            }
+
+
+def flush_view_counts(app):
+    """버퍼의 증가분을 DB 에 반영, 갱신된 게시글 수 반환"""
+    counter = app.extensions["post_view_counter"]
+    counts, oldest = counter.drain()
+    if not counts:
+        return 0
+
+    started = time.time()
+    items = list(counts.items())
+    try:
+        for start in range(0, len(items), FLUSH_CHUNK_SIZE):
+            chunk = dict(items[start : start + FLUSH_CHUNK_SIZE])
+            Post.query.filter(Post.post_id.in_(chunk)).update(
+                {
+                    Post.view_counts: func.coalesce(Post.view_counts, 0)
+                    + case(chunk, value=Post.post_id, else_=0),
+                    # 조회는 수정이 아니므로 updated_at(onupdate) 유지
+                    Post.updated_at: Post.updated_at,
+                },
+                synchronize_session=False,
+            )
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        counter.restore(counts, oldest)
+        counter.flush_errors += 1
+        raise
+
+    counter.last_flush_at = time.time()
+    counter.last_flush_seconds = round(counter.last_flush_at - started, 3)
+    return len(items)
+
+
+def _flush(app):
+    with app.app_context():
+        try:
+            flush_view_counts(app)
+        except Exception as e:
+            app.logger.warning(f"조회수 flush 실패: {e}")
+        finally:
+            db.session.remove()
+
+
+def _flush_loop(app, stop_event):
+    counter = app.extensions["post_view_counter"]
+    interval = app.config.get("VIEW_COUNT_FLUSH_SECONDS", 10)
+    log_interval = app.config.get("VIEW_COUNT_STATS_LOG_SECONDS", 300)
+    last_logged = time.time()
+    while not stop_event.is_set():
+        counter.flush_requested.wait(interval)
+        # flush 직전 값이어야 flush_lag_seconds 가 의미 있음
+        if log_interval and time.time() - last_logged >= log_interval:
+            app.logger.info(f"조회수 버퍼: {counter.stats()}")
+            last_logged = time.time()
+        _flush(app)
+
+
+def _start_flush_thread(app):
+    """백그라운드 flush 스레드를 프로세스마다 한 번만 시작"""
+    with _start_lock:
+        if "post_view_counter_stop" in app.extensions:
+            return
+        stop_event = threading.Event()
+        thread = threading.Thread(
+            target=_flush_loop, args=(app, stop_event), name="view-count-flush", daemon=True
+        )
+        thread.start()
+        app.extensions["post_view_counter_stop"] = stop_event
+        atexit.register(_flush, app)
+
+
+def init_view_counter(app):
+    """조회수 버퍼 등록 (flush 스레드는 record_view 에서 시작)"""
+    app.extensions["post_view_counter"] = ViewCountBuffer(
+        app.config.get("VIEW_COUNT_MAX_PENDING", 10000)
+    )
+
+
+def record_view(post):
+    """조회 1회 적재 후, 반영 대기분을 포함한 조회수 반환 (DB 쓰기 없음)"""
+    app = current_app._get_current_object()
+    if (
+        app.config.get("VIEW_COUNT_BACKGROUND_FLUSH", True)
+        and not app.testing
+        and "post_view_counter_stop" not in app.extensions
+    ):
+        _start_flush_thread(app)
+    counter = app.extensions["post_view_counter"]
+    counter.add(post.post_id)
+    return (post.view_counts or 0) + counter.pending(post.post_id)
@@ -9,6 +9,7 @@ from datetime import datetime, timedelta
 from apps.config.server import db
 from apps.auth.models import User, AccountType
 from apps.admin.models import Post, Reply, Follow, Report
+from apps.post.view_counter import get_view_counter
 
 bp = Blueprint("admin", __name__)
 
@@ -278,6 +279,17 @@ def get_activity_statistics():
     }), 200
 
 
+@bp.get("/statistics/view-counter")
+@jwt_required()
+def get_view_counter_statistics():
+    """Get write-behind view counter metrics (pending views, flush lag)"""
+    error = admin_required()
+    if error:
+        return error
+    
+    return jsonify(get_view_counter().stats()), 200
+
+
 # =====================================================
 # Reports Management
 # =====================================================
@@ -47,6 +47,14 @@ def create_app(config_name='default'):
     # Register blueprints
     register_blueprints(app)
     
+    # Feed timeline store / trending snapshots / post view counter
+    from apps.feed.timeline import init_timeline_store
+    from apps.feed.trending import init_trending
+    from apps.post.view_counter import init_view_counter
+    init_timeline_store(app)
+    init_trending(app)
+    init_view_counter(app)
+    
     # Create upload directories
     with app.app_context():
         create_directories(app)
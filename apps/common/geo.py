@@ -0,0 +1,77 @@
+"""
+위치 격자(grid cell) 인덱스 유틸리티
+
+위도/경도를 GEO_CELL_DEG 크기의 격자로 나눠 정수 셀 번호(geo_cell)로 저장한다.
+    geo_cell = 행(위도) * GEO_LON_CELLS + 열(경도)
+같은 위도 행의 셀 번호는 연속이므로, 반경 검색은 행마다 BETWEEN 범위 하나로
+(geo_cell, post_id) 인덱스를 탈 수 있다.
+
+app/utils/geo_utils.py 의 geo_cell() 과 같은 격자 정의를 사용해야 한다.
+"""
+import math
+
+GEO_CELL_DEG = 0.05  # 약 5.5km
+GEO_LON_CELLS = int(round(360 / GEO_CELL_DEG))
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG_LAT = 111.32
+
+
+def geo_cell(latitude, longitude):
+    """위도/경도 → 격자 셀 번호"""
+    row = int(math.floor((latitude + 90) / GEO_CELL_DEG))
+    col = int(math.floor((longitude + 180) / GEO_CELL_DEG)) % GEO_LON_CELLS
+    return row * GEO_LON_CELLS + col
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    반경을 감싸는 위도/경도 사각형
+    - 반환: (min_lat, max_lat, min_lon, max_lon), 경도는 -180~180 범위를 벗어날 수 있음
+    """
+    dlat = radius_km / KM_PER_DEG_LAT
+    cos_lat = math.cos(math.radians(latitude))
+    dlon = 180.0 if cos_lat < 1e-6 else min(radius_km / (KM_PER_DEG_LAT * cos_lat), 180.0)
+    return (
+        max(latitude - dlat, -90.0),
+        min(latitude + dlat, 90.0),
+        longitude - dlon,
+        longitude + dlon,
+    )
+
+
+def cell_ranges(latitude, longitude, radius_km):
+    """
+    반경을 덮는 geo_cell 범위 목록 [(lo, hi), ...]
+    - 위도 행마다 연속 구간 하나 (날짜변경선을 넘으면 둘)
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+    row0 = int(math.floor((min_lat + 90) / GEO_CELL_DEG))
+    row1 = int(math.floor((max_lat + 90) / GEO_CELL_DEG))
+
+    if max_lon - min_lon >= 360:
+        col_spans = [(0, GEO_LON_CELLS - 1)]
+    else:
+        col0 = int(math.floor((min_lon + 180) / GEO_CELL_DEG))
+        col1 = int(math.floor((max_lon + 180) / GEO_CELL_DEG))
+        if col0 < 0:
+            col_spans = [(col0 % GEO_LON_CELLS, GEO_LON_CELLS - 1), (0, col1)]
+        elif col1 >= GEO_LON_CELLS:
+            col_spans = [(col0, GEO_LON_CELLS - 1), (0, col1 % GEO_LON_CELLS)]
+        else:
+            col_spans = [(col0, col1)]
+
+    return [
+        (row * GEO_LON_CELLS + lo, row * GEO_LON_CELLS + hi)
+        for row in range(row0, row1 + 1)
+        for lo, hi in col_spans
+    ]
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """두 좌표 사이의 대원 거리(km)"""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
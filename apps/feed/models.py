@@ -0,0 +1,60 @@
+"""
+Feed models - materialized home timelines, trending snapshots
+"""
+from apps.config.server import db
+
+
+class TimelineEntry(db.Model):
+    """
+    사용자별 홈 타임라인 항목 (fan-out-on-write 결과)
+
+    - user_id : 타임라인 소유자 (팔로워)
+    - post_id : 타임라인에 들어간 게시글
+    - created_at : 게시글 작성 시각 (정렬 기준, posts 조인 없이 정렬하기 위해 복사)
+    """
+    __tablename__ = "feed_timelines"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True)
+    post_id = db.Column(db.Integer, db.ForeignKey("posts.post_id", ondelete="CASCADE"), primary_key=True)
+    created_at = db.Column(db.DateTime, nullable=False)
+
+    __table_args__ = (
+        db.Index("ix_feed_timelines_user_created", "user_id", "created_at"),
+    )
+
+    def __repr__(self):
+        return f'<TimelineEntry user={self.user_id} post={self.post_id}>'
+
+
+class TimelineState(db.Model):
+    """
+    타임라인을 만든 사용자 표시 (항목이 0개인 타임라인도 "만들어짐"으로 구분하기 위해)
+
+    - user_id : 타임라인 소유자
+    - built_at : 마지막 재구성 시각
+    """
+    __tablename__ = "feed_timeline_states"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True)
+    built_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f'<TimelineState user={self.user_id}>'
+
+
+class TrendingSnapshot(db.Model):
+    """
+    기간별 트렌딩 스냅샷 (모든 워커가 공유, `flask feed refresh-trending` 으로 갱신)
+
+    - period : today, week, month
+    - generated_at : 계산 시각
+    - posts : 직렬화된 게시글 목록 (점수 순)
+    """
+    __tablename__ = "feed_trending_snapshots"
+
+    period = db.Column(db.String(10), primary_key=True)
+    generated_at = db.Column(db.DateTime, nullable=False)
+    posts = db.Column(db.JSON, nullable=False)
+
+    def __repr__(self):
+        return f'<TrendingSnapshot {self.period} at={self.generated_at}>'
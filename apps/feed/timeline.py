@@ -0,0 +1,274 @@
+"""
+홈 타임라인 저장소 - fan-out-on-write
+
+게시글 작성 시 팔로워들의 타임라인에 (created_at, post_id)를 미리 넣어두고,
+GET /feed 는 타임라인 조회 + 게시글 hydration 만 수행한다.
+팔로워가 FEED_FANOUT_MAX_FOLLOWERS 를 넘는 작성자는 쓰기 시 fan-out 하지 않고
+읽기 시점에 해당 작성자의 최신 게시글을 합친다 (fan-out-on-read).
+
+저장소 backend (FEED_TIMELINE_BACKEND):
+    - memory   : 프로세스 내 dict (테스트/단일 프로세스용)
+    - database : feed_timelines 테이블 (+ 만들어진 타임라인 표시 feed_timeline_states,
+                 팔로우가 없어 비어 있는 타임라인을 매번 재구성하지 않도록)
+다른 backend(공유 캐시 등)는 TimelineStore 를 상속해 register_timeline_backend 로 등록한다.
+"""
+import threading
+from bisect import insort
+from datetime import datetime
+
+from flask import current_app
+
+from apps.config.server import db
+from apps.post.models import Post
+from apps.user.models import Follow
+from apps.auth.models import User
+from apps.feed.models import TimelineEntry, TimelineState
+
+
+def _sort_key(entry):
+    """(created_at, post_id) 최신순 정렬 키"""
+    created_at, post_id = entry
+    return (-created_at.timestamp(), -post_id)
+
+
+class TimelineStore:
+    """타임라인 저장소 인터페이스. 항목은 (created_at, post_id) 튜플, 최신순."""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+
+    def get(self, user_id):
+        """타임라인 조회. 아직 만들어지지 않았으면 None"""
+        raise NotImplementedError
+
+    def set(self, user_id, entries):
+        """타임라인 전체 교체 (재구성 결과 저장)"""
+        raise NotImplementedError
+
+    def push(self, user_ids, created_at, post_id):
+        """이미 만들어진 타임라인들에만 게시글 추가"""
+        raise NotImplementedError
+
+    def remove_post(self, post_id):
+        """모든 타임라인에서 게시글 제거"""
+        raise NotImplementedError
+
+    def clear(self, user_id):
+        """타임라인 무효화 (다음 조회 시 재구성)"""
+        raise NotImplementedError
+
+
+class InMemoryTimelineStore(TimelineStore):
+    """프로세스 내 타임라인 저장소"""
+
+    def __init__(self, max_size):
+        super().__init__(max_size)
+        self._timelines = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entries = self._timelines.get(user_id)
+            return list(entries) if entries is not None else None
+
+    def set(self, user_id, entries):
+        entries = sorted(entries, key=_sort_key)[:self.max_size]
+        with self._lock:
+            self._timelines[user_id] = entries
+
+    def push(self, user_ids, created_at, post_id):
+        with self._lock:
+            for user_id in user_ids:
+                entries = self._timelines.get(user_id)
+                if entries is None:
+                    continue
+                insort(entries, (created_at, post_id), key=_sort_key)
+                del entries[self.max_size:]
+
+    def remove_post(self, post_id):
+        with self._lock:
+            for user_id, entries in self._timelines.items():
+                self._timelines[user_id] = [e for e in entries if e[1] != post_id]
+
+    def clear(self, user_id):
+        with self._lock:
+            self._timelines.pop(user_id, None)
+
+
+class DatabaseTimelineStore(TimelineStore):
+    """feed_timelines 테이블 기반 타임라인 저장소 (feed_timeline_states 행이 있으면 만들어진 타임라인)"""
+
+    # IN 절 하나에 넣을 최대 사용자 수
+    chunk_size = 1000
+
+    def get(self, user_id):
+        rows = (
+            db.session.query(TimelineEntry.created_at, TimelineEntry.post_id)
+            .filter(TimelineEntry.user_id == user_id)
+            .order_by(TimelineEntry.created_at.desc(), TimelineEntry.post_id.desc())
+            .limit(self.max_size + 1)
+            .all()
+        )
+        if not rows:
+            # 만들어졌지만 비어 있는 타임라인이면 [] (없으면 재구성 필요)
+            return [] if db.session.get(TimelineState, user_id) is not None else None
+
+        entries = [tuple(row) for row in rows]
+        if len(entries) > self.max_size:
+            # 크기 제한을 넘긴 오래된 항목은 읽는 쪽에서 정리
+            oldest_kept = entries[self.max_size - 1][0]
+            TimelineEntry.query.filter(
+                TimelineEntry.user_id == user_id,
+                TimelineEntry.created_at < oldest_kept,
+            ).delete(synchronize_session=False)
+            db.session.commit()
+            entries = entries[:self.max_size]
+        return entries
+
+    def set(self, user_id, entries):
+        entries = sorted(entries, key=_sort_key)[:self.max_size]
+        TimelineEntry.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+        db.session.bulk_insert_mappings(TimelineEntry, [
+            {"user_id": user_id, "post_id": post_id, "created_at": created_at}
+            for created_at, post_id in entries
+        ])
+        db.session.merge(TimelineState(user_id=user_id, built_at=datetime.now()))
+        db.session.commit()
+
+    def push(self, user_ids, created_at, post_id):
+        user_ids = list(user_ids)
+        for start in range(0, len(user_ids), self.chunk_size):
+            chunk = user_ids[start:start + self.chunk_size]
+            materialized = [
+                row[0] for row in
+                db.session.query(TimelineState.user_id)
+                .filter(TimelineState.user_id.in_(chunk))
+                .all()
+            ]
+            db.session.bulk_insert_mappings(TimelineEntry, [
+                {"user_id": user_id, "post_id": post_id, "created_at": created_at}
+                for user_id in materialized
+            ])
+        db.session.commit()
+
+    def remove_post(self, post_id):
+        TimelineEntry.query.filter_by(post_id=post_id).delete(synchronize_session=False)
+        db.session.commit()
+
+    def clear(self, user_id):
+        TimelineEntry.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+        TimelineState.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+        db.session.commit()
+
+
+TIMELINE_BACKENDS = {
+    "memory": InMemoryTimelineStore,
+    "database": DatabaseTimelineStore,
+}
+
+
+def register_timeline_backend(name, store_class):
+    """외부 backend 등록 (예: 공유 캐시)"""
+    TIMELINE_BACKENDS[name] = store_class
+
+
+def init_timeline_store(app):
+    """설정에 맞는 타임라인 저장소를 앱에 붙인다"""
+    backend = app.config.get("FEED_TIMELINE_BACKEND", "memory")
+    store_class = TIMELINE_BACKENDS.get(backend)
+    if store_class is None:
+        raise ValueError(f"알 수 없는 타임라인 backend: {backend}")
+    app.extensions["feed_timeline"] = store_class(app.config.get("FEED_TIMELINE_SIZE", 500))
+
+
+def get_timeline_store():
+    """현재 앱의 타임라인 저장소"""
+    return current_app.extensions["feed_timeline"]
+
+
+def _fanout_limit():
+    return current_app.config.get("FEED_FANOUT_MAX_FOLLOWERS", 5000)
+
+
+def fan_out_post(post):
+    """
+    새 게시글을 작성자와 팔로워들의 타임라인에 추가
+
+    팔로워가 너무 많은 작성자는 작성자 본인 타임라인에만 넣고,
+    팔로워 쪽은 읽기 시점 병합(fan-out-on-read)에 맡긴다.
+    (팔로워 수는 팔로우/언팔로우 때 갱신되는 users.follower_count 를 그대로 사용)
+    """
+    store = get_timeline_store()
+    follower_count = (
+        db.session.query(User.follower_count)
+        .filter(User.user_id == post.user_id)
+        .scalar()
+    )
+    recipients = [post.user_id]
+
+    if (follower_count or 0) <= _fanout_limit():
+        recipients.extend(
+            row[0] for row in
+            db.session.query(Follow.follower_id)
+            .filter(Follow.following_id == post.user_id)
+            .all()
+        )
+
+    store.push(recipients, post.created_at, post.post_id)
+
+
+def rebuild_timeline(user_id):
+    """팔로우 목록 기준으로 타임라인 재구성 (fan-out-on-read) 후 저장"""
+    store = get_timeline_store()
+    following_ids = db.session.query(Follow.following_id).filter(Follow.follower_id == user_id)
+    entries = [
+        tuple(row) for row in
+        db.session.query(Post.created_at, Post.post_id)
+        .filter((Post.user_id.in_(following_ids)) | (Post.user_id == user_id))
+        .order_by(Post.created_at.desc(), Post.post_id.desc())
+        .limit(store.max_size)
+        .all()
+    ]
+    store.set(user_id, entries)
+    return entries
+
+
+def _celebrity_entries(user_id, limit):
+    """fan-out 대상에서 빠진(팔로워가 많은) 팔로잉 작성자들의 최신 게시글"""
+    celebrity_ids = (
+        db.session.query(Follow.following_id)
+        .join(User, User.user_id == Follow.following_id)
+        .filter(Follow.follower_id == user_id, User.follower_count > _fanout_limit())
+    )
+    return [
+        tuple(row) for row in
+        db.session.query(Post.created_at, Post.post_id)
+        .filter(Post.user_id.in_(celebrity_ids))
+        .order_by(Post.created_at.desc(), Post.post_id.desc())
+        .limit(limit)
+        .all()
+    ]
+
+
+def load_timeline(user_id):
+    """
+    사용자의 홈 타임라인 (created_at, post_id) 리스트, 최신순
+
+    저장된 타임라인이 없으면 재구성하고, 팔로워가 많은 작성자의 게시글을 병합한다.
+    """
+    store = get_timeline_store()
+    entries = store.get(user_id)
+    if entries is None:
+        entries = rebuild_timeline(user_id)
+
+    celebrity = _celebrity_entries(user_id, store.max_size)
+    if celebrity:
+        merged = {post_id: created_at for created_at, post_id in entries}
+        merged.update({post_id: created_at for created_at, post_id in celebrity})
+        entries = sorted(
+            ((created_at, post_id) for post_id, created_at in merged.items()),
+            key=_sort_key,
+        )[:store.max_size]
+
+    return entries
+
@@ -0,0 +1,224 @@
+"""
+트렌딩 스냅샷 - 시간 감쇠 점수를 미리 계산해 두고 요청 시 읽기만 한다
+
+점수 = (조회수 * VIEW_WEIGHT + 좋아요 * LIKE_WEIGHT + 기간 내 댓글 * REPLY_WEIGHT)
+       / (작성 후 경과 시간(h) + 2) ^ TRENDING_GRAVITY
+
+스냅샷은 feed_trending_snapshots 테이블에 두고 모든 워커가 읽는다 (프로세스마다 메모리에도 캐시).
+`flask feed refresh-trending` 을 TRENDING_REFRESH_SECONDS 보다 짧은 주기로 (cron 등) 실행하면
+요청은 스냅샷을 읽기만 한다.
+스냅샷이 없거나 TRENDING_REFRESH_SECONDS 의 2배보다 오래되면 요청에서 계산하되,
+기간마다 한 스레드만 계산하고 나머지 요청은 이전 스냅샷을 그대로 받는다.
+TRENDING_BACKGROUND_REFRESH 를 켜면 (기본 꺼짐) 백그라운드 스레드가 주기마다 미리 갱신한다.
+스레드는 create_app 마다 (gunicorn 워커, flask CLI 명령마다) 하나씩 생기므로
+단일 프로세스로 운영하는 서버에서만 켠다 (테스트 앱에서는 켜지 않음).
+"""
+import threading
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import func
+
+from apps.config.server import db
+from apps.post.models import Post
+from apps.reply.models import Reply
+from apps.feed.models import TrendingSnapshot
+from apps.feed.utils import serialize_feed_posts
+
+TRENDING_PERIODS = {
+    "today": timedelta(days=1),
+    "week": timedelta(days=7),
+    "month": timedelta(days=30),
+}
+
+VIEW_WEIGHT = 1.0
+LIKE_WEIGHT = 4.0
+REPLY_WEIGHT = 6.0
+
+
+class TrendingSnapshotStore:
+    """기간별 트렌딩 스냅샷 (프로세스 내 캐시) + 기간별 갱신 잠금"""
+
+    def __init__(self):
+        self._snapshots = {}
+        self._lock = threading.Lock()
+        self._refresh_locks = {period: threading.Lock() for period in TRENDING_PERIODS}
+
+    def refresh_lock(self, period):
+        return self._refresh_locks[period]
+
+    def get(self, period):
+        with self._lock:
+            return self._snapshots.get(period)
+
+    def set(self, period, snapshot):
+        with self._lock:
+            self._snapshots[period] = snapshot
+
+
+def compute_trending(period, now=None, size=100, gravity=1.5):
+    """
+    기간 내 게시글의 트렌딩 점수 계산
+
+    Args:
+        period: today, week, month
+        now: 기준 시각 (기본값: 현재)
+        size: 스냅샷에 담을 게시글 수
+        gravity: 시간 감쇠 지수
+
+    Returns:
+        {"period", "generated_at", "posts"} 스냅샷 dict
+    """
+    now = now or datetime.now()
+    start_time = now - TRENDING_PERIODS[period]
+
+    # 좋아요 수는 posts.like_count, 기간 내 댓글 수만 GROUP BY 1회
+    reply_counts = (
+        db.session.query(Reply.post_id, func.count().label("replies"))
+        .filter(Reply.created_at >= start_time)
+        .group_by(Reply.post_id)
+        .subquery()
+    )
+    rows = (
+        db.session.query(
+            Post.post_id,
+            Post.created_at,
+            Post.view_counts,
+            Post.like_count,
+            reply_counts.c.replies,
+        )
+        .outerjoin(reply_counts, reply_counts.c.post_id == Post.post_id)
+        .filter(Post.created_at >= start_time)
+        .all()
+    )
+
+    scored = []
+    for post_id, created_at, views, likes, replies in rows:
+        activity = (
+            (views or 0) * VIEW_WEIGHT
+            + (likes or 0) * LIKE_WEIGHT
+            + (replies or 0) * REPLY_WEIGHT
+        )
+        age_hours = max((now - created_at).total_seconds() / 3600, 0)
+        scored.append((activity / (age_hours + 2) ** gravity, post_id))
+    scored.sort(reverse=True)
+
+    top_ids = [post_id for _, post_id in scored[:size]]
+    posts_by_id = {
+        post.post_id: post
+        for post in Post.query.filter(Post.post_id.in_(top_ids)).all()
+    } if top_ids else {}
+    posts = [posts_by_id[post_id] for post_id in top_ids if post_id in posts_by_id]
+
+    # 미리보기
+    return {
+        "period": period,
+        "generated_at": now,
+        "posts": serialize_feed_posts(posts, preview_length=200, include_profile_img=False),
+    }
+
+
+def load_snapshot(period):
+    """공유 테이블의 스냅샷 (없으면 None)"""
+    row = db.session.get(TrendingSnapshot, period)
+    if row is None:
+        return None
+    return {"period": row.period, "generated_at": row.generated_at, "posts": row.posts}
+
+
+def save_snapshot(snapshot):
+    db.session.merge(TrendingSnapshot(
+        period=snapshot["period"],
+        generated_at=snapshot["generated_at"],
+        posts=snapshot["posts"],
+    ))
+    db.session.commit()
+
+
+def refresh_trending(app, period=None):
+    """스냅샷 계산 후 공유 테이블과 프로세스 캐시에 저장 (period 가 None 이면 전체 기간)"""
+    store = app.extensions["feed_trending"]
+    periods = [period] if period else list(TRENDING_PERIODS)
+    for name in periods:
+        snapshot = compute_trending(
+            name,
+            size=app.config.get("TRENDING_SNAPSHOT_SIZE", 100),
+            gravity=app.config.get("TRENDING_GRAVITY", 1.5),
+        )
+        save_snapshot(snapshot)
+        store.set(name, snapshot)
+
+
+def _refresh_loop(app, stop_event):
+    interval = app.config.get("TRENDING_REFRESH_SECONDS", 300)
+    while not stop_event.is_set():
+        with app.app_context():
+            try:
+                refresh_trending(app)
+            except Exception as e:
+                app.logger.warning(f"트렌딩 스냅샷 갱신 실패: {e}")
+            finally:
+                db.session.remove()
+        stop_event.wait(interval)
+
+
+def init_trending(app):
+    """스냅샷 저장소를 앱에 붙이고, 설정 시 백그라운드 갱신 스레드 시작"""
+    app.extensions["feed_trending"] = TrendingSnapshotStore()
+    if app.config.get("TRENDING_BACKGROUND_REFRESH", False) and not app.testing:
+        stop_event = threading.Event()
+        thread = threading.Thread(
+            target=_refresh_loop, args=(app, stop_event), name="trending-refresh", daemon=True
+        )
+        thread.start()
+        app.extensions["feed_trending_stop"] = stop_event
+
+
+def get_trending_snapshot(period):
+    """
+    기간별 스냅샷 조회
+    - 프로세스 캐시 → 공유 테이블 순으로 읽음
+    - 둘 다 없거나 갱신 주기의 2배 이상 지났으면 한 스레드만 다시 계산
+      (계산 중에 들어온 요청은 이전 스냅샷을 받고, 스냅샷이 아예 없을 때만 계산을 기다림)
+    """
+    app = current_app._get_current_object()
+    store = app.extensions["feed_trending"]
+    max_age = timedelta(seconds=2 * app.config.get("TRENDING_REFRESH_SECONDS", 300))
+
+    def is_fresh(snapshot):
+        return snapshot is not None and datetime.now() - snapshot["generated_at"] <= max_age
+
+    snapshot = store.get(period)
+    if is_fresh(snapshot):
+        return snapshot
+
+    shared = load_snapshot(period)
+    if shared is not None and (snapshot is None or shared["generated_at"] > snapshot["generated_at"]):
+        store.set(period, shared)
+        snapshot = shared
+    if is_fresh(snapshot):
+        return snapshot
+
+    lock = store.refresh_lock(period)
+    if not lock.acquire(blocking=snapshot is None):
+        return snapshot
+    try:
+        # 잠금을 기다리는 동안 다른 스레드가 갱신했으면 그대로 사용
+        latest = store.get(period)
+        if is_fresh(latest):
+            return latest
+        refresh_trending(app, period)
+    finally:
+        lock.release()
+    return store.get(period)
+
+
+@click.command("refresh-trending")
+@click.option("--period", type=click.Choice(list(TRENDING_PERIODS)), help="갱신할 기간 (기본: 전체)")
+@with_appcontext
+def refresh_trending_command(period):
+    """트렌딩 스냅샷을 다시 계산해 공유 테이블에 저장 (cron 등으로 주기 실행)"""
+    refresh_trending(current_app._get_current_object(), period)
+    click.echo(f"트렌딩 스냅샷을 갱신했습니다: {period or ', '.join(TRENDING_PERIODS)}")
@@ -0,0 +1,140 @@
+"""
+피드 유틸리티 - 게시글 목록 일괄 직렬화
+"""
+from sqlalchemy.orm import load_only
+
+from apps.config.server import db
+from apps.post.models import Post, Category
+from apps.auth.models import User
+
+# fields= 로 고를 수 있는 필드 (post_id 는 항상 포함)
+FEED_FIELDS = (
+    "post_id",
+    "author",
+    "content",
+    "category",
+    "view_counts",
+    "like_count",
+    "created_at",
+)
+
+# 필드 → 필요한 posts 컬럼
+_FIELD_COLUMNS = {
+    "author": ("user_id",),
+    "content": ("content",),
+    "category": ("category_id",),
+    "view_counts": ("view_counts",),
+    "like_count": ("like_count",),
+    "created_at": ("created_at",),
+}
+
+
+def parse_feed_fields(raw):
+    """
+    fields=post_id,created_at → 필드 set (없으면 None = 전체)
+
+    Raises:
+        ValueError: 알 수 없는 필드
+    """
+    if not raw:
+        return None
+    fields = {f.strip() for f in raw.split(",") if f.strip()}
+    unknown = fields - set(FEED_FIELDS)
+    if unknown:
+        raise ValueError(f"알 수 없는 필드: {', '.join(sorted(unknown))}")
+    fields.add("post_id")
+    return fields
+
+
+def feed_load_options(fields):
+    """요청한 필드에 필요한 컬럼만 로드하는 쿼리 옵션 (content Text 컬럼 등 생략)"""
+    if fields is None:
+        return []
+    columns = {"post_id", "created_at"}  # 커서(created_at, post_id) 계산용
+    for field in fields:
+        columns.update(_FIELD_COLUMNS.get(field, ()))
+    return [load_only(*[getattr(Post, column) for column in columns])]
+
+
+def select_feed_fields(items, fields):
+    """이미 직렬화된 게시글 dict (스냅샷 등) 에서 요청한 필드만 남김"""
+    if fields is None:
+        return items
+    return [{key: value for key, value in item.items() if key in fields} for item in items]
+
+
+def serialize_feed_posts(posts, preview_length=None, include_profile_img=True, fields=None):
+    """
+    피드 게시글 목록을 한 번에 직렬화
+
+    게시글마다 작성자/카테고리를 따로 조회하지 않고,
+    페이지 전체에 대해 IN 조회 2번으로 끝낸다. 좋아요 수는 posts.like_count 컬럼을 읽는다.
+
+    Args:
+        posts: Post 객체 리스트 (정렬 순서 유지)
+        preview_length: 본문 미리보기 길이 (None이면 전체)
+        include_profile_img: 작성자 프로필 이미지 포함 여부
+        fields: parse_feed_fields 결과 (None 이면 전체, 빠진 필드의 조회는 생략)
+
+    Returns:
+        직렬화된 게시글 dict 리스트
+    """
+    if not posts:
+        return []
+
+    def want(name):
+        return fields is None or name in fields
+
+    user_ids = set()
+    if want("author"):
+        user_ids = {post.user_id for post in posts if post.user_id is not None}
+    category_ids = set()
+    if want("category"):
+        category_ids = {post.category_id for post in posts if post.category_id is not None}
+
+    authors = {}
+    if user_ids:
+        authors = {
+            user.user_id: user
+            for user in User.query.filter(User.user_id.in_(user_ids)).all()
+        }
+
+    category_names = {}
+    if category_ids:
+        category_names = dict(
+            db.session.query(Category.category_id, Category.category_name)
+            .filter(Category.category_id.in_(category_ids))
+            .all()
+        )
+
+    result = []
+    for post in posts:
+        item = {"post_id": post.post_id}
+        if want("author"):
+            author = authors.get(post.user_id)
+            author_data = None
+            if author:
+                author_data = {
+                    "user_id": author.user_id,
+                    "username": author.username,
+                    "nickname": author.nickname,
+                }
+                if include_profile_img:
+                    author_data["profile_img"] = author.profile_img
+            item["author"] = author_data
+        if want("content"):
+            content = post.content
+            if preview_length is not None:
+                content = content[:preview_length]
+            item["content"] = content
+        if want("category"):
+            item["category"] = category_names.get(post.category_id)
+        if want("view_counts"):
+            item["view_counts"] = post.view_counts
+        if want("like_count"):
+            item["like_count"] = post.like_count
+        if want("created_at"):
+            item["created_at"] = post.created_at.isoformat()
+        result.append(item)
+
+    return result
@@ -1,16 +1,25 @@
 """
 피드 모듈 - 사용자 피드 및 타임라인
 """
-from flask import Blueprint, jsonify, request
+import math
+from flask import Blueprint, jsonify, request, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from datetime import datetime, timedelta
 
 from apps.config.server import db
-from apps.post.models import Post, PostLike, Category
-from apps.user.models import Follow
-from apps.auth.models import User
+from apps.post.models import Post, Category, Location
+from apps.feed.utils import (
+    serialize_feed_posts,
+    parse_feed_fields,
+    feed_load_options,
+    select_feed_fields,
+)
+from apps.feed.timeline import load_timeline
+from apps.feed.trending import get_trending_snapshot, refresh_trending_command, TRENDING_PERIODS
+from apps.common.pagination import clamp_per_page, keyset_paginate, keyset_slice, COUNT_MODES
+from apps.common.geo import bounding_box, cell_ranges, haversine_km
 
 bp = Blueprint("feed", __name__)
+bp.cli.add_command(refresh_trending_command)  # flask feed refresh-trending
 
 
 @bp.get("")
@@ -21,46 +30,55 @@ def get_feed():
     Query params:
         - page: 페이지 번호
         - per_page: 페이지당 항목 수
+        - cursor: 커서 모드 (빈 값 = 첫 페이지, 응답의 next_cursor 로 다음 페이지)
+        - fields: 응답에 포함할 필드 (쉼표 구분, 예: post_id,created_at)
     """
     current_user_id = int(get_jwt_identity())
-    page = request.args.get("page", 1, type=int)
-    per_page = request.args.get("per_page", 20, type=int)
+    page = max(request.args.get("page", 1, type=int), 1)
+    per_page = clamp_per_page(request.args.get("per_page", 20, type=int))
+    cursor = request.args.get("cursor")
+    try:
+        fields = parse_feed_fields(request.args.get("fields"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     
-    # 현재 사용자가 팔로우하는 사용자 ID 조회
-    following_ids = [f.following_id for f in Follow.query.filter_by(follower_id=current_user_id).all()]
+    # 미리 만들어둔 홈 타임라인 (팔로우한 사용자 + 자신의 게시글, 최신순)
+    entries = load_timeline(current_user_id)
+    total = len(entries)
     
-    # 자신의 게시글 포함
-    following_ids.append(current_user_id)
+    next_cursor = None
+    if cursor is not None:
+        try:
+            page_entries, next_cursor = keyset_slice(entries, cursor, per_page)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+    else:
+        start = (page - 1) * per_page
+        page_entries = entries[start:start + per_page]
+    page_ids = [post_id for _, post_id in page_entries]
     
-    # 팔로우한 사용자들의 게시글 조회
-    pagination = Post.query.filter(Post.user_id.in_(following_ids))\
-        .order_by(Post.created_at.desc())\
-        .paginate(page=page, per_page=per_page, error_out=False)
+    # 게시글 hydration (타임라인 순서 유지)
+    posts_by_id = {
+        post.post_id: post
+        for post in Post.query.options(*feed_load_options(fields))
+        .filter(Post.post_id.in_(page_ids)).all()
+    } if page_ids else {}
+    page_posts = [posts_by_id[post_id] for post_id in page_ids if post_id in posts_by_id]
     
-    posts = []
-    for post in pagination.items:
-        author = User.query.get(post.user_id)
-        like_count = PostLike.query.filter_by(post_id=post.post_id).count()
-        
-        posts.append({
-            "post_id": post.post_id,
-            "author": {
-                "user_id": author.user_id,
-                "username": author.username,
-                "nickname": author.nickname,
-                "profile_img": author.profile_img
-            } if author else None,
-            "content": post.content,
-            "category": post.category.category_name if post.category else None,
-            "view_counts": post.view_counts,
-            "like_count": like_count,
-            "created_at": post.created_at.isoformat()
-        })
+    posts = serialize_feed_posts(page_posts, fields=fields)
+    
+    if cursor is not None:
+        return jsonify({
+            "posts": posts,
+            "total": total,
+            "has_next": next_cursor is not None,
+            "next_cursor": next_cursor
+        }), 200
     
     return jsonify({
         "posts": posts,
-        "total": pagination.total,
-        "pages": pagination.pages,
+        "total": total,
+        "pages": (total + per_page - 1) // per_page if per_page > 0 else 0,
         "current_page": page
     }), 200
 
@@ -68,48 +86,30 @@ def get_feed():
 @bp.get("/trending")
 def get_trending():
     """
-    트렌딩 게시글 조회
+    트렌딩 게시글 조회 (미리 계산된 스냅샷)
     Query params:
         - period: 기간 (today, week, month)
         - limit: 반환할 게시글 수
+        - fields: 응답에 포함할 필드 (쉼표 구분)
     """
     period = request.args.get("period", "week")
     limit = request.args.get("limit", 20, type=int)
+    try:
+        fields = parse_feed_fields(request.args.get("fields"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     
-    # 시간 범위 계산
-    now = datetime.now()
-    if period == "today":
-        start_time = now - timedelta(days=1)
-    elif period == "month":
-        start_time = now - timedelta(days=30)
-    else:  # week
-        start_time = now - timedelta(days=7)
+    if period not in TRENDING_PERIODS:
+        period = "week"
     
-    # 트렌딩 게시글 조회 (기간 내 조회수 기준)
-    posts = Post.query.filter(Post.created_at >= start_time)\
-        .order_by(Post.view_counts.desc())\
-        .limit(limit).all()
+    snapshot = get_trending_snapshot(period)
+    result = select_feed_fields(snapshot["posts"][:max(limit, 0)], fields)
     
-    result = []
-    for post in posts:
-        author = User.query.get(post.user_id)
-        like_count = PostLike.query.filter_by(post_id=post.post_id).count()
-        
-        result.append({
-            "post_id": post.post_id,
-            "author": {
-                "user_id": author.user_id,
-                "username": author.username,
-                "nickname": author.nickname
-            } if author else None,
-            "content": post.content[:200],  # 미리보기
-            "category": post.category.category_name if post.category else None,
-            "view_counts": post.view_counts,
-            "like_count": like_count,
-            "created_at": post.created_at.isoformat()
-        })
-    
-    return jsonify({"posts": result, "count": len(result)}), 200
+    return jsonify({
+        "posts": result,
+        "count": len(result),
+        "generated_at": snapshot["generated_at"].isoformat()
+    }), 200
 
 
 @bp.get("/explore")
@@ -119,41 +119,49 @@ def get_explore():
     Query params:
         - category: 카테고리별 필터
         - page: 페이지 번호
+        - cursor: 커서 모드 (빈 값 = 첫 페이지, 응답의 next_cursor 로 다음 페이지)
+        - count: 커서 모드 전체 개수 계산 방식 (exact, none, estimate)
+        - fields: 응답에 포함할 필드 (쉼표 구분)
     """
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 20, type=int)
     category = request.args.get("category")
+    cursor = request.args.get("cursor")
+    count = request.args.get("count", "exact")
+    try:
+        fields = parse_feed_fields(request.args.get("fields"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     
-    query = Post.query
+    query = Post.query.options(*feed_load_options(fields))
     
     if category:
         cat = Category.query.filter_by(category_name=category).first()
         if cat:
             query = query.filter_by(category_id=cat.category_id)
     
+    # 커서 모드: (created_at, post_id) keyset, OFFSET 없음
+    if cursor is not None:
+        if count not in COUNT_MODES:
+            return jsonify({"error": "count는 exact, none, estimate 중 하나입니다"}), 400
+        try:
+            items, next_cursor, total = keyset_paginate(
+                query, Post.created_at, Post.post_id, cursor, per_page, count=count
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify({
+            "posts": serialize_feed_posts(items, preview_length=200, fields=fields),
+            "total": total,
+            "has_next": next_cursor is not None,
+            "next_cursor": next_cursor
+        }), 200
+    
     # 최신순 정렬
     pagination = query.order_by(Post.created_at.desc())\
         .paginate(page=page, per_page=per_page, error_out=False)
     
-    posts = []
-    for post in pagination.items:
-        author = User.query.get(post.user_id)
-        like_count = PostLike.query.filter_by(post_id=post.post_id).count()
-        
-        posts.append({
-            "post_id": post.post_id,
-            "author": {
-                "user_id": author.user_id,
-                "username": author.username,
-                "nickname": author.nickname,
-                "profile_img": author.profile_img
-            } if author else None,
-            "content": post.content[:200],
-            "category": post.category.category_name if post.category else None,
-            "view_counts": post.view_counts,
-            "like_count": like_count,
-            "created_at": post.created_at.isoformat()
-        })
+    posts = serialize_feed_posts(pagination.items, preview_length=200, fields=fields)
     
     return jsonify({
         "posts": posts,
@@ -171,18 +179,95 @@ def get_nearby():
     Query params:
         - lat: 위도
         - lon: 경도
-        - radius: 검색 반경(km)
+        - radius: 검색 반경(km), 최대 NEARBY_MAX_RADIUS_KM
+        - limit: 최대 게시글 수 (기본 50, 최대 100)
+        - fields: 응답에 포함할 필드 (쉼표 구분, distance_km 는 항상 포함)
+
+    1) geo_cell 범위(위도 행마다 BETWEEN) + 위도/경도 사각형으로 후보 위치만 인덱스로 조회
+       게시글별 가장 가까운 점의 근사 거리(위도/경도 차 제곱합) 순으로 limit * NEARBY_CANDIDATE_FACTOR 개 게시글만
+    2) 후보 게시글의 범위 안 점들에 대해 haversine 으로 정확한 거리 계산 후 반경 밖 제거
+    3) 게시글별 가장 가까운 점의 거리로 정렬
     """
     lat = request.args.get("lat", type=float)
     lon = request.args.get("lon", type=float)
     radius = request.args.get("radius", 10, type=float)
-    
+    limit = min(max(request.args.get("limit", 50, type=int), 1), 100)
+    try:
+        fields = parse_feed_fields(request.args.get("fields"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     if lat is None or lon is None:
         return jsonify({"error": "lat와 lon은 필수입니다"}), 400
-    
-    # TODO: 위치 모델 사용 가능 시 지리공간 쿼리 구현
-    # 현재는 빈 결과 반환
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return jsonify({"error": "lat/lon 범위가 올바르지 않습니다"}), 400
+    if radius is None or radius <= 0:
+        return jsonify({"error": "radius는 0보다 커야 합니다"}), 400
+    radius = min(radius, current_app.config.get("NEARBY_MAX_RADIUS_KM", 50))
+
+    # 1) 인덱스 범위 조회 - 가까운 후보 게시글만
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius)
+    in_range = [
+        db.or_(*[Location.geo_cell.between(lo, hi) for lo, hi in cell_ranges(lat, lon, radius)]),
+        Location.latitude.between(min_lat, max_lat),
+    ]
+    if max_lon - min_lon < 360:
+        if min_lon < -180:
+            # 날짜변경선을 넘으면 경도 구간이 둘
+            in_range.append(db.or_(Location.longitude >= min_lon + 360, Location.longitude <= max_lon))
+        elif max_lon > 180:
+            in_range.append(db.or_(Location.longitude >= min_lon, Location.longitude <= max_lon - 360))
+        else:
+            in_range.append(Location.longitude.between(min_lon, max_lon))
+    candidate_limit = limit * current_app.config.get("NEARBY_CANDIDATE_FACTOR", 2)
+    nearest = db.func.min(_approx_distance(lat, lon))
+    # MySQL 은 IN (... LIMIT) 서브쿼리를 지원하지 않으므로 두 번에 나눠 조회
+    candidate_ids = [
+        post_id for post_id, in db.session.query(Location.post_id)
+        .filter(*in_range)
+        .group_by(Location.post_id)
+        .order_by(nearest, Location.post_id)
+        .limit(candidate_limit)
+        .all()
+    ]
+    points = db.session.query(Location.post_id, Location.latitude, Location.longitude).filter(
+        Location.post_id.in_(candidate_ids), *in_range
+    ).all() if candidate_ids else []
+
+    # 2) 정확한 거리 계산 - 게시글별 최소 거리
+    distances = {}
+    for post_id, point_lat, point_lon in points:
+        distance = haversine_km(lat, lon, point_lat, point_lon)
+        if distance <= radius and distance < distances.get(post_id, float("inf")):
+            distances[post_id] = distance
+
+    # 3) 가까운 순 정렬 후 게시글 hydration
+    ranked = sorted(distances.items(), key=lambda item: (item[1], item[0]))[:limit]
+    posts_by_id = {
+        post.post_id: post
+        for post in Post.query.options(*feed_load_options(fields))
+        .filter(Post.post_id.in_([post_id for post_id, _ in ranked])).all()
+    } if ranked else {}
+    posts = [posts_by_id[post_id] for post_id, _ in ranked if post_id in posts_by_id]
+
+    result = serialize_feed_posts(posts, preview_length=200, fields=fields)
+    for item in result:
+        item["distance_km"] = round(distances[item["post_id"]], 3)
+
     return jsonify({
-        "posts": [],
-        "message": "지리공간 검색이 아직 구현되지 않았습니다"
+        "posts": result,
+        "count": len(result),
+        "radius": radius
     }), 200
+
+
+def _approx_distance(lat, lon):
+    """
+    정렬용 근사 거리 SQL 식 (도 단위 제곱, 경도 차는 cos(위도) 배)
+    - 경도 차가 180 을 넘으면 날짜변경선 반대쪽으로 계산
+    """
+    dlat = Location.latitude - lat
+    dlon = Location.longitude - lon
+    dlon = db.case((dlon > 180, dlon - 360), (dlon < -180, dlon + 360), else_=dlon)
+    scale = math.cos(math.radians(lat))
+    return dlat * dlat + dlon * dlon * (scale * scale)
@@ -6,6 +6,7 @@ import io
 import time
 from pathlib import Path
 from PIL import Image as PILImage
+from .image_processing import fit_width, prepare_reduced_decode, REDUCING_GAP
 
 
 class ImageAPIClient:
@@ -37,15 +38,17 @@ class ImageAPIClient:
         """
         try:
             with PILImage.open(image_path) as img:
+                # 최종 크기에 맞춰 축소 디코딩 (너무 큰 이미지는 ValueError → None)
+                target = fit_width(img.size, max_width)
+                prepare_reduced_decode(img, target)
+                
                 # RGB/RGBA로 변환
                 if img.mode not in ('RGB', 'RGBA'):
                     img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
                 
                 # 필요시 리사이즈
-                if img.width > max_width:
-                    ratio = max_width / img.width
-                    new_height = int(img.height * ratio)
-                    img = img.resize((max_width, new_height), PILImage.Resampling.LANCZOS)
+                if img.size != target:
+                    img = img.resize(target, PILImage.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
                 
                 # 버퍼에 저장
                 img_buffer = io.BytesIO()
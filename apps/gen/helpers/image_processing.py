@@ -4,6 +4,41 @@
 from pathlib import Path
 from PIL import Image as PILImage
 
+# 디코딩할 픽셀 수 상한 (decompression bomb 방지, 48MP 사진 + 여유)
+MAX_DECODED_PIXELS = 64_000_000
+
+# JPEG 축소 디코딩 시 목표 크기 대비 남겨 둘 배율 (나머지는 LANCZOS 로)
+DRAFT_GAP = 1.5
+
+# 리사이즈 시 reduce 로 먼저 줄일 때 남겨 둘 배율 (Pillow thumbnail 기본값)
+REDUCING_GAP = 2.0
+
+
+def fit_width(size, max_width):
+    """(너비, 높이) 를 비율 유지하며 max_width 이하로 줄인 크기"""
+    width, height = size
+    if width <= max_width:
+        return size
+    return max_width, int(height * max_width / width)
+
+
+def prepare_reduced_decode(img, target_size):
+    """
+    열기만 한(아직 디코딩 전) 이미지를 target_size 에 맞춰 축소 디코딩하도록 설정
+    
+    - JPEG 은 draft 로 1/2 ~ 1/8 스케일로 디코딩 (목표 크기의 DRAFT_GAP 배 이상 유지)
+    - 그 외 포맷은 resize(reducing_gap=REDUCING_GAP) 에서 reduce 로 먼저 줄임
+    - 실제로 디코딩할 픽셀 수가 MAX_DECODED_PIXELS 를 넘으면 디코딩 전에 ValueError
+    
+    Args:
+        img: PILImage.open 결과
+        target_size: (너비, 높이) 최종 크기
+    """
+    if img.format == 'JPEG':
+        img.draft(img.mode, (int(target_size[0] * DRAFT_GAP), int(target_size[1] * DRAFT_GAP)))
+    if img.width * img.height > MAX_DECODED_PIXELS:
+        raise ValueError(f"이미지 해상도가 너무 큼: {img.width}x{img.height}")
+
 
 def resize_post_image(source_path, dest_path, max_width=1024):
     """
@@ -27,15 +62,17 @@ def resize_post_image(source_path, dest_path, max_width=1024):
             if hasattr(img, 'is_animated') and img.is_animated:
                 return None
             
+            # 최종 크기에 맞춰 축소 디코딩
+            target = fit_width(img.size, max_width)
+            prepare_reduced_decode(img, target)
+            
             # RGB 또는 RGBA로 변환
             if img.mode not in ('RGB', 'RGBA'):
                 img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
             
             # 너비가 max_width를 초과하면 리사이즈
-            if img.width > max_width:
-                ratio = max_width / img.width
-                new_height = int(img.height * ratio)
-                img = img.resize((max_width, new_height), PILImage.Resampling.LANCZOS)
+            if img.size != target:
+                img = img.resize(target, PILImage.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
             
             # PNG로 저장
             img.save(dest_path, 'PNG', optimize=True)
@@ -67,6 +104,9 @@ def resize_profile_image(source_path, dest_path, size=512):
             if hasattr(img, 'is_animated') and img.is_animated:
                 return None
             
+            # 짧은 변이 size 의 DRAFT_GAP 배 이상 남도록 축소 디코딩
+            prepare_reduced_decode(img, (size, size))
+            
             # RGB로 변환
             if img.mode not in ('RGB', 'RGBA'):
                 img = img.convert('RGB')
@@ -81,7 +121,7 @@ def resize_profile_image(source_path, dest_path, size=512):
                 img = img.crop((0, top, width, top + width))
             
             # 목표 크기로 리사이즈
-            img = img.resize((size, size), PILImage.Resampling.LANCZOS)
+            img = img.resize((size, size), PILImage.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
             
             # PNG로 저장
             img.save(dest_path, 'PNG', optimize=True)
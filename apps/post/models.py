@@ -2,7 +2,9 @@
 Post model
 """
 from datetime import datetime
+from sqlalchemy import event
 from apps.config.server import db
+from apps.common.geo import geo_cell
 
 
 class Category(db.Model):
@@ -24,6 +26,8 @@ class Post(db.Model):
     category_id = db.Column(db.Integer, db.ForeignKey("categories.category_id"))
     content = db.Column(db.Text, nullable=False)
     view_counts = db.Column(db.Integer, default=0)
+    like_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    reply_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
     created_at = db.Column(db.DateTime, default=datetime.now)
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
 
@@ -31,6 +35,12 @@ class Post(db.Model):
     category = db.relationship("Category", backref="posts", lazy=True)
     author = db.relationship("User", backref="posts", lazy=True, foreign_keys=[user_id])
 
+    # like_count / reply_count are maintained by apps.post.counters
+    __table_args__ = (
+        db.Index("ix_posts_like_count", "like_count"),
+        db.Index("ix_posts_reply_count", "reply_count"),
+    )
+
     def add_view_counts(self):
         """Increment view count"""
         self.view_counts = self.view_counts + 1
@@ -48,3 +58,38 @@ class PostLike(db.Model):
 
     post = db.relationship("Post", backref=db.backref("likes", lazy="dynamic"))
     user = db.relationship("User", backref=db.backref("liked_posts", lazy="dynamic"))
+
+
+class Location(db.Model):
+    """Post location points"""
+    __tablename__ = "locations"
+
+    location_id = db.Column(db.Integer, primary_key=True)
+    post_id = db.Column(db.Integer, db.ForeignKey("posts.post_id"), nullable=False)
+    latitude = db.Column(db.Float, nullable=False)
+    longitude = db.Column(db.Float, nullable=False)
+    geo_cell = db.Column(db.BigInteger, nullable=True)  # grid cell (see apps.common.geo)
+    order_index = db.Column(db.Integer, nullable=False, default=0)
+    location_name = db.Column(db.String(100), nullable=True)
+    recommend_point = db.Column(db.Integer, default=0)
+    risk_point = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+
+    post = db.relationship("Post", backref="locations")
+
+    __table_args__ = (
+        db.Index("ix_locations_geo_cell_post", "geo_cell", "post_id"),
+        db.Index("ix_locations_lat_lon", "latitude", "longitude"),
+    )
+
+    def __repr__(self):
+        return f'<Location {self.location_id}>'
+
+
+@event.listens_for(Location, "before_insert")
+@event.listens_for(Location, "before_update")
+def set_geo_cell(mapper, connection, target):
+    """Keep geo_cell in sync with latitude/longitude"""
+    if target.latitude is not None and target.longitude is not None:
+        target.geo_cell = geo_cell(target.latitude, target.longitude)
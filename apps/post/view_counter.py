@@ -0,0 +1,188 @@
+"""
+게시글 조회수 write-behind 버퍼
+
+GET /post/<id> 는 조회수를 DB 에 바로 쓰지 않고 프로세스 내 버퍼에만 더한다.
+백그라운드 스레드가 VIEW_COUNT_FLUSH_SECONDS 마다 (또는 대기 중인 조회가
+VIEW_COUNT_MAX_PENDING 을 넘으면 즉시) 모인 증가분을 UPDATE 한 번으로 반영한다.
+
+    UPDATE posts SET view_counts = view_counts + CASE post_id WHEN 1 THEN 3 WHEN 7 THEN 1 ... END
+    WHERE post_id IN (1, 7, ...)
+
+프로세스가 비정상 종료되면 마지막 flush 이후의 조회수만 유실된다
+(최대 VIEW_COUNT_FLUSH_SECONDS 동안 또는 VIEW_COUNT_MAX_PENDING 건).
+정상 종료 시에는 atexit 에서 한 번 더 flush 한다.
+다른 backend(공유 카운터 등)는 ViewCountBuffer 를 상속해 register_view_counter_backend 로 등록한다.
+"""
+import atexit
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import case, func
+
+from apps.config.server import db
+from apps.post.models import Post
+
+
+class ViewCountBuffer:
+    """프로세스 내 조회수 버퍼"""
+
+    def __init__(self, max_pending=10000):
+        self.max_pending = max_pending
+        self._counts = {}
+        self._pending = 0
+        self._oldest = None  # 아직 반영되지 않은 가장 오래된 조회 시각
+        self._lock = threading.Lock()
+        self.flush_requested = threading.Event()
+        self.last_flush_at = None
+        self.last_flush_seconds = None
+        self.last_flush_rows = 0
+        self.flush_errors = 0
+
+    def add(self, post_id, count=1):
+        """조회수 증가분 적재. 대기 건수가 max_pending 을 넘으면 flush 요청"""
+        with self._lock:
+            self._counts[post_id] = self._counts.get(post_id, 0) + count
+            self._pending += count
+            if self._oldest is None:
+                self._oldest = time.time()
+            if self._pending >= self.max_pending:
+                self.flush_requested.set()
+
+    def pending(self, post_id):
+        """아직 DB 에 반영되지 않은 게시글의 조회수"""
+        with self._lock:
+            return self._counts.get(post_id, 0)
+
+    def drain(self):
+        """버퍼를 비우고 (증가분 dict, 가장 오래된 조회 시각) 반환"""
+        with self._lock:
+            counts, oldest = self._counts, self._oldest
+            self._counts, self._pending, self._oldest = {}, 0, None
+            self.flush_requested.clear()
+            return counts, oldest
+
+    def restore(self, counts, oldest):
+        """flush 실패 시 증가분을 버퍼로 되돌린다"""
+        with self._lock:
+            for post_id, count in counts.items():
+                self._counts[post_id] = self._counts.get(post_id, 0) + count
+                self._pending += count
+            if oldest is not None and (self._oldest is None or oldest < self._oldest):
+                self._oldest = oldest
+
+    def stats(self):
+        """모니터링 지표 - flush_lag_seconds: 반영 대기 중인 가장 오래된 조회의 경과 시간"""
+        with self._lock:
+            return {
+                "pending_views": self._pending,
+                "pending_posts": len(self._counts),
+                "flush_lag_seconds": round(time.time() - self._oldest, 3) if self._oldest else 0.0,
+                "last_flush_at": self.last_flush_at,
+                "last_flush_seconds": self.last_flush_seconds,
+                "last_flush_rows": self.last_flush_rows,
+                "flush_errors": self.flush_errors,
+            }
+
+
+VIEW_COUNTER_BACKENDS = {
+    "memory": ViewCountBuffer,
+}
+
+
+def register_view_counter_backend(name, counter_class):
+    """외부 backend 등록 (예: 공유 카운터)"""
+    VIEW_COUNTER_BACKENDS[name] = counter_class
+
+
+# UPDATE 한 번에 넣을 최대 게시글 수
+FLUSH_CHUNK_SIZE = 500
+
+
+def flush_view_counts(app):
+    """
+    버퍼의 증가분을 DB 에 반영
+
+    Returns:
+        갱신된 게시글 수
+    """
+    counter = app.extensions["post_view_counter"]
+    counts, oldest = counter.drain()
+    if not counts:
+        return 0
+
+    started = time.time()
+    items = list(counts.items())
+    try:
+        for start in range(0, len(items), FLUSH_CHUNK_SIZE):
+            chunk = dict(items[start:start + FLUSH_CHUNK_SIZE])
+            Post.query.filter(Post.post_id.in_(chunk)).update(
+                {
+                    Post.view_counts: func.coalesce(Post.view_counts, 0) + case(chunk, value=Post.post_id, else_=0),
+                    # 조회는 수정이 아니므로 updated_at(onupdate) 유지
+                    Post.updated_at: Post.updated_at,
+                },
+                synchronize_session=False,
+            )
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        counter.restore(counts, oldest)
+        counter.flush_errors += 1
+        raise
+
+    counter.last_flush_at = time.time()
+    counter.last_flush_seconds = round(counter.last_flush_at - started, 3)
+    counter.last_flush_rows = len(items)
+    return len(items)
+
+
+def _flush(app):
+    with app.app_context():
+        try:
+            flush_view_counts(app)
+        except Exception as e:
+            app.logger.warning(f"조회수 flush 실패: {e}")
+        finally:
+            db.session.remove()
+
+
+def _flush_loop(app, stop_event):
+    counter = app.extensions["post_view_counter"]
+    interval = app.config.get("VIEW_COUNT_FLUSH_SECONDS", 10)
+    while not stop_event.is_set():
+        counter.flush_requested.wait(interval)
+        _flush(app)
+
+
+def init_view_counter(app):
+    """조회수 버퍼를 앱에 붙이고, 설정 시 백그라운드 flush 스레드 시작"""
+    backend = app.config.get("VIEW_COUNT_BACKEND", "memory")
+    counter_class = VIEW_COUNTER_BACKENDS.get(backend)
+    if counter_class is None:
+        raise ValueError(f"알 수 없는 조회수 backend: {backend}")
+    app.extensions["post_view_counter"] = counter_class(app.config.get("VIEW_COUNT_MAX_PENDING", 10000))
+
+    if app.config.get("VIEW_COUNT_BACKGROUND_FLUSH", True):
+        stop_event = threading.Event()
+        thread = threading.Thread(
+            target=_flush_loop, args=(app, stop_event), name="view-count-flush", daemon=True
+        )
+        thread.start()
+        app.extensions["post_view_counter_stop"] = stop_event
+        # 정상 종료 시 남은 조회수 반영
+        atexit.register(_flush, app)
+
+
+def get_view_counter():
+    """현재 앱의 조회수 버퍼"""
+    return current_app.extensions["post_view_counter"]
+
+
+def record_view(post):
+    """
+    조회 1회 적재 후, 아직 반영되지 않은 조회를 포함한 조회수 반환 (DB 쓰기 없음)
+    """
+    counter = get_view_counter()
+    counter.add(post.post_id)
+    return (post.view_counts or 0) + counter.pending(post.post_id)
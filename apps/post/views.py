@@ -1,15 +1,19 @@
 """
 게시글 모듈 - 게시글 CRUD 및 상호작용
 """
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_current_user
 from sqlalchemy.exc import IntegrityError
 
 from apps.config.server import db
 from apps.post.models import Post, Category, PostLike
 from apps.auth.models import User
+from apps.feed.timeline import fan_out_post, get_timeline_store
+from apps.post.counters import adjust_post_counts, reconcile_counts_command
+from apps.post.view_counter import record_view
 
 bp = Blueprint("post", __name__)
+bp.cli.add_command(reconcile_counts_command)  # flask post reconcile-counts
 
 
 @bp.get("")
@@ -20,7 +24,7 @@ def get_posts():
         - page: 페이지 번호
         - per_page: 페이지당 항목 수
         - category: 카테고리별 필터
-        - order_by: 정렬 순서 (latest, popular 등)
+        - order_by: 정렬 순서 (latest, popular, most_liked, most_commented)
     """
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 20, type=int)
@@ -38,6 +42,10 @@ def get_posts():
     # 정렬
     if order_by == "popular":
         query = query.order_by(Post.view_counts.desc())
+    elif order_by == "most_liked":
+        query = query.order_by(Post.like_count.desc(), Post.post_id.desc())
+    elif order_by == "most_commented":
+        query = query.order_by(Post.reply_count.desc(), Post.post_id.desc())
     else:  # latest
         query = query.order_by(Post.created_at.desc())
     
@@ -46,14 +54,13 @@ def get_posts():
     
     posts = []
     for post in pagination.items:
-        like_count = PostLike.query.filter_by(post_id=post.post_id).count()
         posts.append({
             "post_id": post.post_id,
             "user_id": post.user_id,
             "content": post.content,
             "category": post.category.category_name if post.category else None,
             "view_counts": post.view_counts,
-            "like_count": like_count,
+            "like_count": post.like_count,
             "created_at": post.created_at.isoformat(),
             "updated_at": post.updated_at.isoformat()
         })
@@ -101,6 +108,13 @@ def create_post():
         db.session.add(post)
         db.session.commit()
         
+        # 팔로워 타임라인에 추가 (실패해도 게시글 작성은 유지)
+        try:
+            fan_out_post(post)
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.warning(f"타임라인 fan-out 실패 (post_id={post.post_id}): {e}")
+        
         # TODO: 이미지 업로드 처리
         
         return jsonify({
@@ -118,12 +132,8 @@ def get_post(post_id):
     """ID로 단일 게시글 조회"""
     post = Post.query.get_or_404(post_id)
     
-    # 조회수 증가
-    post.add_view_counts()
-    db.session.commit()
-    
-    # 좋아요 수 조회
-    like_count = PostLike.query.filter_by(post_id=post_id).count()
+    # 조회수 증가 - 버퍼에만 적재하고 주기적으로 일괄 반영 (읽기 경로에서 UPDATE 없음)
+    view_counts = record_view(post)
     
     # 작성자 정보 조회
     author = User.query.get(post.user_id)
@@ -139,8 +149,8 @@ def get_post(post_id):
         } if author else None,
         "content": post.content,
         "category": post.category.category_name if post.category else None,
-        "view_counts": post.view_counts,
-        "like_count": like_count,
+        "view_counts": view_counts,
+        "like_count": post.like_count,
         "created_at": post.created_at.isoformat(),
         "updated_at": post.updated_at.isoformat()
     }), 200
@@ -192,6 +202,7 @@ def delete_post(post_id):
         
         db.session.delete(post)
         db.session.commit()
+        get_timeline_store().remove_post(post_id)
         
         return jsonify({"message": "게시글이 삭제되었습니다"}), 200
         
@@ -216,15 +227,25 @@ def like_post(post_id):
     ).first()
     
     if existing:
-        # 좋아요 취소
-        db.session.delete(existing)
+        # 좋아요 취소 - 실제로 지운 행이 있을 때만 카운터 감소
+        deleted = PostLike.query.filter_by(
+            post_id=post_id,
+            user_id=current_user_id
+        ).delete(synchronize_session=False)
+        if deleted:
+            adjust_post_counts(post_id, likes=-1)
         db.session.commit()
         return jsonify({"message": "좋아요 취소", "liked": False}), 200
     else:
-        # 좋아요
+        # 좋아요 - 동시 중복 요청은 PK 충돌로 카운터 증가까지 롤백
         like = PostLike(post_id=post_id, user_id=current_user_id)
         db.session.add(like)
-        db.session.commit()
+        try:
+            # 카운터 UPDATE 가 INSERT 를 먼저 flush 하므로 PK 충돌도 여기서 발생
+            adjust_post_counts(post_id, likes=1)
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
         return jsonify({"message": "좋아요", "liked": True}), 201
 
 
@@ -234,15 +255,15 @@ def unlike_post(post_id):
     """게시글 좋아요 취소"""
     current_user_id = int(get_jwt_identity())
     
-    like = PostLike.query.filter_by(
+    deleted = PostLike.query.filter_by(
         post_id=post_id,
         user_id=current_user_id
-    ).first()
+    ).delete(synchronize_session=False)
     
-    if not like:
+    if not deleted:
         return jsonify({"error": "좋아요하지 않은 게시글입니다"}), 404
     
-    db.session.delete(like)
+    adjust_post_counts(post_id, likes=-1)
     db.session.commit()
     
     return jsonify({"message": "좋아요 취소"}), 200
@@ -284,13 +305,12 @@ def get_my_posts():
     
     posts = []
     for post in pagination.items:
-        like_count = PostLike.query.filter_by(post_id=post.post_id).count()
         posts.append({
             "post_id": post.post_id,
             "content": post.content,
             "category": post.category.category_name if post.category else None,
             "view_counts": post.view_counts,
-            "like_count": like_count,
+            "like_count": post.like_count,
             "created_at": post.created_at.isoformat(),
             "updated_at": post.updated_at.isoformat()
         })
@@ -8,6 +8,7 @@ from apps.config.server import db
 from apps.reply.models import Reply, ReplyLike
 from apps.post.models import Post
 from apps.auth.models import User
+from apps.post.counters import adjust_post_counts
 
 bp = Blueprint("reply", __name__)
 
@@ -107,6 +108,7 @@ def create_reply():
         )
         
         db.session.add(reply)
+        adjust_post_counts(post_id, replies=1)
         db.session.commit()
         
         return jsonify({
@@ -188,6 +190,7 @@ def delete_reply(reply_id):
             return jsonify({"error": "권한이 없습니다"}), 403
         
         db.session.delete(reply)
+        adjust_post_counts(reply.post_id, replies=-1)
         db.session.commit()
         
         return jsonify({"message": "댓글이 삭제되었습니다"}), 200
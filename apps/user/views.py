@@ -8,6 +8,7 @@ from sqlalchemy.exc import IntegrityError
 from apps.config.server import db
 from apps.auth.models import User
 from apps.user.models import Follow, Friend
+from apps.feed.timeline import get_timeline_store
 
 bp = Blueprint("user", __name__)
 
@@ -48,8 +49,16 @@ def follow_user(user_id):
     try:
         follow = Follow(follower_id=current_user_id, following_id=user_id)
         db.session.add(follow)
+        # 저장된 팔로워 수 갱신 (fan-out 대상 판단에 사용, 같은 트랜잭션에서 원자적으로)
+        User.query.filter_by(user_id=user_id).update(
+            {User.follower_count: db.func.coalesce(User.follower_count, 0) + 1},
+            synchronize_session=False
+        )
         db.session.commit()
         
+        # 팔로우 목록이 바뀌었으므로 다음 피드 조회 시 타임라인 재구성
+        get_timeline_store().clear(current_user_id)
+        
         return jsonify({"message": "팔로우 성공"}), 201
     except IntegrityError:
         db.session.rollback()
@@ -71,7 +80,12 @@ def unfollow_user(user_id):
         return jsonify({"error": "팔로우 중이 아닙니다"}), 404
     
     db.session.delete(follow)
+    User.query.filter_by(user_id=user_id).update(
+        {User.follower_count: db.case((User.follower_count > 0, User.follower_count - 1), else_=0)},
+        synchronize_session=False
+    )
     db.session.commit()
+    get_timeline_store().clear(current_user_id)
     
     return jsonify({"message": "언팔로우 성공"}), 200
 
@@ -0,0 +1,36 @@
+"""feed timelines
+
+Revision ID: 3f9a1c2b7d41
+Revises: 0df634eaae3a
+Create Date: 2026-10-17 10:12:31.402118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a1c2b7d41'
+down_revision = '0df634eaae3a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('feed_timelines',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.post_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'post_id')
+    )
+    with op.batch_alter_table('feed_timelines', schema=None) as batch_op:
+        batch_op.create_index('ix_feed_timelines_user_created', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('feed_timelines', schema=None) as batch_op:
+        batch_op.drop_index('ix_feed_timelines_user_created')
+
+    op.drop_table('feed_timelines')
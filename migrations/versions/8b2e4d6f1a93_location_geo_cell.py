@@ -0,0 +1,43 @@
+"""location geo cell index
+
+Revision ID: 8b2e4d6f1a93
+Revises: 3f9a1c2b7d41
+Create Date: 2026-10-17 11:02:47.518320
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2e4d6f1a93'
+down_revision = '3f9a1c2b7d41'
+branch_labels = None
+depends_on = None
+
+# apps/common/geo.py 의 GEO_CELL_DEG / GEO_LON_CELLS 와 같아야 한다
+GEO_CELL_DEG = 0.05
+GEO_LON_CELLS = 7200
+
+
+def upgrade():
+    with op.batch_alter_table('locations', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('geo_cell', sa.BigInteger(), nullable=True))
+
+    # 기존 위치 backfill
+    op.execute(
+        f"UPDATE locations SET geo_cell = "
+        f"FLOOR((latitude + 90) / {GEO_CELL_DEG}) * {GEO_LON_CELLS} "
+        f"+ MOD(FLOOR((longitude + 180) / {GEO_CELL_DEG}), {GEO_LON_CELLS})"
+    )
+
+    with op.batch_alter_table('locations', schema=None) as batch_op:
+        batch_op.create_index('ix_locations_geo_cell_post', ['geo_cell', 'post_id'], unique=False)
+        batch_op.create_index('ix_locations_lat_lon', ['latitude', 'longitude'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('locations', schema=None) as batch_op:
+        batch_op.drop_index('ix_locations_lat_lon')
+        batch_op.drop_index('ix_locations_geo_cell_post')
+        batch_op.drop_column('geo_cell')
@@ -0,0 +1,29 @@
+"""feed timeline states
+
+Revision ID: a7c3e9f2b104
+Revises: f1b6c3e8a925
+Create Date: 2026-10-17 15:20:44.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e9f2b104'
+down_revision = 'f1b6c3e8a925'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('feed_timeline_states',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('built_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade():
+    op.drop_table('feed_timeline_states')
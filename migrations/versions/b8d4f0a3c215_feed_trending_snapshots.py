@@ -0,0 +1,29 @@
+"""feed trending snapshots
+
+Revision ID: b8d4f0a3c215
+Revises: a7c3e9f2b104
+Create Date: 2026-10-17 16:05:12.730941
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8d4f0a3c215'
+down_revision = 'a7c3e9f2b104'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('feed_trending_snapshots',
+    sa.Column('period', sa.String(length=10), nullable=False),
+    sa.Column('generated_at', sa.DateTime(), nullable=False),
+    sa.Column('posts', sa.JSON(), nullable=False),
+    sa.PrimaryKeyConstraint('period')
+    )
+
+
+def downgrade():
+    op.drop_table('feed_trending_snapshots')
@@ -0,0 +1,41 @@
+"""post like/reply counts
+
+Revision ID: c4d7e9a2b816
+Revises: 8b2e4d6f1a93
+Create Date: 2026-10-17 11:40:05.201774
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d7e9a2b816'
+down_revision = '8b2e4d6f1a93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('like_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('reply_count', sa.Integer(), server_default='0', nullable=False))
+
+    # 기존 좋아요/댓글 수 backfill
+    op.execute(
+        "UPDATE posts SET "
+        "like_count = (SELECT COUNT(*) FROM post_likes WHERE post_likes.post_id = posts.post_id), "
+        "reply_count = (SELECT COUNT(*) FROM replies WHERE replies.post_id = posts.post_id)"
+    )
+
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.create_index('ix_posts_like_count', ['like_count'], unique=False)
+        batch_op.create_index('ix_posts_reply_count', ['reply_count'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_posts_reply_count')
+        batch_op.drop_index('ix_posts_like_count')
+        batch_op.drop_column('reply_count')
+        batch_op.drop_column('like_count')
@@ -0,0 +1,28 @@
+"""posts content fulltext (ngram)
+
+Revision ID: d91f3b7c5e20
+Revises: c4d7e9a2b816
+Create Date: 2026-10-17 12:15:33.904112
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd91f3b7c5e20'
+down_revision = 'c4d7e9a2b816'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # MySQL 전용 - 다른 DB 는 프로세스 내 검색 인덱스(memory backend)를 사용
+    if op.get_bind().dialect.name == 'mysql':
+        op.execute(
+            "ALTER TABLE posts ADD FULLTEXT INDEX ft_posts_content (content) WITH PARSER ngram"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'mysql':
+        op.drop_index('ft_posts_content', table_name='posts')
@@ -0,0 +1,26 @@
+"""image processing status
+
+Revision ID: e5a8c1d4f372
+Revises: d91f3b7c5e20
+Create Date: 2026-10-17 13:02:11.640581
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a8c1d4f372'
+down_revision = 'd91f3b7c5e20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('images', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('status', sa.String(length=10), server_default='ready', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('images', schema=None) as batch_op:
+        batch_op.drop_column('status')
@@ -0,0 +1,46 @@
+"""content addressed image blobs
+
+Revision ID: f1b6c3e8a925
+Revises: e5a8c1d4f372
+Create Date: 2026-10-17 15:21:08.304417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1b6c3e8a925'
+down_revision = 'e5a8c1d4f372'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('image_blobs',
+    sa.Column('blob_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('directory', sa.Text(), nullable=False),
+    sa.Column('ext', sa.String(length=10), nullable=False),
+    sa.Column('size_bytes', sa.Integer(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('blob_id'),
+    sa.UniqueConstraint('sha256')
+    )
+    # 기존 이미지는 blob_id = NULL 로 두고 `flask post migrate-blobs` 로 옮긴다
+    for table in ('images', 'reply_images'):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('blob_id', sa.Integer(), nullable=True))
+            batch_op.create_index(f'ix_{table}_blob_id', ['blob_id'], unique=False)
+            batch_op.create_foreign_key(f'fk_{table}_blob_id', 'image_blobs', ['blob_id'], ['blob_id'])
+
+
+def downgrade():
+    for table in ('reply_images', 'images'):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_constraint(f'fk_{table}_blob_id', type_='foreignkey')
+            batch_op.drop_index(f'ix_{table}_blob_id')
+            batch_op.drop_column('blob_id')
+
+    op.drop_table('image_blobs')
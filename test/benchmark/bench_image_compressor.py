@@ -0,0 +1,124 @@
+"""
+compress_image 품질 선택 벤치마크
+
+IMAGE_RULES 의 이미지 타입별로, 생성한 샘플 이미지를
+- legacy : 기존 방식 (품질 85 에서 10 씩 낮추며 매번 optimize=True 인코딩)
+- search : 현재 compress_image (축소본 추정 + 원본 확인 + 최종 인코딩 1회)
+로 압축해 이미지당 인코딩 횟수, CPU 시간, 결과 품질/크기를 비교한다.
+
+실행 (프로젝트 루트에서):
+    python test/benchmark/bench_image_compressor.py [--count 5] [--size 4000x3000] [--budget 1.0]
+
+--budget 로 각 타입의 max_bytes 를 줄이면 품질 탐색이 일어나는 경우를 볼 수 있다
+(기본 규칙은 대부분의 사진이 품질 85 에서 바로 통과).
+"""
+import argparse
+import random
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+from flask import Flask
+from PIL import Image as PILImage, ImageDraw, ImageFilter
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.utils.image_rules import IMAGE_RULES
+from app.utils.image_compressor import compress_image
+
+
+def make_sample(width, height, seed):
+    """사진과 비슷하게 압축되도록 그라데이션 + 도형 + 노이즈로 만든 JPEG"""
+    rng = random.Random(seed)
+    image = PILImage.linear_gradient("L").resize((width, height)).convert("RGB")
+    draw = ImageDraw.Draw(image)
+    for _ in range(60):
+        x, y = rng.randrange(width), rng.randrange(height)
+        r = rng.randrange(20, max(21, width // 6))
+        color = tuple(rng.randrange(256) for _ in range(3))
+        draw.ellipse((x - r, y - r, x + r, y + r), fill=color)
+    image = image.filter(ImageFilter.GaussianBlur(2))
+    noise = PILImage.effect_noise((width, height), 80).convert("RGB")
+    image = PILImage.blend(image, noise, 0.5)
+
+    data = BytesIO()
+    image.save(data, format="JPEG", quality=95)
+    return data.getvalue()
+
+
+def legacy_compress(data, image_type):
+    """기존 compress_image 의 품질 루프 (비교용)"""
+    rule = IMAGE_RULES.get(image_type, IMAGE_RULES["default"])
+    image = PILImage.open(BytesIO(data))
+    fmt = image.format.lower()
+    if rule["max_size"]:
+        image.thumbnail(rule["max_size"], PILImage.Resampling.LANCZOS)
+
+    encodes = 1
+    quality = 85
+    output = BytesIO()
+    image.save(output, format=fmt.upper(), optimize=True, quality=quality)
+    while output.tell() > rule["max_bytes"] and quality > 30:
+        quality -= 10
+        encodes += 1
+        output = BytesIO()
+        image.save(output, format=fmt.upper(), optimize=True, quality=quality)
+    return {"encodes": encodes, "trial_encodes": 0, "quality": quality, "bytes": output.tell()}
+
+
+def search_compress(data, image_type):
+    stream = BytesIO(data)
+    stream.filename = "sample.jpg"
+    stats = {}
+    compress_image(stream, image_type=image_type, stats=stats)
+    return stats
+
+
+def run(samples, image_type, strategy):
+    cpu_start = time.process_time()
+    results = [strategy(data, image_type) for data in samples]
+    cpu = time.process_time() - cpu_start
+    n = len(results)
+    return {
+        "encodes": sum(r["encodes"] for r in results) / n,
+        "trial": sum(r["trial_encodes"] for r in results) / n,
+        "cpu_ms": cpu * 1000 / n,
+        "quality": sum(r["quality"] for r in results) / n,
+        "kb": sum(r["bytes"] for r in results) / n / 1024,
+        "over": sum(1 for r in results if r["bytes"] > IMAGE_RULES[image_type]["max_bytes"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=5, help="타입별 샘플 이미지 수")
+    parser.add_argument("--size", default="4000x3000", help="샘플 이미지 크기 (WxH)")
+    parser.add_argument("--budget", type=float, default=1.0, help="max_bytes 배율 (예: 0.1)")
+    args = parser.parse_args()
+    for rule in IMAGE_RULES.values():
+        rule["max_bytes"] = int(rule["max_bytes"] * args.budget)
+    width, height = (int(v) for v in args.size.lower().split("x"))
+
+    print(f"샘플 {args.count}장 생성 중 ({width}x{height}, budget={args.budget}) ...")
+    samples = [make_sample(width, height, seed) for seed in range(args.count)]
+
+    app = Flask(__name__)
+    app.logger.disabled = True
+    with app.app_context():
+        header = f"{'type':<9} {'strategy':<8} {'encodes':>8} {'trial':>6} {'cpu ms':>9} {'quality':>8} {'KB':>9} {'over':>5}"
+        print(header)
+        print("-" * len(header))
+        for image_type in IMAGE_RULES:
+            for name, strategy in (("legacy", legacy_compress), ("search", search_compress)):
+                r = run(samples, image_type, strategy)
+                print(
+                    f"{image_type:<9} {name:<8} {r['encodes']:>8.2f} {r['trial']:>6.2f} "
+                    f"{r['cpu_ms']:>9.1f} {r['quality']:>8.1f} {r['kb']:>9.1f} {r['over']:>5}"
+                )
+
+
+if __name__ == "__main__":
+    main()
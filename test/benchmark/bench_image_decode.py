@@ -0,0 +1,158 @@
+"""
+축소 디코딩(draft/reduce) 벤치마크
+
+12MP / 48MP 샘플 JPEG 을 각 단계별로
+- full    : 같은 코드에서 draft 를 끈 것 (원본 전체 디코딩 후 리사이즈, 기존 방식)
+- reduced : 현재 코드 (JPEG draft 로 1/2 ~ 1/8 스케일 디코딩)
+로 처리해 이미지당 CPU 시간, 디코딩한 픽셀 수, 최대 RSS 증가량을 비교한다.
+최대 RSS 는 프로세스 단위라 (단계, 방식) 마다 자식 프로세스를 새로 띄워 잰다.
+
+실행 (프로젝트 루트에서, Linux/macOS):
+    python test/benchmark/bench_image_decode.py [--count 3] [--sizes 4000x3000,8000x6000]
+"""
+import argparse
+import io
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from flask import Flask
+from PIL import Image as PILImage, ImageFile, JpegImagePlugin
+
+ROOT = Path(__file__).resolve().parents[2]
+for path in (ROOT, ROOT / "apps" / "gen"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from app.utils.image_compressor import compress_image
+from helpers.image_api import ImageAPIClient
+from helpers.image_processing import resize_post_image, resize_profile_image
+from bench_image_compressor import make_sample
+
+
+def run_compress(image_type):
+    def run(path):
+        with open(path, "rb") as f:
+            stream = io.BytesIO(f.read())
+        stream.filename = Path(path).name
+        compress_image(stream, image_type=image_type)
+
+    return run
+
+
+# 단계 이름 → 현재 코드 실행 함수
+STAGES = {
+    "compress post": run_compress("post"),
+    "compress reply": run_compress("reply"),
+    "compress profile": run_compress("profile"),
+    "gen post": lambda path: resize_post_image(Path(path), io.BytesIO()),
+    "gen profile": lambda path: resize_profile_image(Path(path), io.BytesIO()),
+    "api prepare": lambda path: ImageAPIClient("http://localhost")._prepare_image(Path(path)),
+}
+
+
+def peak_rss_mb():
+    """
+     이 프로세스의 최대 RSS (MB)
+    - Linux 는 /proc 의 VmHWM (ru_maxrss 는 fork 한 부모의 값을 물려받음)
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def worker(stage, strategy, paths):
+    """
+     자식 프로세스: 한 단계를 한 방식으로 실행하고 결과를 JSON 으로 출력
+    - full: 같은 코드에서 draft 만 끔 (전체 디코딩 후 리사이즈)
+    - 디코딩한 픽셀 수는 ImageFile.load 호출 시점의 크기로 센다
+    """
+    if strategy == "full":
+        PILImage.Image.draft = lambda self, mode, size: None
+        JpegImagePlugin.JpegImageFile.draft = lambda self, mode, size, scale=None: None
+
+    decoded = []
+    original_load = ImageFile.ImageFile.load
+
+    def counting_load(self):
+        if self.tile:
+            decoded.append(self.width * self.height)
+        return original_load(self)
+
+    ImageFile.ImageFile.load = counting_load
+
+    run = STAGES[stage]
+    app = Flask(__name__)
+    app.logger.disabled = True
+    with app.app_context():
+        rss_start = peak_rss_mb()
+        cpu_start = time.process_time()
+        for path in paths:
+            run(path)
+        cpu = time.process_time() - cpu_start
+        rss_peak = peak_rss_mb()
+    print(
+        json.dumps(
+            {
+                "cpu_ms": cpu * 1000 / len(paths),
+                "mp": sum(decoded) / len(paths) / 1e6,
+                "rss_mb": rss_peak - rss_start,
+            }
+        )
+    )
+
+
+def measure(stage, strategy, paths):
+    output = subprocess.run(
+        [sys.executable, __file__, "--worker", stage, strategy, *paths],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        worker(sys.argv[2], sys.argv[3], sys.argv[4:])
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=3, help="크기별 샘플 이미지 수")
+    parser.add_argument("--sizes", default="4000x3000,8000x6000", help="샘플 크기 목록 (WxH,...)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        header = f"{'sample':<10} {'stage':<17} {'strategy':<8} {'cpu ms':>9} {'decoded MP':>11} {'peak RSS MB':>12}"
+        for spec in args.sizes.split(","):
+            width, height = (int(v) for v in spec.lower().split("x"))
+            print(f"\n샘플 {args.count}장 생성 중 ({width}x{height}) ...")
+            paths = []
+            for seed in range(args.count):
+                path = Path(tmp) / f"{spec}_{seed}.jpg"
+                path.write_bytes(make_sample(width, height, seed))
+                paths.append(str(path))
+
+            print(header)
+            print("-" * len(header))
+            for stage in STAGES:
+                for strategy in ("full", "reduced"):
+                    r = measure(stage, strategy, paths)
+                    print(
+                        f"{spec:<10} {stage:<17} {strategy:<8} {r['cpu_ms']:>9.1f} "
+                        f"{r['mp']:>11.1f} {r['rss_mb']:>12.1f}"
+                    )
+
+
+if __name__ == "__main__":
+    main()